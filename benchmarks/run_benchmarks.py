@@ -0,0 +1,359 @@
+#! /usr/bin/env python3
+"""
+Benchmarks for the scoring and driver hot paths.
+
+Each stage (the `main.py` epoch loop and batch driver, `backtest` with
+each engine, `compute_stats`, `compute_stats_online`,
+`compute_stats_windows` and `get_local_score`) is timed on the bundled
+phase datasets, using that phase's own `main.py`, `bot_trade.py` and
+`scoring/scoring.py`, and on synthetic price series of 10k, 100k and 1M
+epochs with 2 to 50 assets, drawn by the kit's `scoring/synthetic.py`
+(whose models are timed too). The numba engine is only timed when numba is
+installed. `backtest_paths` (scoring of 100 block-bootstrap paths at once)
+is only timed on series of at most 100k prices, as it holds every path in
+memory. On the synthetic series, `run_chunked` (driver and scoring over a
+memory-mapped `PriceStore`) is timed as well; CSV loading
+(`find_csv_file`, with and without the price cache) is timed on the
+bundled datasets only. Wall time is the best of `--repeat` runs; peak
+memory is measured with tracemalloc on one extra run.
+
+The `import_main` stage times `import main` of each kit in a fresh
+interpreter, and records whether matplotlib was loaded: a headless run
+should only import it for `--show-graph`.
+
+Results are written as JSON, named after the current commit by default, so
+that two runs can be compared:
+
+    python3 benchmarks/run_benchmarks.py
+    python3 benchmarks/run_benchmarks.py --quick --compare benchmarks/results/<commit>.json
+"""
+
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+PHASE_DATASETS = [
+    ("phase1", "data/asset_a_test.csv"),
+    ("phase2", "data/asset_b_train.csv"),
+    ("phase3", "data/asset_a_b_train.csv"),
+]
+# Synthetic series are scored with the phase 3 kit (the driver is the same
+# in every kit, the scoring parameters are not)
+SYNTHETIC_PHASE = "phase3"
+SYNTHETIC_EPOCHS = [10_000, 100_000, 1_000_000]
+SYNTHETIC_ASSETS = [2, 10, 50]
+QUICK_EPOCHS = [10_000]
+QUICK_ASSETS = [2, 10]
+CHUNK_SIZE = 100_000
+# Largest series (epochs x assets) on which bootstrap paths are scored
+BOOTSTRAP_MAX_PRICES = 100_000
+
+# Modules that have the same name in every phase kit
+PHASE_MODULES = [
+    "main",
+    "bot_trade",
+    "indicators",
+    "scoring",
+    "scoring.scoring",
+    "scoring.checkpoint",
+    "scoring.live",
+    "scoring.prices",
+    "scoring.profiling",
+    "scoring.resampling",
+    "scoring.synthetic",
+]
+
+
+def load_phase(phase: str):
+    """
+    Import `main` and `scoring.scoring` from a phase kit.
+    """
+    phase_dir = os.path.join(ROOT, phase)
+    for name in PHASE_MODULES:
+        sys.modules.pop(name, None)
+    sys.path.insert(0, phase_dir)
+    try:
+        main = importlib.import_module("main")
+    finally:
+        sys.path.remove(phase_dir)
+    return main, sys.modules["scoring.scoring"]
+
+
+# Run in a fresh interpreter from a phase directory: prints the import time
+# of `main`, its peak memory (when "--trace" is given) and whether matplotlib
+# was imported along with it
+IMPORT_PROBE = """
+import json, sys, time, tracemalloc
+if "--trace" in sys.argv:
+    tracemalloc.start()
+start = time.perf_counter()
+import main
+wall_time = time.perf_counter() - start
+print(json.dumps({
+    "wall_time_s": wall_time,
+    "peak_memory_bytes": tracemalloc.get_traced_memory()[1],
+    "matplotlib_loaded": "matplotlib" in sys.modules,
+}))
+"""
+
+
+def measure_import(phase: str, repeat: int) -> dict:
+    def probe(*args):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE, *args],
+            cwd=os.path.join(ROOT, phase),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        return json.loads(output.splitlines()[-1])
+
+    times = [probe()["wall_time_s"] for _ in range(repeat)]
+    traced = probe("--trace")
+    return {
+        "wall_time_s": min(times),
+        "peak_memory_bytes": traced["peak_memory_bytes"],
+        "matplotlib_loaded": traced["matplotlib_loaded"],
+    }
+
+
+def random_positions(prices: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    weights = rng.random(prices.shape)
+    weights /= weights.sum(axis=1, keepdims=True)
+    return pd.DataFrame(weights, index=prices.index.rename("epoch"), columns=prices.columns)
+
+
+def constant_bot(columns: list[str]):
+    # Equal weights, so that the driver stage measures the driver itself
+    weights = {column: 1 / len(columns) for column in columns}
+    return lambda epoch, *prices: dict(weights)
+
+
+def constant_batch_bot(columns: list[str]):
+    # Vectorized counterpart of `constant_bot` (`make_decisions`)
+    return lambda prices: np.full((len(prices), len(columns)), 1 / len(columns))
+
+
+def measure(fn, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"wall_time_s": min(times), "peak_memory_bytes": peak}
+
+
+def run_stages(main, scoring, prices: pd.DataFrame, make_bot, repeat: int, with_reference: bool) -> dict:
+    positions = random_positions(prices)
+    pnl = scoring.backtest(prices=prices, positions=positions)["pnl"]
+
+    stages = {
+        "driver": lambda: main.run_epochs(prices, make_bot()),
+        # Batch protocol, including the no-lookahead replay
+        "driver_batch": lambda: main.run_batch(prices, constant_batch_bot(list(prices.columns))),
+        "backtest_numpy": lambda: scoring.backtest(prices=prices, positions=positions, engine="numpy"),
+        "backtest_numba": lambda: scoring.backtest(prices=prices, positions=positions, engine="numba"),
+        "compute_stats": lambda: scoring.compute_stats(pnl=pnl, positions=positions),
+        "compute_stats_online": lambda: scoring.compute_stats_online(pnl=pnl, positions=positions),
+        # Rolling windows of a tenth of the series, every hundredth
+        "compute_stats_windows": lambda: scoring.compute_stats_windows(
+            pnl=pnl, positions=positions, window=len(prices) // 10, step=len(prices) // 100
+        ),
+        "get_local_score": lambda: scoring.get_local_score(prices=prices, positions=positions),
+    }
+    if prices.size <= BOOTSTRAP_MAX_PRICES:
+        paths = main.block_bootstrap_paths(prices, nb_paths=100, block_size=20, rng=np.random.default_rng(0))
+        positions_stack = np.broadcast_to(positions.to_numpy(), paths.shape)
+        stages["backtest_paths"] = lambda: scoring.backtest_paths(paths, positions_stack, columns=list(prices.columns))
+    if scoring._numba_kernel() is None:
+        del stages["backtest_numba"]
+    else:
+        # Compile outside of the measured runs
+        scoring.backtest(prices=prices.iloc[:10], positions=positions.iloc[:10], engine="numba")
+    if with_reference:
+        stages["backtest_pandas"] = lambda: scoring.backtest(prices=prices, positions=positions, engine="pandas")
+
+    results = {}
+    for stage, fn in stages.items():
+        results[stage] = measure(fn, repeat=1 if stage == "backtest_pandas" else repeat)
+        print(f"  {stage:<22} {results[stage]['wall_time_s']:>10.4f} s  {results[stage]['peak_memory_bytes'] / 2**20:>9.1f} MiB")
+    return results
+
+
+def run_benchmarks(quick: bool, repeat: int) -> list[dict]:
+    records = []
+
+    for phase, dataset in PHASE_DATASETS:
+        main, scoring = load_phase(phase)
+        prices = main.find_csv_file(os.path.join(ROOT, phase, dataset))
+        print(f"{phase} {dataset} ({len(prices)} epochs)")
+        result = measure_import(phase, repeat)
+        loaded = "  matplotlib loaded" if result["matplotlib_loaded"] else ""
+        print(f"  {'import_main':<22} {result['wall_time_s']:>10.4f} s  {result['peak_memory_bytes'] / 2**20:>9.1f} MiB{loaded}")
+        records.append({
+            "stage": "import_main",
+            "dataset": f"{phase}/{dataset}",
+            "epochs": len(prices),
+            "assets": prices.shape[1] - 1,
+            **result,
+        })
+        path_csv = os.path.join(ROOT, phase, dataset)
+        main.find_csv_file(path_csv)  # make sure the cache exists
+        results = {
+            "find_csv_file": measure(lambda: main.find_csv_file(path_csv, cache=False), repeat),
+            "find_csv_file_cached": measure(lambda: main.find_csv_file(path_csv), repeat),
+        }
+        for stage, result in results.items():
+            print(f"  {stage:<22} {result['wall_time_s']:>10.4f} s  {result['peak_memory_bytes'] / 2**20:>9.1f} MiB")
+        results |= run_stages(
+            main,
+            scoring,
+            prices,
+            make_bot=lambda: main.decision_function(main.new_bot()),
+            repeat=repeat,
+            with_reference=True,
+        )
+        for stage, result in results.items():
+            records.append({
+                "stage": stage,
+                "dataset": f"{phase}/{dataset}",
+                "epochs": len(prices),
+                "assets": prices.shape[1] - 1,
+                **result,
+            })
+
+    main, scoring = load_phase(SYNTHETIC_PHASE)
+    for nb_epochs in QUICK_EPOCHS if quick else SYNTHETIC_EPOCHS:
+        for nb_assets in QUICK_ASSETS if quick else SYNTHETIC_ASSETS:
+            prices = main.synthetic_prices(nb_epochs, nb_assets, model="gbm", seed=0)
+            print(f"synthetic ({nb_epochs} epochs, {nb_assets} assets)")
+            results = {
+                f"synthetic_{model}": measure(
+                    lambda: main.synthetic_prices(nb_epochs, nb_assets, model=model, seed=0), repeat
+                )
+                for model in main.MODELS
+            }
+            for stage, result in results.items():
+                print(f"  {stage:<22} {result['wall_time_s']:>10.4f} s  {result['peak_memory_bytes'] / 2**20:>9.1f} MiB")
+            results |= run_stages(
+                main,
+                scoring,
+                prices,
+                make_bot=lambda: constant_bot(list(prices.columns)),
+                repeat=repeat,
+                with_reference=False,
+            )
+            with tempfile.TemporaryDirectory() as tmp:
+                store = main.PriceStore.from_frame(prices.drop(columns="Cash"), os.path.join(tmp, "store"))
+                results["run_chunked"] = measure(
+                    lambda: main.run_chunked(store.iter_windows(CHUNK_SIZE), constant_bot(list(prices.columns))),
+                    repeat,
+                )
+            print(f"  {'run_chunked':<22} {results['run_chunked']['wall_time_s']:>10.4f} s  {results['run_chunked']['peak_memory_bytes'] / 2**20:>9.1f} MiB")
+            for stage, result in results.items():
+                records.append({
+                    "stage": stage,
+                    "dataset": "synthetic",
+                    "epochs": nb_epochs,
+                    "assets": nb_assets,
+                    **result,
+                })
+
+    return records
+
+
+def numba_version() -> str | None:
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba.__version__
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline_path: str, report: dict):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    key = lambda r: (r["stage"], r["dataset"], r["epochs"], r["assets"])
+    previous = {key(r): r for r in baseline["results"]}
+
+    print(f"\nComparison with {baseline_path} ({baseline.get('commit')})")
+    print(f"  {'stage':<22} {'dataset':<32} {'epochs':>8} {'assets':>6} {'time':>8} {'memory':>8}")
+    for record in report["results"]:
+        old = previous.get(key(record))
+        if old is None:
+            continue
+        time_ratio = record["wall_time_s"] / old["wall_time_s"]
+        memory_ratio = record["peak_memory_bytes"] / max(old["peak_memory_bytes"], 1)
+        print(
+            f"  {record['stage']:<22} {record['dataset']:<32} {record['epochs']:>8} {record['assets']:>6}"
+            f" {time_ratio:>7.2f}x {memory_ratio:>7.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scoring and driver hot paths")
+    parser.add_argument("--quick", action="store_true", help="only the 10k-epoch synthetic series with 2 and 10 assets")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage, the fastest is kept")
+    parser.add_argument("--output", help="JSON results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of a previous run to compare with")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "numba": numba_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "results": run_benchmarks(quick=args.quick, repeat=args.repeat),
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(args.compare, report)
+
+
+if __name__ == "__main__":
+    main()
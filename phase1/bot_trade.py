@@ -1,55 +1,98 @@
+from math import sqrt, tanh
 
-history = []
+from indicators import RingBuffer, RollingMax, RollingMean
+
+WARMUP = 50
+VOL_WINDOW = 20
+EMA_SPAN = 10
+MA_WINDOW = 30
+CRASH_WINDOW = 10
+CRASH_THRESHOLD = 0.05
+
+# Constants above that `Bot(params)` can override (see `main.py --sweep`)
+PARAMS = ("WARMUP", "VOL_WINDOW", "EMA_SPAN", "MA_WINDOW", "CRASH_WINDOW", "CRASH_THRESHOLD")
+
+class Bot:
+    """
+    The strategy, with its parameters and indicators held by the instance:
+    several bots can run side by side, and `reset()` starts a bot over.
+    """
+
+    def __init__(self, params: dict | None = None):
+        params = params or {}
+        for name in params:
+            if name not in PARAMS:
+                raise AttributeError(f"bot_trade ne définit pas le paramètre '{name}'")
+        # Defaults are read when the bot is created, so that the constants
+        # can still be overridden after import
+        self.params = {name: params.get(name, globals()[name]) for name in PARAMS}
+        self.reset()
+
+    def reset(self):
+        params = self.params
+        self.epochs = 0
+        self.last_price = None
+        self.ema_prices = RingBuffer(params["EMA_SPAN"] + 1)
+        self.squared_returns = RollingMean(params["VOL_WINDOW"])
+        self.ma = RollingMean(params["MA_WINDOW"])
+        self.recent_max = RollingMax(params["CRASH_WINDOW"])
+
+    def on_epoch(self, epoch: int, price: float):
+        params = self.params
+
+        self.epochs += 1
+        if self.last_price is not None:
+            r = (price - self.last_price) / self.last_price
+            self.squared_returns.update(r * r)
+        self.last_price = price
+        self.ema_prices.append(price)
+        ma30 = self.ma.update(price)
+        max_price_recent = self.recent_max.update(price)
+
+        if self.epochs < params["WARMUP"]:
+            return {"Asset A": 0.5, "Cash": 0.5}
+
+        volatility = sqrt(self.squared_returns.value)
+        volatility = max(volatility, 1e-6)
+
+        # EMA re-seeded on the last EMA_SPAN + 1 prices
+        alpha = 2 / (params["EMA_SPAN"] + 1)
+        ema_prices = iter(self.ema_prices)
+        ema = next(ema_prices)
+        for p in ema_prices:
+            ema = ema + alpha * (p - ema)
+        momentum = (price - ema) / ema
+
+        deviation = (price - ma30) / ma30
+        deviation /= volatility
+
+        vol_factor = min(volatility * 50, 1.0)
+        w_mom = 0.5 + 0.3 * vol_factor
+        w_mr = 0.5 - 0.3 * vol_factor
+
+        signal = w_mom * momentum - w_mr * deviation
+
+        allocation_asset = 0.5 + 0.5 * tanh(signal * 5)
+
+        if self.epochs >= params["CRASH_WINDOW"]:
+            current_drawdown = (max_price_recent - price) / max_price_recent
+
+            if current_drawdown > params["CRASH_THRESHOLD"]:
+                allocation_asset = 0.1
+
+        allocation_asset = max(0.05, min(0.95, allocation_asset))
+
+        return {
+            "Asset A": allocation_asset,
+            "Cash": 1 - allocation_asset
+        }
+
+# Bot behind `make_decision`, the entry point called by the platform. It is
+# created on the first call, with the constants as they are at that time.
+bot = None
 
 def make_decision(epoch: int, price: float):
-    history.append(price)
-
-    if len(history) < 50: 
-        return {"Asset A": 0.5, "Cash": 0.5}
-
-    import math
-    from math import tanh
-
-    returns = [
-        (history[i] - history[i-1]) / history[i-1]
-        for i in range(len(history)-20, len(history))
-    ]
-    volatility = math.sqrt(sum(r*r for r in returns) / len(returns))
-    volatility = max(volatility, 1e-6)
-
-    alpha = 2 / (10 + 1)
-    start_index = max(0, len(history) - 11) 
-    ema = history[start_index]
-    for p in history[start_index + 1:]:
-        ema = ema + alpha * (p - ema)
-    momentum = (history[-1] - ema) / ema
-
-    ma30 = sum(history[-30:]) / 30
-    deviation = (price - ma30) / ma30
-    deviation /= volatility 
-
-    vol_factor = min(volatility * 50, 1.0)
-    w_mom = 0.5 + 0.3 * vol_factor
-    w_mr = 0.5 - 0.3 * vol_factor
-
-    signal = w_mom * momentum - w_mr * deviation
-
-    allocation_asset = 0.5 + 0.5 * tanh(signal * 5)
-    
-    CRASH_WINDOW = 10 
-    CRASH_THRESHOLD = 0.05 
-    
-    if len(history) >= CRASH_WINDOW:
-        max_price_recent = max(history[-CRASH_WINDOW:])
-        
-        current_drawdown = (max_price_recent - price) / max_price_recent
-
-        if current_drawdown > CRASH_THRESHOLD:
-            allocation_asset = 0.1 
-        
-    allocation_asset = max(0.05, min(0.95, allocation_asset))
-
-    return {
-        "Asset A": allocation_asset,
-        "Cash": 1 - allocation_asset
-    }
\ No newline at end of file
+    global bot
+    if bot is None:
+        bot = Bot()
+    return bot.on_epoch(epoch, price)
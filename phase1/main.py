@@ -1,32 +1,151 @@
 #! /usr/bin/env python3
 
+import argparse
+import asyncio
+import contextlib
+import cProfile
 import csv
+import glob
+import importlib.util
+import inspect
+import itertools
 import json
 import os
 import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections.abc import AsyncIterator, Iterable, Iterator
+from operator import itemgetter
 
 # Empêcher la création de __pycache__
 sys.dont_write_bytecode = True
 
 
-from scoring.scoring import get_local_score, show_result
+from scoring.checkpoint import Checkpoint, price_source
+from scoring.live import read_socket, serve_replay, tail_csv
+from scoring.prices import PriceStore, iter_prices_csv, open_price_store, read_prices_csv
+from scoring.profiling import LatencyStats, add_times, stage, timed_iter, write_profile
+from scoring.resampling import block_bootstrap_paths
+from scoring.synthetic import MODELS, asset_names, synthetic_prices
+from scoring.scoring import (
+    StreamingBacktester,
+    backtest_paths,
+    get_local_score,
+    show_result,
+    summarize_bootstrap,
+)
+import numpy as np
 import pandas as pd
-from bot_trade import make_decision as decision_generator
-import matplotlib.pyplot as plt
+import bot_trade
+from indicators import PriceHistory
 
 
-def find_csv_file(path_csv: str) -> pd.DataFrame:
+BOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bot_trade.py")
+# Price files of the kit, whose assets are those traded by its bot
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+# Epochs per window in chunked mode, unless --chunk-size is given
+CHUNK_SIZE = 100_000
+# Maximum number of pnl points kept for the graph in chunked mode
+PNL_POINTS = 10_000
+# Epochs per resampled block (about a month of daily prices), unless
+# --block-size is given, and resampled paths per bootstrap task
+BLOCK_SIZE = 20
+BOOTSTRAP_BATCH = 50
+# Epochs of the synthetic prices, unless --epochs is given
+SYNTHETIC_EPOCHS = 100_000
+# Epochs at which the output of a vectorized bot is checked by a replay
+REPLAY_SAMPLES = 20
+# Minimum epochs between two checkpoints, unless --checkpoint-every is given
+CHECKPOINT_EVERY = 1_000_000
+# Ticks whose latencies are buffered before being added to the stats (and
+# written to --latency-output) in live mode
+LATENCY_BATCH = 1_000
+# Weight types written without a full `validate_decision` in `run_epochs`:
+# other types (bool, numpy scalars, strings...) go through it, so that the
+# same decisions are accepted with and without --strict-validation
+WEIGHT_TYPES = frozenset({int, float})
+
+
+def find_csv_file(path_csv: str, cache: bool = True) -> pd.DataFrame:
     if not os.path.exists(path_csv):
         raise FileNotFoundError(f"Le fichier CSV {path_csv} n'existe pas")
-    prices_list = [
-        pd.read_csv(path_csv, index_col=0)
-    ]
-    prices = pd.concat(prices_list, axis=1)
+    # Parsed once, then memory-mapped from data/.prices_cache/ (see scoring/prices.py)
+    prices = read_prices_csv(path_csv, cache=cache)
     prices["Cash"] = 1
     return prices
 
-def validate_decision(decision: dict) -> bool:
-    expected_keys = {'Asset A', 'Cash'}
+def stream_csv_file(path_csv: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    if not os.path.exists(path_csv):
+        raise FileNotFoundError(f"Le fichier CSV {path_csv} n'existe pas")
+    # Windows of chunk_size epochs, in a single pass over the CSV
+    return iter_prices_csv(path_csv, chunk_size)
+
+def load_price_store(path_csv: str) -> PriceStore:
+    if not os.path.exists(path_csv):
+        raise FileNotFoundError(f"Le fichier CSV {path_csv} n'existe pas")
+    # Built once from the CSV, then memory-mapped from data/.prices_cache/
+    return open_price_store(path_csv)
+
+def kit_assets() -> list[str]:
+    """
+    Asset columns of the price files of the kit (`DATA_DIR`), in header
+    order: the prices its bot expects, e.g. ["Asset B"] for phase 2.
+    """
+    for path_csv in sorted(glob.glob(os.path.join(DATA_DIR, "*.csv"))):
+        with open(path_csv, newline="") as f:
+            return next(csv.reader(f))[1:]
+    return asset_names(1)
+
+def load_prices(path_csv: str | None, cache: bool = True, synthetic: dict | None = None) -> pd.DataFrame:
+    # Synthetic prices are drawn from their `synthetic_prices` parameters
+    # (see scoring/synthetic.py) instead of being read; they are seeded, so
+    # every worker process draws the same ones
+    if synthetic is not None:
+        return synthetic_prices(**synthetic)
+    return find_csv_file(path_csv=path_csv, cache=cache)
+
+def iter_frame(prices: pd.DataFrame, chunk_size: int, start: int = 0) -> Iterator[pd.DataFrame]:
+    # Windows of prices already in memory, from epoch `start` (by
+    # position), for `run_chunked`
+    for first in range(start, len(prices), chunk_size):
+        yield prices.iloc[first:first + chunk_size]
+
+def skip_epochs(windows: Iterable[pd.DataFrame], nb_epochs: int) -> Iterator[pd.DataFrame]:
+    # The windows without their first `nb_epochs` epochs in total, for
+    # sources that can only be read from the start (`stream_csv_file`)
+    for prices in windows:
+        if nb_epochs >= len(prices):
+            nb_epochs -= len(prices)
+            continue
+        yield prices.iloc[nb_epochs:]
+        nb_epochs = 0
+
+def get_asset_columns(prices: pd.DataFrame) -> list[str]:
+    # Every column of the CSV is an asset; "Cash" is added by find_csv_file
+    return [column for column in prices.columns if column != "Cash"]
+
+def get_asset_prices(prices: pd.DataFrame) -> np.ndarray:
+    """
+    The (epochs x assets) float64 array of the prices of the asset columns,
+    read-only so that the bot it is given to cannot modify it.
+    """
+    asset_prices = prices[get_asset_columns(prices)].to_numpy(dtype=np.float64)
+    # A view, so that the flag does not change the array of `prices`
+    asset_prices = asset_prices.view()
+    asset_prices.flags.writeable = False
+    return asset_prices
+
+def takes_history(decision_generator) -> bool:
+    """
+    Whether the bot takes a `history` argument (see `run_epochs`).
+    """
+    try:
+        return "history" in inspect.signature(decision_generator).parameters
+    except (TypeError, ValueError):
+        return False
+
+def validate_decision(decision: dict, expected_keys: set[str]) -> bool:
     if set(decision.keys()) != expected_keys:
         print(f"ERREUR: Les clés attendues sont {expected_keys}, mais reçu {set(decision.keys())}")
         return False
@@ -35,7 +154,7 @@ def validate_decision(decision: dict) -> bool:
         if not isinstance(value, (int, float)):
             print(f"ERREUR: La valeur pour '{key}' n'est pas numérique: {value}")
             return False
-        if value < 0 or value > 1:
+        if not 0 <= value <= 1:
             print(f"ERREUR: La valeur pour '{key}' doit être entre 0 et 1, reçu: {value}")
             return False
     
@@ -46,28 +165,1075 @@ def validate_decision(decision: dict) -> bool:
     
     return True
 
+def validate_positions(positions: pd.DataFrame) -> bool:
+    """
+    Vectorized counterpart of `validate_decision`, run once over all the
+    positions. Every offending epoch is printed with its values.
+    """
+    values = positions.to_numpy()
+    not_numeric = ~np.isfinite(values).all(axis=1)
+    out_of_bounds = ((values < 0) | (values > 1)).any(axis=1)
+    totals = values.sum(axis=1)
+    bad_total = np.abs(totals - 1.0) > 0.00001
+    invalid = not_numeric | out_of_bounds | bad_total
+
+    for i in np.flatnonzero(invalid):
+        reasons = []
+        if not_numeric[i]:
+            reasons.append("valeur non numérique")
+        if out_of_bounds[i]:
+            reasons.append("valeur hors de [0, 1]")
+        if bad_total[i] and not not_numeric[i]:
+            reasons.append(f"somme des allocations = {totals[i]}")
+        decision = dict(zip(positions.columns, values[i].tolist()))
+        print(f"ERREUR: Décision invalide à l'époque {positions.index[i]}: {decision} ({', '.join(reasons)})")
+
+    return not invalid.any()
+
+def iter_epochs(prices: pd.DataFrame) -> Iterator[tuple]:
+    """
+    `(epoch, asset_prices)` for each row of `prices`, read once as plain
+    Python ints and floats instead of boxing every row in a Series.
+    """
+    epochs = prices.index.to_numpy().tolist()
+    asset_prices = zip(*(prices[column].to_numpy(dtype=float).tolist() for column in get_asset_columns(prices)))
+    return zip(epochs, asset_prices)
+
+def run_epochs(
+    prices: pd.DataFrame,
+    decision_generator,
+    timings: dict | None = None,
+    strict: bool = False,
+    profile: bool = False,
+    history: PriceHistory | None = None,
+) -> pd.DataFrame:
+    """
+    Call the bot once per epoch and return its positions.
+
+    The bot is called as `make_decision(epoch, *prices)`, with one price per
+    asset column of the CSV in header order: `make_decision(epoch, price)`
+    for a single asset, `make_decision(epoch, price_a, price_b)` for two,
+    and so on. It must return one weight per asset plus "Cash".
+
+    A bot that takes a `history` argument (`takes_history`) also gets, as
+    `history=`, the read-only (epochs x assets) array of the asset prices
+    up to and including the current epoch. The prices of each epoch are
+    appended to a `PriceHistory` just before the bot is called, and the
+    bot gets its `view()`, not a copy: this costs no allocation of prices
+    per epoch, and neither the array nor the buffer behind it holds future
+    prices. When `history` is given (see `run_chunked`), the prices are
+    appended to it, so the array also covers the epochs before `prices`.
+
+    Epochs and prices come from `iter_epochs`, and decisions are written
+    straight into a preallocated (epochs x assets) float64 array. When
+    `timings` is given, the number of epochs, the total loop time and the
+    time spent inside the bot (in seconds) are added to it. With
+    `profile=True` it also gets the driver time per stage ("checks" for the
+    per-epoch key checks and writes, "positions", "validation") and the
+    latency of every bot call ("latency", a `LatencyStats`).
+
+    By default each decision only has its keys and the types of its weights
+    checked, and the value checks of `validate_decision` run once over all
+    the positions at the end (`validate_positions`). With `strict=True`
+    every decision is fully validated as soon as it is returned, which
+    stops at the first error. Both accept the same decisions.
+    """
+    columns = list(prices.columns)
+    expected_keys = set(columns)
+    weights_of = itemgetter(*columns)
+    positions = np.empty((len(prices), len(columns)), dtype=np.float64)
+    latencies = np.empty(len(prices)) if timings is not None and profile else None
+
+    # Keyword arguments of the bot: `history`, updated at every epoch
+    bot_kwargs = {}
+    if not takes_history(decision_generator):
+        history = None
+    elif history is None:
+        history = PriceHistory(nb_assets=len(get_asset_columns(prices)), capacity=len(prices))
+
+    bot_time = 0.0
+    start = time.perf_counter()
+    for i, (epoch, current_prices) in enumerate(iter_epochs(prices)):
+        if history is not None:
+            history.append(*current_prices)
+            bot_kwargs["history"] = history.view()
+        if timings is None:
+            decision = decision_generator(epoch, *current_prices, **bot_kwargs)
+        else:
+            bot_start = time.perf_counter()
+            decision = decision_generator(epoch, *current_prices, **bot_kwargs)
+            latency = time.perf_counter() - bot_start
+            bot_time += latency
+            if latencies is not None:
+                latencies[i] = latency
+        if strict or decision.keys() != expected_keys:
+            if not validate_decision(decision, expected_keys):
+                raise ValueError(f"Décision invalide: {decision}")
+        weights = weights_of(decision)
+        if not strict and not WEIGHT_TYPES.issuperset(map(type, weights)):
+            if not validate_decision(decision, expected_keys):
+                raise ValueError(f"Décision invalide: {decision}")
+        positions[i] = weights
+
+    loop_end = time.perf_counter()
+    positions = pd.DataFrame(positions, index=prices.index.rename("epoch"), columns=columns, copy=False)
+    frame_end = time.perf_counter()
+    if not strict and not validate_positions(positions):
+        raise ValueError("Décisions invalides, voir les erreurs ci-dessus")
+
+    if timings is not None:
+        end = time.perf_counter()
+        add_times(timings, epochs=len(prices), total=end - start, bot=bot_time)
+        if profile:
+            add_times(
+                timings,
+                checks=loop_end - start - bot_time,
+                positions=frame_end - loop_end,
+                validation=end - frame_end,
+            )
+            timings.setdefault("latency", LatencyStats()).add_many(latencies, prices.index)
+    return positions
+
+def run_batch(
+    prices: pd.DataFrame,
+    batch_generator,
+    timings: dict | None = None,
+    replay_samples: int = REPLAY_SAMPLES,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Positions of a vectorized bot, called once for all the epochs.
+
+    The bot is called as `make_decisions(prices)`, with the (epochs x
+    assets) array of the prices of the asset columns (read-only), and must
+    return an (epochs x columns) array of weights: one row per epoch, one
+    column per asset in header order, then "Cash".
+
+    Row t must only depend on the prices up to epoch t, as if the bot had
+    been called epoch by epoch. This is checked by a replay on
+    `replay_samples` epochs drawn at random: for each of them, the bot is
+    called again on the prices up to that epoch only, and must return the
+    same rows. The positions are then validated as in `run_epochs`, and
+    `timings` gets the number of epochs, the total time, the time inside
+    the bot and the time of the replay ("replay").
+    """
+    columns = list(prices.columns)
+    asset_prices = get_asset_prices(prices)
+
+    start = time.perf_counter()
+    weights = _batch_weights(batch_generator, asset_prices, columns)
+    bot_time = time.perf_counter() - start
+
+    nb_epochs = len(prices)
+    rng = np.random.default_rng(seed)
+    # The last epoch is left out: the replay would see the same prices
+    replayed = rng.choice(nb_epochs - 1, size=min(replay_samples, nb_epochs - 1), replace=False)
+    for epoch in np.sort(replayed).tolist():
+        replay = _batch_weights(batch_generator, asset_prices[: epoch + 1], columns)
+        matches = np.isclose(replay, weights[: epoch + 1], rtol=1e-9, atol=1e-12, equal_nan=True).all(axis=1)
+        if not matches.all():
+            first = int(np.argmin(matches))
+            print(
+                f"ERREUR: make_decisions utilise des prix futurs: la décision de l'époque {prices.index[first]}"
+                f" change quand les prix après l'époque {prices.index[epoch]} sont retirés"
+                f" ({replay[first].tolist()} au lieu de {weights[first].tolist()})"
+            )
+            raise ValueError("make_decisions doit n'utiliser, pour chaque époque, que les prix jusqu'à cette époque")
+    replay_end = time.perf_counter()
+
+    positions = pd.DataFrame(weights, index=prices.index.rename("epoch"), columns=columns, copy=False)
+    if not validate_positions(positions):
+        raise ValueError("Décisions invalides, voir les erreurs ci-dessus")
+
+    if timings is not None:
+        add_times(
+            timings,
+            epochs=nb_epochs,
+            total=time.perf_counter() - start,
+            bot=bot_time,
+            replay=replay_end - start - bot_time,
+        )
+    return positions
+
+def _batch_weights(batch_generator, asset_prices: np.ndarray, columns: list[str]) -> np.ndarray:
+    weights = batch_generator(asset_prices)
+    if isinstance(weights, pd.DataFrame):
+        weights = weights[columns]
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (len(asset_prices), len(columns)):
+        raise ValueError(
+            f"make_decisions doit retourner un tableau de forme {(len(asset_prices), len(columns))}"
+            f" (époques x {columns}), reçu {weights.shape}"
+        )
+    return weights
+
+def run_bot(
+    prices: pd.DataFrame,
+    bot,
+    timings: dict | None = None,
+    strict: bool = False,
+    profile: bool = False,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Positions of `bot` (a `bot_trade.Bot` instance, or the `bot_trade`
+    module) on `prices`: through its vectorized `make_decisions`
+    (`run_batch`) when it defines one, else epoch by epoch through
+    `decision_function` (`run_epochs`).
+    """
+    if hasattr(bot, "make_decisions"):
+        return run_batch(prices, bot.make_decisions, timings=timings, seed=seed)
+    return run_epochs(prices, decision_function(bot), timings=timings, strict=strict, profile=profile)
+
+def decision_function(bot):
+    """
+    The per-epoch entry point of `bot`: `on_epoch` for a `bot_trade.Bot`
+    instance, `make_decision` for the module.
+    """
+    if hasattr(bot, "on_epoch"):
+        return bot.on_epoch
+    if hasattr(bot, "make_decision"):
+        return bot.make_decision
+    raise ValueError("bot_trade.py doit définir make_decision, make_decisions ou une classe Bot")
+
+def run_chunked(
+    windows: Iterable[pd.DataFrame],
+    decision_generator,
+    timings: dict | None = None,
+    strict: bool = False,
+    profile: bool = False,
+    checkpoint: Checkpoint | None = None,
+    bot=None,
+    resume: dict | None = None,
+) -> dict:
+    """
+    `run_epochs` followed by `get_local_score`, over consecutive windows of
+    prices (`stream_csv_file`, or `PriceStore.iter_windows`).
+
+    The positions of each window are scored by a `StreamingBacktester` and
+    dropped, so that only one window of prices and positions is in memory
+    at a time, whatever the number of epochs. The scores are the same as
+    with `get_local_score`; VaR and CVaR come from a quantile sketch, and
+    the returned pnl is sampled down to at most `PNL_POINTS` epochs.
+
+    `timings` and `profile` are as in `run_epochs`; with `profile=True`,
+    reading the windows ("load") and scoring them ("backtest",
+    "compute_stats", "scores") are timed too.
+
+    A bot that takes a `history` argument gets the prices of every epoch
+    since the first window (a `PriceHistory` shared by the windows): their
+    memory then grows with the number of epochs, by 8 bytes per epoch and
+    asset.
+
+    With `checkpoint`, the state of the run (`bot`, the object holding the
+    state of `decision_generator`, the backtester, the sampled pnl and the
+    price history) is saved after each window ending at least
+    `checkpoint.every` epochs after the previous snapshot. `resume` is
+    such a state (`Checkpoint.load`) to continue from, in which case
+    `windows` must start at the first epoch it does not cover; the results
+    are then the same as those of an uninterrupted run.
+    """
+    backtester = None
+    history = None
+    # pnl of every `step`-th epoch; `step` doubles whenever too many are kept
+    step = 1
+    pnl = {}
+    if resume is not None:
+        backtester, history, step, pnl = resume["backtester"], resume["history"], resume["step"], resume["pnl"]
+    profile_timings = timings if profile else None
+    if timings is not None:
+        # Counted even when no window is left (run resumed after its end)
+        add_times(timings, epochs=0, total=0.0, bot=0.0)
+
+    for prices in timed_iter(windows, profile_timings, "load"):
+        if backtester is None:
+            backtester = StreamingBacktester(
+                columns=list(prices.columns),
+                initial_capital=1_000,
+                quantile="sketch",
+            )
+            if takes_history(decision_generator):
+                history = PriceHistory(nb_assets=len(get_asset_columns(prices)), capacity=len(prices))
+        start = backtester.nb_epochs
+        positions = run_epochs(
+            prices,
+            decision_generator,
+            timings=timings,
+            strict=strict,
+            profile=profile,
+            history=history,
+        )
+        backtest_start = time.perf_counter()
+        chunk_pnl = backtester.update_many(prices.index, prices, positions)
+        if profile_timings is not None:
+            add_times(profile_timings, backtest=time.perf_counter() - backtest_start)
+
+        sampled = np.flatnonzero((np.arange(start, start + len(prices)) % step) == 0)
+        pnl.update(zip(prices.index[sampled].tolist(), chunk_pnl[sampled].tolist()))
+        while len(pnl) > PNL_POINTS:
+            step *= 2
+            pnl = dict(itertools.islice(pnl.items(), 0, None, 2))
+
+        if checkpoint is not None and checkpoint.is_due(backtester.nb_epochs):
+            checkpoint_start = time.perf_counter()
+            checkpoint.save(
+                backtester.nb_epochs,
+                bot=bot,
+                backtester=backtester,
+                history=history,
+                step=step,
+                pnl=pnl,
+            )
+            if profile_timings is not None:
+                add_times(profile_timings, checkpoint=time.perf_counter() - checkpoint_start)
+
+    if backtester is None:
+        raise ValueError("Aucune époque dans le fichier de prix")
+    pnl[backtester.epoch] = backtester.pnl
+
+    stats_start = time.perf_counter()
+    stats = backtester.stats()
+    scores_start = time.perf_counter()
+    scores = backtester.scores()
+    if profile_timings is not None:
+        add_times(
+            profile_timings,
+            compute_stats=scores_start - stats_start,
+            scores=time.perf_counter() - scores_start,
+        )
+
+    return {
+        "pnl": pnl,
+        "stats": stats,
+        "scores": scores,
+    }
+
+def show_timings(timings: dict):
+    epochs = max(timings["epochs"], 1)
+    driver = timings["total"] - timings["bot"]
+    print("\n⏱️  TEMPS D'EXÉCUTION:")
+    print("-" * 70)
+    print(f"  Époques:           {timings['epochs']}")
+    print(f"  Bot (total):       {timings['bot']:.4f} s  ({timings['bot'] / epochs * 1e6:.2f} µs/époque)")
+    print(f"  Driver (total):    {driver:.4f} s  ({driver / epochs * 1e6:.2f} µs/époque)")
+
+# Stages of `--profile`, in display order, as recorded in `timings`
+PROFILE_STAGES = {
+    "load": "chargement des prix",
+    "bot": "bot",
+    "checks": "driver par époque",
+    "positions": "DataFrame des positions",
+    "validation": "validate_positions",
+    "replay": "rejeu de make_decisions",
+    "backtest": "backtest",
+    "compute_stats": "compute_stats",
+    "scores": "scores et PnL",
+    "checkpoint": "points de reprise",
+    "windows": "fenêtres glissantes",
+    "bootstrap": "bootstrap",
+}
+# Stages whose net allocations are shown
+PROFILE_BLOCKS = {
+    "load": "chargement des prix",
+    "run_epochs": "boucle des époques",
+    "scoring": "scoring",
+    "run_chunked": "boucle et scoring par blocs",
+    "live": "flux en direct",
+    "bootstrap": "bootstrap",
+}
+
+def show_profile(timings: dict, wall_time: float):
+    epochs = max(timings["epochs"], 1)
+    print(f"\n🔬 PROFIL ({timings['epochs']} époques, {wall_time:.4f} s au total):")
+    print("-" * 70)
+    print(f"  {'':<26} {'temps (s)':>10} {'part':>7} {'µs/époque':>11}")
+    rows = [(label, timings[key]) for key, label in PROFILE_STAGES.items() if key in timings]
+    rows.append(("autres", wall_time - sum(seconds for _, seconds in rows)))
+    for label, seconds in rows:
+        print(f"  {label:<26} {seconds:>10.4f} {seconds / wall_time:>7.1%} {seconds / epochs * 1e6:>11.2f}")
+
+    # Per-epoch latencies only exist for bots called epoch by epoch
+    if "latency" in timings:
+        show_latency("Latence de make_decision", timings["latency"])
+
+    print("\n  Blocs mémoire alloués (nets):")
+    for key, label in PROFILE_BLOCKS.items():
+        if key in timings.get("blocks", {}):
+            blocks = timings["blocks"][key]
+            per_epoch = f"  ({blocks / epochs:+.2f} par époque)" if key in ("run_epochs", "run_chunked", "live") else ""
+            print(f"    {label:<28} {blocks:>+12}{per_epoch}")
+
+def show_latency(title: str, latency: LatencyStats):
+    print(f"\n  {title}:")
+    print(
+        f"    p50 {latency.quantile(0.5) * 1e6:.2f} µs   p90 {latency.quantile(0.9) * 1e6:.2f} µs"
+        f"   p99 {latency.quantile(0.99) * 1e6:.2f} µs   max {latency.max * 1e6:.2f} µs (époque {latency.max_epoch})"
+    )
+    labels = ["< 1 µs", "1-10 µs", "10-100 µs", "0.1-1 ms", "1-10 ms", "10-100 ms", "> 100 ms"]
+    for label, count in zip(labels, latency.histogram.tolist()):
+        if count:
+            bar = "█" * max(1, round(40 * count / latency.count))
+            print(f"    {label:<10} {count:>10} {bar}")
+
+def show_live_latency(latency: dict):
+    print(f"\n⚡ LATENCE PAR TICK ({latency['tick'].count} ticks):")
+    print("-" * 70)
+    show_latency("Bot (make_decision)", latency["bot"])
+    show_latency("Tick (réception de la ligne -> backtest à jour)", latency["tick"])
+
+# ============================================================================
+# recherche d'hyperparamètres (--sweep)
+# ============================================================================
+
+def load_grid(path_grid: str) -> list[dict]:
+    """
+    Read a grid file mapping `bot_trade` module-level names to lists of
+    values, and return every combination as a dict of overrides.
+    """
+    if not os.path.exists(path_grid):
+        raise FileNotFoundError(f"Le fichier de grille {path_grid} n'existe pas")
+    with open(path_grid) as f:
+        if path_grid.endswith(".json"):
+            grid = json.load(f)
+        else:
+            # pyyaml is an optional dependency (see requirement.txt)
+            import yaml
+            grid = yaml.safe_load(f)
+
+    if not isinstance(grid, dict) or not grid:
+        raise ValueError(f"La grille {path_grid} doit associer des noms de paramètres à des listes de valeurs")
+
+    names = list(grid)
+    values = [v if isinstance(v, list) else [v] for v in grid.values()]
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+def new_bot(params: dict | None = None, module_name: str = "bot_trade_sweep"):
+    """
+    A bot with fresh state and `params` overriding its defaults: a
+    `bot_trade.Bot` instance when the module defines the class, else a
+    fresh instance of the module itself (`load_bot`).
+    """
+    if hasattr(bot_trade, "Bot"):
+        return bot_trade.Bot(params or {})
+    return load_bot(params or {}, module_name=module_name)
+
+def reset_bot(bot, module_name: str = "bot_trade_sweep"):
+    """
+    `bot` with its state cleared: reset in place when it has a `reset`
+    method, else replaced by `new_bot`.
+    """
+    if hasattr(bot, "reset"):
+        bot.reset()
+        return bot
+    return new_bot(module_name=module_name)
+
+def load_bot(params: dict, module_name: str = "bot_trade_sweep"):
+    # A fresh module instance per configuration, for bots without a `Bot`
+    # class: they keep their state (e.g. `history`) at module level
+    spec = importlib.util.spec_from_file_location(module_name, BOT_PATH)
+    bot = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bot)
+    for key, value in params.items():
+        if not hasattr(bot, key):
+            raise AttributeError(f"bot_trade ne définit pas le paramètre '{key}'")
+        setattr(bot, key, value)
+    return bot
+
+def config_id(params: dict) -> str:
+    return json.dumps(params, sort_keys=True)
+
+# Prices loaded once per worker process (sweep and bootstrap)
+_worker_prices = None
+
+def _init_worker(path_csv: str | None, cache: bool = True, synthetic: dict | None = None):
+    global _worker_prices
+    _worker_prices = load_prices(path_csv=path_csv, cache=cache, synthetic=synthetic)
+
+def _score_config(params: dict) -> dict:
+    bot = new_bot(params)
+    positions = run_bot(_worker_prices, bot)
+    local_score = get_local_score(prices=_worker_prices, positions=positions)
+    return {
+        "config_id": config_id(params),
+        **params,
+        **local_score["stats"],
+        **local_score["scores"],
+    }
+
+def run_sweep(
+    path_csv: str,
+    path_grid: str,
+    path_output: str,
+    workers: int | None = None,
+    cache: bool = True,
+    synthetic: dict | None = None,
+):
+    """
+    Score every configuration of the grid in a process pool and append one
+    row per configuration to `path_output` as soon as it is scored.
+    Configurations already present in `path_output` are skipped, so an
+    interrupted sweep can be resumed with the same command. The rows are
+    appended under the existing header, whatever the order of the keys of
+    the grid; a grid with other parameters than those of `path_output` is
+    refused.
+
+    With `synthetic`, the prices are drawn by `load_prices` instead of
+    being read from `path_csv`.
+    """
+    if synthetic is None and not os.path.exists(path_csv):
+        raise FileNotFoundError(f"Le fichier CSV {path_csv} n'existe pas")
+    configs = load_grid(path_grid)
+
+    done = set()
+    fieldnames = None
+    if os.path.exists(path_output):
+        with open(path_output, newline="") as f:
+            reader = csv.DictReader(f)
+            done = {row["config_id"] for row in reader}
+            fieldnames = reader.fieldnames
+        # The parameters of the results, read back from their config_id
+        names = {name for done_id in done for name in json.loads(done_id)}
+        if done and names != set(configs[0]):
+            raise ValueError(
+                f"ERREUR: {path_output} contient les résultats d'une grille sur les paramètres {sorted(names)}, "
+                f"pas {sorted(configs[0])}: choisissez un autre --sweep-output"
+            )
+    todo = [params for params in configs if config_id(params) not in done]
+    print(f"{len(configs)} configurations, {len(configs) - len(todo)} déjà évaluées, {len(todo)} à évaluer")
+    if not todo:
+        return
+
+    # Appended to existing results, else (also when it only has a header)
+    # written from scratch
+    with open(path_output, "a" if done else "w", newline="") as f, ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(path_csv, cache, synthetic)
+    ) as executor:
+        writer = None
+        futures = [executor.submit(_score_config, params) for params in todo]
+        for count, future in enumerate(as_completed(futures), start=1):
+            row = future.result()
+            if writer is None:
+                # Columns in the order of the existing header, if any
+                writer = csv.DictWriter(f, fieldnames=fieldnames or list(row))
+                if f.tell() == 0:
+                    writer.writeheader()
+            writer.writerow(row)
+            f.flush()
+            print(f"[{count}/{len(todo)}] base score {row['base_score']:.4f} {row['config_id']}")
+
+# ============================================================================
+# robustesse (--bootstrap)
+# ============================================================================
+
+def _score_bootstrap_batch(seed: int, batch: int, nb_paths: int, block_size: int) -> pd.DataFrame:
+    rng = np.random.default_rng([seed, batch])
+    paths = block_bootstrap_paths(_worker_prices, nb_paths=nb_paths, block_size=block_size, rng=rng)
+    columns = list(_worker_prices.columns)
+
+    positions = np.empty_like(paths)
+    bot = new_bot(module_name="bot_trade_bootstrap")
+    for k, path in enumerate(paths):
+        # A fresh state per path, so that nothing leaks from one path to the next
+        if k:
+            bot = reset_bot(bot, module_name="bot_trade_bootstrap")
+        prices = pd.DataFrame(path, index=_worker_prices.index, columns=columns, copy=False)
+        positions[k] = run_bot(prices, bot).to_numpy()
+
+    # All the paths of the batch are backtested and scored together
+    samples = backtest_paths(paths, positions, columns=columns, initial_capital=1_000)
+    first = batch * BOOTSTRAP_BATCH
+    samples.index = pd.RangeIndex(first, first + nb_paths, name="path")
+    return samples
+
+def run_bootstrap(
+    path_csv: str,
+    nb_paths: int,
+    block_size: int = BLOCK_SIZE,
+    seed: int = 0,
+    workers: int | None = None,
+    cache: bool = True,
+    synthetic: dict | None = None,
+) -> pd.DataFrame:
+    """
+    Run and score the bot on `nb_paths` block-bootstrap resamples of the
+    prices of `path_csv` (or of the `synthetic` prices, see `load_prices`,
+    when given; see `scoring/resampling.py`), and return one row of stats
+    and scores per path.
+
+    Paths are drawn and scored by batches of `BOOTSTRAP_BATCH` in a process
+    pool. Batch k draws from a generator seeded with `(seed, k)`, so the
+    paths and their scores do not depend on the number of workers.
+    """
+    if synthetic is None and not os.path.exists(path_csv):
+        raise FileNotFoundError(f"Le fichier CSV {path_csv} n'existe pas")
+    if nb_paths < 1:
+        raise ValueError(f"Le nombre de chemins doit être positif, reçu {nb_paths}")
+
+    batches = []
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(path_csv, cache, synthetic)
+    ) as executor:
+        futures = [
+            executor.submit(
+                _score_bootstrap_batch,
+                seed,
+                batch,
+                min(BOOTSTRAP_BATCH, nb_paths - first),
+                block_size,
+            )
+            for batch, first in enumerate(range(0, nb_paths, BOOTSTRAP_BATCH))
+        ]
+        done = 0
+        for future in as_completed(futures):
+            batches.append(future.result())
+            done += len(batches[-1])
+            print(f"\r[{done}/{nb_paths}] chemins évalués", end="", flush=True)
+    print()
+    return pd.concat(batches).sort_index()
+
+# ============================================================================
+# flux en direct (--live)
+# ============================================================================
+
+async def run_live(
+    ticks: AsyncIterator[str],
+    decision_generator,
+    timings: dict | None = None,
+    latency_output: str | None = None,
+) -> dict:
+    """
+    Run the bot on a live feed (see `scoring/live.py`) and score it as the
+    ticks come in, with the same results as `run_chunked` on a file of the
+    same ticks.
+
+    The first line of `ticks` is the CSV header, then each line is a tick:
+    the bot is called on it as in `run_epochs` (with `history` if it takes
+    one), its decision is fully validated and fed to a
+    `StreamingBacktester`. Two latencies are recorded per tick: "bot", the
+    call to the bot, and "tick", from the reception of the line to the
+    updated backtest. They are returned under "latency" as `LatencyStats`,
+    and written per tick to the `latency_output` CSV (in microseconds)
+    when given. `timings` gets the number of ticks, the total time and the
+    time inside the bot, as with `run_epochs`.
+
+    The run ends with the feed, or when the task is cancelled (Ctrl-C): the
+    scores are then those of the ticks received so far. The feed is closed
+    in every case. `ticks` must be an asynchronous generator, as the feeds
+    of `scoring/live.py` are.
+    """
+    lines = aiter(ticks)
+    try:
+        header = await anext(lines)
+    except StopAsyncIteration:
+        raise ValueError("Le flux de prix est vide") from None
+    assets = header.rstrip("\r\n").split(",")[1:]
+    columns = assets + ["Cash"]
+    expected_keys = set(columns)
+    backtester = StreamingBacktester(columns=columns, initial_capital=1_000, quantile="sketch")
+    history = PriceHistory(nb_assets=len(assets)) if takes_history(decision_generator) else None
+    bot_kwargs = {}
+    # pnl of every `step`-th tick, as in `run_chunked`
+    step = 1
+    pnl = {}
+    latency = {"bot": LatencyStats(), "tick": LatencyStats()}
+    epochs, bot_latencies, tick_latencies = [], [], []
+    bot_time = 0.0
+    start = time.perf_counter()
+
+    with open(latency_output, "w", newline="") if latency_output else contextlib.nullcontext() as f:
+        writer = csv.writer(f) if f is not None else None
+        if writer is not None:
+            writer.writerow(["epoch", "bot_us", "tick_us"])
+
+        def flush():
+            latency["bot"].add_many(bot_latencies, epochs)
+            latency["tick"].add_many(tick_latencies, epochs)
+            if writer is not None:
+                writer.writerows(
+                    (epoch, f"{bot * 1e6:.3f}", f"{tick * 1e6:.3f}")
+                    for epoch, bot, tick in zip(epochs, bot_latencies, tick_latencies)
+                )
+            epochs.clear()
+            bot_latencies.clear()
+            tick_latencies.clear()
+
+        try:
+            async for line in lines:
+                received = time.perf_counter()
+                fields = line.rstrip("\r\n").split(",")
+                if len(fields) != len(columns):
+                    if not line.strip():
+                        continue
+                    raise ValueError(f"Tick invalide (attendu: {header.strip()}): {line.strip()}")
+                try:
+                    epoch = int(fields[0])
+                except ValueError:
+                    epoch = fields[0]
+                current_prices = [float(price) for price in fields[1:]]
+                if history is not None:
+                    history.append(*current_prices)
+                    bot_kwargs["history"] = history.view()
+
+                bot_start = time.perf_counter()
+                decision = decision_generator(epoch, *current_prices, **bot_kwargs)
+                bot_end = time.perf_counter()
+                if not validate_decision(decision, expected_keys):
+                    raise ValueError(f"Décision invalide: {decision}")
+                current_prices.append(1.0)
+                tick_pnl = backtester.update(epoch, current_prices, decision)
+                if (backtester.nb_epochs - 1) % step == 0:
+                    pnl[epoch] = tick_pnl
+                    while len(pnl) > PNL_POINTS:
+                        step *= 2
+                        pnl = dict(itertools.islice(pnl.items(), 0, None, 2))
+                done = time.perf_counter()
+
+                bot_time += bot_end - bot_start
+                epochs.append(epoch)
+                bot_latencies.append(bot_end - bot_start)
+                tick_latencies.append(done - received)
+                if len(epochs) >= LATENCY_BATCH:
+                    flush()
+        except asyncio.CancelledError:
+            # Ctrl-C: score the ticks received so far instead of losing them
+            print(f"\nFlux interrompu après {backtester.nb_epochs} ticks")
+        finally:
+            # Close the feed (its file or connection) now rather than when
+            # the generator is collected, also when the run fails
+            await lines.aclose()
+        flush()
+
+    if backtester.nb_epochs == 0:
+        raise ValueError("Aucun tick reçu")
+    pnl[backtester.epoch] = backtester.pnl
+    if timings is not None:
+        add_times(timings, epochs=backtester.nb_epochs, total=time.perf_counter() - start, bot=bot_time)
+    return {
+        "pnl": pnl,
+        "stats": backtester.stats(),
+        "scores": backtester.scores(),
+        "latency": latency,
+    }
+
+async def run_feed(args: argparse.Namespace, decision_generator, timings: dict | None) -> dict:
+    """
+    `run_live` on the feed chosen with --live: the CSV being written at
+    `path_csv` ("tail"), the Unix socket --socket ("socket"), or `path_csv`
+    replayed at --rate ticks per second by a stand-in for the exchange
+    running in the same event loop ("replay").
+    """
+    run = lambda ticks: run_live(ticks, decision_generator, timings=timings, latency_output=args.latency_output)
+    if args.live == "tail":
+        return await run(tail_csv(args.path_csv, idle_timeout=args.idle_timeout))
+    if args.live == "socket":
+        return await run(read_socket(args.socket))
+    with tempfile.TemporaryDirectory() as directory:
+        path_socket = args.socket or os.path.join(directory, "feed.sock")
+        async with await serve_replay(args.path_csv, path_socket, rate=args.rate):
+            return await run(read_socket(path_socket))
+
+async def serve_feed(path_csv: str, path_socket: str, rate: float):
+    server = await serve_replay(path_csv, path_socket, rate=rate)
+    speed = f"{rate:g} ticks/s" if rate else "au plus vite"
+    print(f"Rejeu de {path_csv} sur {path_socket} ({speed}), Ctrl-C pour arrêter")
+    async with server:
+        await server.serve_forever()
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Évalue le bot de bot_trade.py sur un fichier de prix")
+    parser.add_argument("path_csv", nargs="?", help="chemin vers le fichier CSV des prix")
+    parser.add_argument("--show-graph", action="store_true", help="affiche le graphique du PnL")
+    parser.add_argument("--timing", action="store_true", help="affiche le temps passé dans le bot et dans le driver")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="affiche le temps de chaque étape, la latence de make_decision et les allocations",
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="FICHIER",
+        help="enregistre aussi un profil cProfile (.json: speedscope, sinon pstats); implique --profile",
+    )
+    parser.add_argument(
+        "--strict-validation",
+        action="store_true",
+        help="valide entièrement chaque décision dès qu'elle est prise (plus lent, pour déboguer)",
+    )
+    parser.add_argument("--sweep", metavar="GRID", help="grille d'hyperparamètres (.yaml ou .json) à évaluer")
+    parser.add_argument("--sweep-output", default="sweep_results.csv", help="fichier CSV des résultats du sweep")
+    parser.add_argument("--workers", type=int, default=None, help="nombre de processus pour le sweep et le bootstrap")
+    parser.add_argument("--window", type=int, default=None, help="évalue aussi le bot sur des fenêtres glissantes de N époques")
+    parser.add_argument("--step", type=int, default=None, help="décalage entre deux fenêtres (par défaut, la taille de la fenêtre)")
+    parser.add_argument("--expanding", action="store_true", help="fenêtres croissantes, toutes depuis la première époque")
+    parser.add_argument("--windows-output", metavar="CSV", help="enregistre les scores de chaque fenêtre dans un CSV")
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        metavar="N",
+        default=None,
+        help="évalue aussi le bot sur N chemins de prix rééchantillonnés par blocs",
+    )
+    parser.add_argument(
+        "--block-size",
+        type=int,
+        default=BLOCK_SIZE,
+        help=f"époques consécutives par bloc rééchantillonné (par défaut {BLOCK_SIZE})",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="graine du rééchantillonnage, des prix synthétiques et des époques rejouées pour make_decisions",
+    )
+    parser.add_argument(
+        "--synthetic",
+        choices=MODELS,
+        default=None,
+        help="évalue le bot sur des prix synthétiques tirés selon ce modèle, au lieu d'un CSV",
+    )
+    parser.add_argument(
+        "--epochs",
+        type=int,
+        default=SYNTHETIC_EPOCHS,
+        help=f"nombre d'époques des prix synthétiques (par défaut {SYNTHETIC_EPOCHS})",
+    )
+    parser.add_argument(
+        "--assets",
+        type=int,
+        default=None,
+        help="nombre d'actifs des prix synthétiques, nommés Asset A, Asset B, ... (par défaut, les actifs des CSV de data/)",
+    )
+    parser.add_argument("--bootstrap-output", metavar="CSV", help="enregistre les scores de chaque chemin dans un CSV")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="lit les prix par blocs de N époques (mémoire bornée, pour les très gros fichiers)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="lit le CSV par blocs en une seule passe, sans créer de fichier binaire",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="FICHIER",
+        help="enregistre régulièrement l'état de l'exécution par blocs (bot, backtest, position) dans FICHIER",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=CHECKPOINT_EVERY,
+        help=f"nombre minimal d'époques entre deux points de reprise (par défaut {CHECKPOINT_EVERY})",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="reprend l'exécution depuis le point de reprise de --checkpoint, s'il existe",
+    )
+    parser.add_argument(
+        "--live",
+        choices=("tail", "socket", "replay"),
+        default=None,
+        help=(
+            "évalue le bot tick par tick sur un flux: le CSV en cours d'écriture (tail), le socket Unix --socket"
+            " (socket), ou le CSV rejoué à --rate ticks/s par un serveur local (replay)"
+        ),
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="rejoue le CSV à --rate ticks/s à chaque client du socket Unix --socket, jusqu'à Ctrl-C",
+    )
+    parser.add_argument("--socket", metavar="CHEMIN", help="socket Unix du flux (--live socket, --serve)")
+    parser.add_argument("--rate", type=float, default=0.0, help="ticks par seconde du rejeu (par défaut 0: au plus vite)")
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=None,
+        help="avec --live tail, s'arrête après N secondes sans nouvelle ligne (par défaut: jusqu'à Ctrl-C)",
+    )
+    parser.add_argument("--latency-output", metavar="CSV", help="enregistre la latence de chaque tick (--live) dans un CSV")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="relit le CSV sans utiliser ni créer le cache binaire des prix",
+    )
+    return parser.parse_args()
+
+def evaluate(args: argparse.Namespace, synthetic: dict | None, timings: dict | None, profile: bool) -> dict:
+    """
+    Run the bot on the prices given on the command line and score it, as
+    `get_local_score` (or `run_chunked`) returns it, with the walk-forward
+    and bootstrap results when requested.
+    """
+    # Per-stage time and allocations, recorded with --profile only
+    stage_timings = timings if profile else None
+    bot = bot_trade.Bot() if hasattr(bot_trade, "Bot") else bot_trade
+    if args.resume and not args.checkpoint:
+        raise ValueError("--resume reprend depuis le fichier de --checkpoint, qui doit être précisé")
+    if args.live:
+        if args.window or args.bootstrap or args.chunk_size or args.stream or args.checkpoint or synthetic is not None:
+            raise ValueError(
+                "--live n'est pas disponible avec --window, --bootstrap, --chunk-size, --stream, --checkpoint ou --synthetic"
+            )
+        if args.live == "socket" and not args.socket:
+            raise ValueError("--live socket lit le flux du socket Unix --socket, qui doit être précisé")
+        if not hasattr(bot, "on_epoch") and not hasattr(bot, "make_decision"):
+            raise ValueError("--live appelle le bot tick par tick: bot_trade.py doit définir make_decision ou Bot.on_epoch")
+        with stage(stage_timings, "live"):
+            return asyncio.run(run_feed(args, decision_function(bot), timings))
+    if args.chunk_size or args.stream or args.checkpoint:
+        if args.window or args.bootstrap:
+            raise ValueError("--window et --bootstrap ne sont pas disponibles avec --chunk-size, --stream ou --checkpoint")
+        if not hasattr(bot, "on_epoch") and not hasattr(bot, "make_decision"):
+            raise ValueError(
+                "--chunk-size et --stream appellent le bot époque par époque: bot_trade.py doit définir make_decision"
+                " ou Bot.on_epoch"
+            )
+        checkpoint, resume = None, None
+        if args.checkpoint:
+            # The state of a module cannot be pickled, that of an instance can
+            if not hasattr(bot_trade, "Bot"):
+                raise ValueError("--checkpoint enregistre l'état du bot: bot_trade.py doit définir une classe Bot")
+            checkpoint = Checkpoint(
+                args.checkpoint,
+                every=args.checkpoint_every,
+                source=price_source(args.path_csv, synthetic=synthetic),
+            )
+            if args.resume:
+                resume = checkpoint.load()
+                if resume is None:
+                    print(f"Aucun point de reprise dans {args.checkpoint}, départ de la première époque")
+                else:
+                    bot = resume["bot"]
+                    print(f"Reprise depuis {args.checkpoint} après {checkpoint.last_epochs} époques")
+        start = 0 if resume is None else resume["backtester"].nb_epochs
+
+        chunk_size = args.chunk_size or CHUNK_SIZE
+        if synthetic is not None:
+            with stage(stage_timings, "load"):
+                windows = iter_frame(load_prices(path_csv=None, synthetic=synthetic), chunk_size, start=start)
+        elif args.stream or args.no_cache:
+            # Without the binary store, which lives in the cache directory
+            windows = skip_epochs(stream_csv_file(path_csv=args.path_csv, chunk_size=chunk_size), start)
+        else:
+            with stage(stage_timings, "load"):
+                store = load_price_store(path_csv=args.path_csv)
+            windows = store.iter_windows(chunk_size, start=start)
+        with stage(stage_timings, "run_chunked"):
+            return run_chunked(
+                windows,
+                decision_function(bot),
+                timings=timings,
+                strict=args.strict_validation,
+                profile=profile,
+                checkpoint=checkpoint,
+                bot=bot,
+                resume=resume,
+            )
+
+    with stage(stage_timings, "load"):
+        prices = load_prices(path_csv=args.path_csv, cache=not args.no_cache, synthetic=synthetic)
+    with stage(stage_timings, "run_epochs"):
+        positions = run_bot(
+            prices,
+            bot,
+            timings=timings,
+            strict=args.strict_validation,
+            profile=profile,
+            seed=args.seed,
+        )
+    with stage(stage_timings, "scoring"):
+        local_score = get_local_score(
+            prices=prices,
+            positions=positions,
+            window=args.window,
+            step=args.step,
+            expanding=args.expanding,
+            timings=stage_timings,
+        )
+    if args.windows_output and "windows" in local_score:
+        local_score["windows"].to_csv(args.windows_output)
+    if args.bootstrap:
+        with stage(stage_timings, "bootstrap"):
+            samples = run_bootstrap(
+                path_csv=args.path_csv,
+                nb_paths=args.bootstrap,
+                block_size=args.block_size,
+                seed=args.seed,
+                workers=args.workers,
+                cache=not args.no_cache,
+                synthetic=synthetic,
+            )
+        local_score["bootstrap"] = samples
+        local_score["bootstrap_summary"] = summarize_bootstrap(samples)
+        if args.bootstrap_output:
+            samples.to_csv(args.bootstrap_output)
+    return local_score
+
 def main():
-    output = []
+    args = parse_args()
 
-    if (len(sys.argv) > 1):
-        path_csv = sys.argv[1]
-        prices = find_csv_file(path_csv=path_csv)
-    else:
+    synthetic = None
+    if args.synthetic:
+        names = kit_assets() if args.assets is None else asset_names(args.assets)
+        synthetic = {
+            "nb_epochs": args.epochs,
+            "nb_assets": len(names),
+            "names": names,
+            "model": args.synthetic,
+            "seed": args.seed,
+        }
+    elif args.path_csv is None and args.live != "socket":
         raise ValueError("No path to the csv file provided, ./main.py <path_to_csv>")
 
-    for index, row in prices.iterrows():
-        decision = decision_generator(int(index), float(row['Asset A']))
-        if not validate_decision(decision):
-            raise ValueError(f"Décision invalide: {decision}")
-        decision['epoch'] = int(index)
-        output.append(decision)
-    positions = pd.DataFrame(output).set_index("epoch")
-    local_score = get_local_score(prices=prices, positions=positions)
-    if len(sys.argv) > 2 and sys.argv[2] == "--show-graph":
+    if args.serve:
+        if not args.socket or synthetic is not None:
+            raise ValueError("--serve rejoue un fichier CSV sur le socket Unix --socket, qui doit être précisé")
+        try:
+            asyncio.run(serve_feed(args.path_csv, args.socket, rate=args.rate))
+        except KeyboardInterrupt:
+            print("\nServeur arrêté")
+        return
+
+    if args.sweep:
+        run_sweep(
+            path_csv=args.path_csv,
+            path_grid=args.sweep,
+            path_output=args.sweep_output,
+            workers=args.workers,
+            cache=not args.no_cache,
+            synthetic=synthetic,
+        )
+        return
+
+    profile = args.profile or args.profile_output is not None
+    timings = {} if args.timing or profile else None
+    # cProfile only runs with --profile-output, as it slows the bot down
+    profiler = cProfile.Profile() if args.profile_output else None
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        local_score = evaluate(args, synthetic, timings, profile)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            write_profile(profiler, args.profile_output)
+    wall_time = time.perf_counter() - start
+
+    if args.show_graph:
         show_result(local_score, is_show_graph=True)
     else:
         show_result(local_score, is_show_graph=False)
         print("\033[91mpour afficher le graphique, utilisez la commande --show-graph: ./main.py <path_to_csv> --show-graph\033[0m")
+    if "latency" in local_score:
+        show_live_latency(local_score["latency"])
+    if profile:
+        show_profile(timings, wall_time)
+    elif timings is not None:
+        show_timings(timings)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
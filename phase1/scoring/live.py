@@ -0,0 +1,115 @@
+# ============================================================================
+# ⚠️  ATTENTION: Ce fichier n’a pas de lien avec le développement de votre bot.
+# ⚠️  Vous pouvez l’ignorer.
+# ============================================================================
+
+"""
+Live price feeds, for `main.py --live`.
+
+A feed is an asynchronous iterator of the lines of a price CSV: the header
+first, then one line per tick, in the format of the CSV files (the epoch,
+then one price per asset). Feeds come from a local source:
+
+- `tail_csv`: a CSV file that another process keeps appending to;
+- `read_socket`: a Unix socket sending such lines;
+- `serve_replay`: a stand-in for the exchange, which replays a CSV file at
+  a given rate to every client of a Unix socket (`read_socket`).
+"""
+
+import asyncio
+import os
+from collections.abc import AsyncIterator
+
+# Seconds between two reads of a tailed CSV with no new line
+POLL_INTERVAL = 0.01
+
+
+async def tail_csv(
+    path_csv: str,
+    poll_interval: float = POLL_INTERVAL,
+    idle_timeout: float | None = None,
+) -> AsyncIterator[str]:
+    """
+    The lines of `path_csv`, including those appended after the call, as
+    `tail -f` does. A line is only returned once its newline is written.
+
+    Parameters
+    ----------
+    path_csv : str
+        CSV file to follow. It must exist.
+    poll_interval : float
+        Seconds to wait before reading again when there is no new line.
+    idle_timeout : float or None
+        Stop after this many seconds without a new line. None follows the
+        file until the task is cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    # Local file reads do not block for long: no thread is needed
+    with open(path_csv, newline="") as f:
+        partial = ""
+        last_line = loop.time()
+        while True:
+            line = f.readline()
+            if line:
+                partial += line
+                if partial.endswith("\n"):
+                    yield partial
+                    partial = ""
+                    last_line = loop.time()
+                continue
+            if idle_timeout is not None and loop.time() - last_line >= idle_timeout:
+                return
+            await asyncio.sleep(poll_interval)
+
+
+async def read_socket(path_socket: str) -> AsyncIterator[str]:
+    """
+    The lines sent on the Unix socket `path_socket`, until it is closed.
+    """
+    reader, writer = await asyncio.open_unix_connection(path_socket)
+    try:
+        while line := await reader.readline():
+            yield line.decode()
+    finally:
+        writer.close()
+
+
+async def serve_replay(path_csv: str, path_socket: str, rate: float = 0.0) -> asyncio.Server:
+    """
+    Start a Unix socket server that sends `path_csv` to each client: the
+    header at once, then one line per tick, `rate` ticks per second (as
+    fast as the client reads them if `rate` is 0), and closes the
+    connection at the end of the file.
+
+    Ticks are scheduled from the time of the first one rather than from the
+    previous one, so that the delays of the event loop do not accumulate.
+    """
+    if not os.path.exists(path_csv):
+        raise FileNotFoundError(f"Le fichier CSV {path_csv} n'existe pas")
+    if rate < 0:
+        raise ValueError(f"rate must be non-negative, got {rate}")
+
+    async def send(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        try:
+            with open(path_csv, "rb") as f:
+                writer.write(f.readline())
+                start = loop.time()
+                for tick, line in enumerate(f):
+                    if rate > 0:
+                        delay = start + tick / rate - loop.time()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                    writer.write(line)
+                    await writer.drain()
+        except ConnectionError:
+            # The client left before the end of the file
+            pass
+        except asyncio.CancelledError:
+            # The server is shutting down (Ctrl-C): end the connection
+            # quietly instead of leaving the cancellation unhandled
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_unix_server(send, path=path_socket)
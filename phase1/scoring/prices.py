@@ -0,0 +1,308 @@
+# ============================================================================
+# ⚠️  ATTENTION: Ce fichier n’a pas de lien avec le développement de votre bot.
+# ⚠️  Vous pouvez l’ignorer.
+# ============================================================================
+
+"""
+Price loading.
+
+Parsing the CSV dominates repeated loads of the same file (a sweep reads it
+once per worker, batch runs once per process). `read_prices_csv` stores the
+parsed prices as `.npy` files in a `.prices_cache/` directory next to the
+CSV, keyed by a hash of the CSV content, and memory-maps them on the next
+loads as long as the CSV is unchanged.
+
+Price histories too large to be loaded whole are read by windows of
+epochs instead, so memory stays bounded by the window size: either straight
+from the CSV with `iter_prices_csv` (one pass), or through a `PriceStore`,
+built from the CSV once and memory-mapped on the following runs.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = ".prices_cache"
+
+
+def file_digest(path: str) -> str:
+    """
+    Hash of the content of `path`, read in 1 MiB blocks.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_prices_csv(path_csv: str, cache: bool = True) -> pd.DataFrame:
+    """
+    Same result as `pd.read_csv(path_csv, index_col=0)`, through the cache.
+
+    Cached prices are backed by read-only memory maps: loading them costs
+    one hash of the CSV and no parsing or copy. A CSV whose columns do not
+    share a single numeric dtype, or whose index is not numeric, is not
+    cached, and neither is a CSV in a read-only directory.
+
+    Parameters
+    ----------
+    path_csv : str
+        Price CSV, epochs in the first column and one column per asset.
+    cache : bool
+        If False, parse the CSV and leave the cache untouched.
+    """
+    if not cache:
+        return pd.read_csv(path_csv, index_col=0)
+
+    prefix = _cache_prefix(path_csv, file_digest(path_csv))
+    prices = _load_cache(prefix)
+    if prices is not None:
+        return prices
+
+    prices = pd.read_csv(path_csv, index_col=0)
+    if not _is_cacheable(prices):
+        return prices
+    try:
+        _write_cache(prefix, prices)
+    except OSError:
+        return prices
+    # Reload so that the first load returns the same (read-only) frame as
+    # the following ones
+    cached = _load_cache(prefix)
+    return prices if cached is None else cached
+
+
+def iter_prices_csv(path_csv: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    The prices of `path_csv`, parsed `chunk_size` rows at a time, each chunk
+    with the "Cash" column that `find_csv_file` adds.
+    """
+    for prices in pd.read_csv(path_csv, index_col=0, chunksize=chunk_size):
+        prices["Cash"] = 1
+        yield prices
+
+
+def open_price_store(path_csv: str, chunk_size: int = 1_000_000) -> "PriceStore":
+    """
+    `PriceStore` of `path_csv`, kept in the cache directory next to the CSV
+    and rebuilt when the CSV content changes. A directory is opened as an
+    existing store.
+    """
+    if os.path.isdir(path_csv):
+        return PriceStore(path_csv)
+
+    prefix = _cache_prefix(path_csv, file_digest(path_csv))
+    path_store = prefix + ".store"
+    if not os.path.exists(os.path.join(path_store, PriceStore.META)):
+        PriceStore.from_csv(path_csv, path_store, chunk_size=chunk_size)
+        _remove_stale_entries(prefix)
+    return PriceStore(path_store)
+
+
+class PriceStore:
+    """
+    Prices on disk, read through `numpy.memmap` windows.
+
+    A store is a directory holding the prices as raw row-major float64
+    (epochs x assets), the epochs as a raw array and a `meta.json` file with
+    the shape, the asset names and the index name and dtype. Each `window`
+    maps only the requested epochs, and the mapping is released with the
+    returned frame, so iterating over a store never loads it whole.
+
+    Example
+    -------
+    >>> store = PriceStore.from_csv("data/ticks.csv", "data/ticks.store")
+    >>> for prices in store.iter_windows(1_000_000):
+    ...     ...
+    """
+
+    META = "meta.json"
+    VALUES = "values.f64"
+    INDEX = "index.bin"
+
+    def __init__(self, path_store: str):
+        self.path = path_store
+        with open(os.path.join(path_store, self.META)) as f:
+            meta = json.load(f)
+        self.columns = meta["columns"]
+        self.index_name = meta["index_name"]
+        self.index_dtype = np.dtype(meta["index_dtype"])
+        self.nb_epochs = meta["nb_epochs"]
+
+    @classmethod
+    def from_csv(cls, path_csv: str, path_store: str, chunk_size: int = 1_000_000) -> "PriceStore":
+        """
+        Build a store from a price CSV, parsed `chunk_size` rows at a time.
+        """
+        chunks = pd.read_csv(path_csv, index_col=0, chunksize=chunk_size)
+        return cls._build(chunks, path_store)
+
+    @classmethod
+    def from_frame(cls, prices: pd.DataFrame, path_store: str, chunk_size: int = 1_000_000) -> "PriceStore":
+        """
+        Build a store from prices laid out as in the CSV (no "Cash" column).
+        """
+        chunks = (prices.iloc[start:start + chunk_size] for start in range(0, len(prices), chunk_size))
+        return cls._build(chunks, path_store)
+
+    @classmethod
+    def _build(cls, chunks: Iterable[pd.DataFrame], path_store: str) -> "PriceStore":
+        # Built under a temporary name and renamed, so that a store is
+        # either complete or absent
+        tmp = f"{path_store}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        try:
+            meta = None
+            with open(os.path.join(tmp, cls.VALUES), "wb") as values, open(os.path.join(tmp, cls.INDEX), "wb") as index:
+                for chunk in chunks:
+                    if meta is None:
+                        if not np.issubdtype(chunk.index.dtype, np.number):
+                            raise ValueError(f"The epochs must be numeric, got {chunk.index.dtype}")
+                        meta = {
+                            "columns": list(chunk.columns),
+                            "index_name": chunk.index.name,
+                            "index_dtype": chunk.index.dtype.str,
+                            "nb_epochs": 0,
+                        }
+                    elif list(chunk.columns) != meta["columns"] or chunk.index.dtype.str != meta["index_dtype"]:
+                        raise ValueError("All the chunks must have the same columns and epoch dtype")
+                    values.write(np.ascontiguousarray(chunk.to_numpy(dtype=np.float64)).tobytes())
+                    index.write(np.ascontiguousarray(chunk.index.to_numpy()).tobytes())
+                    meta["nb_epochs"] += len(chunk)
+            if meta is None or meta["nb_epochs"] == 0:
+                raise ValueError("No prices to store")
+            with open(os.path.join(tmp, cls.META), "w") as f:
+                json.dump(meta, f)
+
+            if os.path.exists(os.path.join(path_store, cls.META)):
+                # Built concurrently by another process
+                shutil.rmtree(tmp)
+            else:
+                shutil.rmtree(path_store, ignore_errors=True)
+                os.replace(tmp, path_store)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        return cls(path_store)
+
+    def __len__(self) -> int:
+        return self.nb_epochs
+
+    def window(self, start: int, stop: int) -> pd.DataFrame:
+        """
+        Epochs `start` to `stop` (excluded, by position) as `find_csv_file`
+        returns them, with the "Cash" column.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        nb_rows = max(stop - start, 0)
+        nb_columns = len(self.columns)
+        if nb_rows == 0:
+            values = np.empty((0, nb_columns))
+            index = np.empty(0, dtype=self.index_dtype)
+        else:
+            values = np.memmap(
+                os.path.join(self.path, self.VALUES),
+                dtype=np.float64,
+                mode="r",
+                offset=start * nb_columns * 8,
+                shape=(nb_rows, nb_columns),
+            )
+            index = np.memmap(
+                os.path.join(self.path, self.INDEX),
+                dtype=self.index_dtype,
+                mode="r",
+                offset=start * self.index_dtype.itemsize,
+                shape=(nb_rows,),
+            )
+        prices = pd.DataFrame(
+            values,
+            index=pd.Index(index, name=self.index_name),
+            columns=self.columns,
+            copy=False,
+        )
+        prices["Cash"] = 1
+        return prices
+
+    def iter_windows(self, chunk_size: int, start: int = 0) -> Iterator[pd.DataFrame]:
+        """
+        Consecutive windows of `chunk_size` epochs covering the store from
+        epoch `start` (by position) to the end.
+        """
+        for first in range(start, len(self), chunk_size):
+            yield self.window(first, first + chunk_size)
+
+
+def _cache_prefix(path_csv: str, digest: str) -> str:
+    directory = os.path.join(os.path.dirname(os.path.abspath(path_csv)), CACHE_DIR)
+    return os.path.join(directory, f"{os.path.basename(path_csv)}.{digest}")
+
+
+def _is_cacheable(prices: pd.DataFrame) -> bool:
+    dtypes = set(prices.dtypes)
+    return (
+        len(dtypes) == 1
+        and np.issubdtype(dtypes.pop(), np.number)
+        and np.issubdtype(prices.index.dtype, np.number)
+    )
+
+
+def _load_cache(prefix: str) -> pd.DataFrame | None:
+    # The metadata file is written last, so an entry without it is incomplete
+    try:
+        with open(prefix + ".json") as f:
+            meta = json.load(f)
+        index = np.load(prefix + ".index.npy", mmap_mode="r")
+        values = np.load(prefix + ".values.npy", mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    return pd.DataFrame(
+        values,
+        index=pd.Index(index, name=meta["index_name"]),
+        columns=meta["columns"],
+        copy=False,
+    )
+
+
+def _write_cache(prefix: str, prices: pd.DataFrame):
+    directory = os.path.dirname(prefix)
+    os.makedirs(directory, exist_ok=True)
+
+    # Each file is written under a temporary name and renamed, so that
+    # concurrent loads (e.g. sweep workers) never see a partial file
+    def write(suffix: str, save):
+        tmp = f"{prefix}{suffix}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            save(f)
+        os.replace(tmp, prefix + suffix)
+
+    write(".values.npy", lambda f: np.save(f, prices.to_numpy()))
+    write(".index.npy", lambda f: np.save(f, prices.index.to_numpy()))
+    meta = {"columns": list(prices.columns), "index_name": prices.index.name}
+    write(".json", lambda f: f.write(json.dumps(meta).encode()))
+    _remove_stale_entries(prefix)
+
+
+def _remove_stale_entries(prefix: str):
+    # Drop the entries (cached frames and stores) of previous versions of
+    # the same CSV
+    directory = os.path.dirname(prefix)
+    name, digest = os.path.basename(prefix).rsplit(".", 1)
+    stale = re.compile(re.escape(name) + r"\.(?!" + digest + r")[0-9a-f]{32}\.")
+    for entry in os.listdir(directory):
+        if stale.match(entry):
+            path = os.path.join(directory, entry)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
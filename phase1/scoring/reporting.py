@@ -0,0 +1,34 @@
+# ============================================================================
+# ⚠️  ATTENTION: Ce fichier n’a pas de lien avec le développement de votre bot.
+# ⚠️  Vous pouvez l’ignorer.
+# ============================================================================
+
+"""
+Plotting for `show_result`.
+
+Kept out of `scoring.py` so that matplotlib is only imported when a graph
+is actually requested (`--show-graph`): a headless scoring run does not pay
+for its import time and memory.
+"""
+
+import pandas as pd
+import matplotlib.pyplot as plt
+
+
+def plot_pnl(pnl_dict: dict):
+    pnl_series = pd.Series(pnl_dict).sort_index()
+
+    plt.figure(figsize=(12, 6))
+    plt.plot(pnl_series.index, pnl_series.values, linewidth=2, color='#2E86AB')
+    plt.axhline(y=1.0, color='gray', linestyle='--', linewidth=1, alpha=0.5, label='Capital initial')
+    plt.fill_between(pnl_series.index, pnl_series.values, 1.0, 
+                    where=(pnl_series.values >= 1.0), alpha=0.3, color='green', label='Profit')
+    plt.fill_between(pnl_series.index, pnl_series.values, 1.0, 
+                    where=(pnl_series.values < 1.0), alpha=0.3, color='red', label='Perte')
+    plt.xlabel('Epoch', fontsize=12, fontweight='bold')
+    plt.ylabel('PnL (Multiplicateur)', fontsize=12, fontweight='bold')
+    plt.title('Évolution du PnL au fil du temps', fontsize=14, fontweight='bold', pad=20)
+    plt.grid(True, alpha=0.3, linestyle='--')
+    plt.legend(loc='best')
+    plt.tight_layout()
+    plt.show()
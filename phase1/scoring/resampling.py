@@ -0,0 +1,71 @@
+# ============================================================================
+# ⚠️  ATTENTION: Ce fichier n’a pas de lien avec le développement de votre bot.
+# ⚠️  Vous pouvez l’ignorer.
+# ============================================================================
+
+"""
+Resampled price paths, for robustness scoring.
+
+A score computed on the single historical path is one draw among the paths
+the market could have taken. `block_bootstrap_paths` rebuilds alternative
+paths from blocks of consecutive epochs of the historical returns (circular
+block bootstrap): blocks keep the short-term autocorrelation and volatility
+clustering of the returns, and all the assets are resampled together, so
+their correlation is kept as well.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def block_bootstrap_paths(
+    prices: pd.DataFrame,
+    nb_paths: int,
+    block_size: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Price paths rebuilt from blocks of the returns of `prices`.
+
+    Every path starts from the first row of `prices` and has as many epochs,
+    and is the compounded product of `block_size`-epoch blocks of returns
+    drawn uniformly (wrapping around the end of the series). A column of
+    constant prices, such as "Cash", stays constant.
+
+    Parameters
+    ----------
+    prices : DataFrame
+        Historical prices, epochs x assets.
+    nb_paths : int
+        Number of paths to draw.
+    block_size : int
+        Number of consecutive returns per block. 1 gives the plain (i.i.d.)
+        bootstrap.
+    rng : np.random.Generator
+        Source of the block draws.
+
+    Returns
+    -------
+    np.ndarray
+        Shape (nb_paths x epochs x assets), in the column order of `prices`.
+    """
+    values = prices.to_numpy(dtype=np.float64)
+    nb_epochs = len(values)
+    if nb_epochs < 2:
+        raise ValueError("Need at least 2 epochs to resample the returns")
+    if block_size < 1:
+        raise ValueError(f"block_size must be positive, got {block_size}")
+
+    gross_returns = values[1:] / values[:-1]
+    nb_returns = len(gross_returns)
+    nb_blocks = -(-nb_returns // block_size)
+
+    starts = rng.integers(0, nb_returns, size=(nb_paths, nb_blocks))
+    offsets = np.arange(block_size)
+    indexes = (starts[:, :, None] + offsets).reshape(nb_paths, -1)[:, :nb_returns] % nb_returns
+
+    paths = np.empty((nb_paths, nb_epochs, values.shape[1]))
+    paths[:, 0] = values[0]
+    np.cumprod(gross_returns[indexes], axis=1, out=paths[:, 1:])
+    paths[:, 1:] *= values[0]
+    return paths
@@ -4,11 +4,11 @@
 # ============================================================================
 
 import math
+import time
 from typing import Any
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
 
 def compute_stats(
@@ -152,11 +152,560 @@ def compute_stats(
         "expected_value_per_trade": expected_value_per_trade,
     }
 
+
+class QuantileSketch:
+    """
+    Streaming quantile sketch with bounded relative error.
+
+    Values are counted in logarithmic bins (as in DDSketch), so any
+    quantile is returned within `relative_accuracy` of an actual value of
+    the stream, and memory only depends on the range of magnitudes seen.
+    The sum of each bin is kept too, which gives an estimate of the mean
+    of the values below a quantile (CVaR).
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-12):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.count = 0
+        # bin key -> [count, sum]. Keys are (sign, index), sign 0 for |x| < min_value
+        self._bins: dict[tuple[int, int], list[float]] = {}
+
+    def _key(self, x: float) -> tuple[int, int]:
+        if abs(x) < self.min_value:
+            return (0, 0)
+        return (1 if x > 0 else -1, math.ceil(math.log(abs(x)) / self._log_gamma))
+
+    def add(self, x: float):
+        stats = self._bins.setdefault(self._key(x), [0, 0.0])
+        stats[0] += 1
+        stats[1] += x
+        self.count += 1
+
+    def add_many(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        magnitudes = np.abs(values)
+        signs = np.where(magnitudes < self.min_value, 0, np.sign(values)).astype(np.int64)
+        with np.errstate(divide="ignore"):
+            indexes = np.ceil(np.log(magnitudes) / self._log_gamma)
+        indexes = np.where(signs == 0, 0, indexes).astype(np.int64)
+
+        keys, inverse, counts = np.unique(
+            np.stack([signs, indexes], axis=1), axis=0, return_inverse=True, return_counts=True
+        )
+        sums = np.bincount(inverse.ravel(), weights=values, minlength=len(keys))
+        for (sign, index), count, total in zip(keys.tolist(), counts.tolist(), sums.tolist()):
+            stats = self._bins.setdefault((sign, index), [0, 0.0])
+            stats[0] += count
+            stats[1] += total
+        self.count += len(values)
+
+    def _value(self, key: tuple[int, int]) -> float:
+        sign, index = key
+        return sign * 2 * self._gamma**index / (self._gamma + 1)
+
+    def _sorted_keys(self) -> list[tuple[int, int]]:
+        # From the most negative to the most positive values
+        return sorted(self._bins, key=lambda key: (key[0], key[0] * key[1]))
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return np.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in self._sorted_keys():
+            seen += self._bins[key][0]
+            if seen > rank:
+                return self._value(key)
+        return self._value(key)
+
+    def mean_below(self, threshold: float) -> float:
+        count, total = 0, 0.0
+        for key in self._sorted_keys():
+            if self._value(key) > threshold:
+                break
+            count += self._bins[key][0]
+            total += self._bins[key][1]
+        return total / count if count else np.nan
+
+
+class OnlineStats:
+    """
+    Single-pass accumulator for the metrics of `compute_stats`.
+
+    Observations are added one at a time with `update` (O(1)) or by chunks
+    with `update_many` (vectorized, chunks are merged into the running
+    accumulators), and `stats()` can be called at any point.
+
+    Parameters
+    ----------
+    trading_days : int
+        Number of trading days per year (for annualization).
+    var_alpha : float
+        Tail probability for VaR / CVaR (e.g. 0.05 for 5%).
+    quantile : str
+        "exact" keeps every daily return for VaR / CVaR and matches
+        `compute_stats`. "sketch" uses a `QuantileSketch`, so memory stays
+        bounded whatever the number of observations.
+    relative_accuracy : float
+        Relative accuracy of the sketch (only used with quantile="sketch").
+    """
+
+    def __init__(
+        self,
+        trading_days: int = 252,
+        var_alpha: float = 0.05,
+        quantile: str = "exact",
+        relative_accuracy: float = 0.01,
+    ):
+        if quantile not in ("exact", "sketch"):
+            raise ValueError(f"Unknown quantile mode: {quantile!r}")
+        self.trading_days = trading_days
+        self.var_alpha = var_alpha
+        self.quantile = quantile
+
+        self.count = 0
+        self._first_pnl = None
+        self._last_pnl = None
+
+        # drawdown
+        self._pnl_max = -np.inf
+        self._max_drawdown = np.inf
+
+        # daily returns
+        self._nb_returns = 0
+        self._growth = 1.0
+        self._rets_mean = 0.0
+        self._rets_m2 = 0.0
+        self._returns: list[np.ndarray] = []
+        self._sketch = QuantileSketch(relative_accuracy) if quantile == "sketch" else None
+
+        # exposure metrics
+        self._nb_in_market = 0
+        self._market_exposure_sum = 0.0
+        self._prev_market_exposure = None
+        self._nb_changes = 0
+        self._nb_successes = 0
+        self._change_returns_sum = 0.0
+
+    def update(self, pnl: float, market_exposure: float, total_exposure: float):
+        """
+        Add one observation: equity value and absolute market / total exposure.
+        """
+        self.count += 1
+        self._nb_in_market += int(total_exposure > 0)
+        self._market_exposure_sum += market_exposure
+
+        if self._last_pnl is None:
+            self._first_pnl = pnl
+        else:
+            ret = pnl / self._last_pnl - 1.0
+            self._nb_returns += 1
+            self._growth *= 1.0 + ret
+            delta = ret - self._rets_mean
+            self._rets_mean += delta / self._nb_returns
+            self._rets_m2 += delta * (ret - self._rets_mean)
+            if self._sketch is None:
+                self._returns.append(np.array([ret]))
+            else:
+                self._sketch.add(ret)
+
+            # Exposure changes are measured on the returns index, so the
+            # first return has no previous exposure to compare against
+            prev_exposure = self._prev_market_exposure
+            if prev_exposure is not None and market_exposure != prev_exposure:
+                delta_exp = market_exposure - prev_exposure
+                self._nb_changes += 1
+                self._nb_successes += int(
+                    (delta_exp > 0 and ret > 0) or (delta_exp < 0 and ret < 0)
+                )
+                self._change_returns_sum += ret
+            self._prev_market_exposure = market_exposure
+
+        self._pnl_max = max(self._pnl_max, pnl)
+        # A numpy float, as `update_many` and `compute_stats` give
+        self._max_drawdown = min(self._max_drawdown, np.float64(pnl / self._pnl_max - 1.0))
+        self._last_pnl = pnl
+
+    def update_many(
+        self,
+        pnl: np.ndarray,
+        market_exposure: np.ndarray,
+        total_exposure: np.ndarray,
+    ):
+        """
+        Add a chunk of consecutive observations.
+        """
+        pnl = np.asarray(pnl, dtype=np.float64)
+        market_exposure = np.asarray(market_exposure, dtype=np.float64)
+        total_exposure = np.asarray(total_exposure, dtype=np.float64)
+        if not len(pnl):
+            return
+
+        self.count += len(pnl)
+        self._nb_in_market += int((total_exposure > 0).sum())
+        self._market_exposure_sum += market_exposure.sum()
+
+        # ---------- returns ----------
+        if self._last_pnl is None:
+            self._first_pnl = pnl[0]
+            rets = pnl[1:] / pnl[:-1] - 1.0
+            rets_exposure = market_exposure[1:]
+        else:
+            rets = np.empty(len(pnl))
+            rets[0] = pnl[0] / self._last_pnl - 1.0
+            rets[1:] = pnl[1:] / pnl[:-1] - 1.0
+            rets_exposure = market_exposure
+        if len(rets):
+            self._add_returns(rets, rets_exposure)
+
+        # ---------- drawdowns ----------
+        running_max = np.maximum(np.maximum.accumulate(pnl), self._pnl_max)
+        self._max_drawdown = min(self._max_drawdown, (pnl / running_max - 1.0).min())
+        self._pnl_max = running_max[-1]
+        self._last_pnl = pnl[-1]
+
+    def _add_returns(self, rets: np.ndarray, exposure: np.ndarray):
+        # Moments of the chunk, merged with the running ones (Chan et al.)
+        n_chunk = len(rets)
+        chunk_mean = rets.mean()
+        chunk_m2 = ((rets - chunk_mean) ** 2).sum()
+        if self._nb_returns == 0:
+            self._rets_mean, self._rets_m2 = chunk_mean, chunk_m2
+        else:
+            n_total = self._nb_returns + n_chunk
+            delta = chunk_mean - self._rets_mean
+            self._rets_mean += delta * n_chunk / n_total
+            self._rets_m2 += chunk_m2 + delta**2 * self._nb_returns * n_chunk / n_total
+        self._nb_returns += n_chunk
+        self._growth *= (1.0 + rets).prod()
+
+        if self._sketch is None:
+            self._returns.append(rets)
+        else:
+            self._sketch.add_many(rets)
+
+        # ---------- exposure timing ----------
+        if self._prev_market_exposure is None:
+            prev_exposure, current_exposure, change_rets = exposure[:-1], exposure[1:], rets[1:]
+        else:
+            prev_exposure = np.concatenate(([self._prev_market_exposure], exposure[:-1]))
+            current_exposure, change_rets = exposure, rets
+        self._prev_market_exposure = exposure[-1]
+
+        delta_exp = current_exposure - prev_exposure
+        exposure_change = current_exposure != prev_exposure
+        successes = (
+            ((delta_exp > 0) & (change_rets > 0)) | ((delta_exp < 0) & (change_rets < 0))
+        ) & exposure_change
+        self._nb_changes += int(exposure_change.sum())
+        self._nb_successes += int(successes.sum())
+        self._change_returns_sum += change_rets[exposure_change].sum()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Same metrics as `compute_stats`, for the observations seen so far.
+        """
+        n = self._nb_returns
+        if n < 1:
+            raise ValueError("Need at least 2 observations in pnl")
+
+        cumulative_return = self._last_pnl / self._first_pnl - 1.0
+
+        geom_daily = self._growth ** (1.0 / n) - 1.0
+        annualized_return = (1.0 + geom_daily) ** self.trading_days - 1.0
+
+        daily_std = math.sqrt(self._rets_m2 / (n - 1)) if n > 1 else np.nan
+        annualized_volatility = daily_std * math.sqrt(self.trading_days)
+        sharpe_ratio = (
+            annualized_return / annualized_volatility
+            if annualized_volatility > 0
+            else np.nan
+        )
+
+        if self._sketch is None:
+            if len(self._returns) > 1:
+                self._returns = [np.concatenate(self._returns)]
+            rets = self._returns[0]
+            var_daily = np.quantile(rets, self.var_alpha)
+            cvar_daily = rets[rets <= var_daily].mean()
+        else:
+            var_daily = self._sketch.quantile(self.var_alpha)
+            cvar_daily = self._sketch.mean_below(var_daily)
+
+        if self._nb_changes > 0:
+            exposure_timing_accuracy = self._nb_successes / self._nb_changes
+            expected_value_per_trade = self._change_returns_sum / self._nb_changes
+        else:
+            exposure_timing_accuracy = np.nan
+            expected_value_per_trade = np.nan
+
+        return {
+            "cumulative_return": cumulative_return,
+            "annualized_return": annualized_return,
+            "annualized_volatility": annualized_volatility,
+            "sharpe_ratio": sharpe_ratio,
+            "max_drawdown": self._max_drawdown,
+            "var_5": var_daily * math.sqrt(self.trading_days),
+            "cvar_5": cvar_daily * math.sqrt(self.trading_days),
+            "time_in_market": self._nb_in_market / self.count,
+            "avg_exposition_market": self._market_exposure_sum / self.count,
+            "exposure_timing_accuracy": exposure_timing_accuracy,
+            "expected_value_per_trade": expected_value_per_trade,
+        }
+
+
+def compute_stats_online(
+    pnl: pd.Series,
+    positions: pd.DataFrame,
+    trading_days: int = 252,
+    var_alpha: float = 0.05,
+    quantile: str = "exact",
+    relative_accuracy: float = 0.01,
+    chunk_size: int | None = None,
+) -> dict[str, Any]:
+    """
+    `compute_stats` in a single pass over `pnl` and `positions`.
+
+    The series are fed to an `OnlineStats` accumulator, in chunks of
+    `chunk_size` observations (all at once by default). With
+    quantile="exact" the result agrees with `compute_stats` to rounding
+    error; quantile="sketch" bounds memory and approximates VaR / CVaR.
+    """
+    if pnl.isna().all():
+        raise ValueError("pnl is empty or all NaN")
+
+    pnl = pnl.dropna()
+    if len(pnl) < 2:
+        raise ValueError("Need at least 2 observations in pnl")
+
+    if len(positions) != len(pnl):
+        raise ValueError("pnl and positions must have the same length")
+    if not pnl.index.equals(positions.index):
+        raise ValueError("pnl and positions must share the same index")
+
+    weights = np.abs(positions.to_numpy(dtype=np.float64))
+    is_market = np.array([str(c).upper() != "CASH" for c in positions.columns])
+    total_exposure = weights.sum(axis=1)
+    market_exposure = weights[:, is_market].sum(axis=1)
+    values = pnl.to_numpy(dtype=np.float64)
+
+    accumulator = OnlineStats(
+        trading_days=trading_days,
+        var_alpha=var_alpha,
+        quantile=quantile,
+        relative_accuracy=relative_accuracy,
+    )
+    chunk_size = chunk_size or len(values)
+    for start in range(0, len(values), chunk_size):
+        end = start + chunk_size
+        accumulator.update_many(
+            values[start:end], market_exposure[start:end], total_exposure[start:end]
+        )
+    return accumulator.stats()
+
+
+def compute_stats_windows(
+    pnl: pd.Series,
+    positions: pd.DataFrame,
+    window: int,
+    step: int | None = None,
+    expanding: bool = False,
+    trading_days: int = 252,
+    var_alpha: float = 0.05,
+) -> pd.DataFrame:
+    """
+    `compute_stats` over rolling or expanding windows of `pnl` and `positions`.
+
+    Rolling windows hold `window` epochs and start every `step` epochs
+    (`step` defaults to `window`, i.e. back-to-back windows). Expanding
+    windows all start at the first epoch and end every `step` epochs from
+    the `window`-th one on. Only full windows are scored.
+
+    The series is not backtested again for each window: the metrics are
+    read from prefix sums of the returns, squared returns, exposures and
+    exposure changes, from the ratio of the window's last and first pnl, and
+    from a doubling table for the max drawdown. Each window then costs O(1)
+    (O(log window) for the drawdown), except VaR / CVaR, which need the
+    window's quantile. Results agree with `compute_stats` on each window to
+    rounding error (the max drawdown and VaR / CVaR exactly); the volatility
+    error is relative to the returns of the whole series, which only shows
+    on windows of near-constant pnl.
+
+    Returns
+    -------
+    DataFrame
+        One row per window, with its first and last epoch ("start", "end")
+        and the keys of `compute_stats` as columns.
+    """
+    if pnl.isna().all():
+        raise ValueError("pnl is empty or all NaN")
+
+    pnl = pnl.dropna()
+    if len(positions) != len(pnl):
+        raise ValueError("pnl and positions must have the same length")
+    if not pnl.index.equals(positions.index):
+        raise ValueError("pnl and positions must share the same index")
+
+    n = len(pnl)
+    step = step or window
+    if window < 2:
+        raise ValueError(f"window must hold at least 2 epochs, got {window}")
+    if step < 1:
+        raise ValueError(f"step must be at least 1, got {step}")
+    if window > n:
+        raise ValueError(f"window ({window}) is longer than the series ({n} epochs)")
+
+    if expanding:
+        ends = np.arange(window, n + 1, step)
+        starts = np.zeros_like(ends)
+    else:
+        starts = np.arange(0, n - window + 1, step)
+        ends = starts + window
+    lasts = ends - 1
+    lengths = ends - starts
+    # A window's returns are those of epochs start + 1 to end - 1
+    nb_rets = lengths - 1
+
+    values = pnl.to_numpy(dtype=np.float64)
+    rets = np.zeros(n)
+    rets[1:] = values[1:] / values[:-1] - 1.0
+
+    def window_sum(x: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        # sum(x[lo:hi]) for every window, from the prefix sums of x
+        prefix = np.concatenate(([0.0], np.cumsum(x, dtype=np.float64)))
+        return prefix[hi] - prefix[lo]
+
+    # ---------- returns ----------
+    cumulative_return = values[lasts] / values[starts] - 1.0
+
+    growth = values[lasts] / values[starts]
+    geom_daily = growth ** (1.0 / nb_rets) - 1.0
+    annualized_return = (1.0 + geom_daily) ** trading_days - 1.0
+
+    # Centered on the overall mean return so that the prefix sums of
+    # squares do not lose the (small) variance to cancellation
+    centered = rets - rets[1:].mean()
+    centered[0] = 0.0
+    sum_centered = window_sum(centered, starts + 1, ends)
+    sum_squares = window_sum(centered**2, starts + 1, ends)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        daily_var = (sum_squares - sum_centered**2 / nb_rets) / (nb_rets - 1)
+    # A single return has no sample standard deviation, as in pandas
+    daily_std = np.where(nb_rets > 1, np.sqrt(np.maximum(daily_var, 0.0)), np.nan)
+    annualized_volatility = daily_std * math.sqrt(trading_days)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sharpe_ratio = np.where(
+            annualized_volatility > 0, annualized_return / annualized_volatility, np.nan
+        )
+
+    # ---------- drawdowns ----------
+    max_drawdown = _window_max_drawdown(values, starts, lengths)
+
+    # ---------- VaR / CVaR (annualized, via sqrt(T) scaling) ----------
+    var_daily = np.empty(len(starts))
+    cvar_daily = np.empty(len(starts))
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        window_rets = rets[start + 1:end]
+        var_daily[i] = np.quantile(window_rets, var_alpha)
+        cvar_daily[i] = window_rets[window_rets <= var_daily[i]].mean()
+
+    # ---------- trading metrics ----------
+    weights = np.abs(positions.to_numpy(dtype=np.float64))
+    is_market = np.array([str(c).upper() != "CASH" for c in positions.columns])
+    total_exposure = weights.sum(axis=1)
+    market_exposure = weights[:, is_market].sum(axis=1)
+
+    time_in_market = window_sum((total_exposure > 0).astype(np.float64), starts, ends) / lengths
+    avg_exposition_market = window_sum(market_exposure, starts, ends) / lengths
+
+    # Exposure changes are measured on the window's returns index, so the
+    # first return of a window has no previous exposure to compare against
+    delta_exp = np.zeros(n)
+    delta_exp[1:] = market_exposure[1:] - market_exposure[:-1]
+    exposure_change = np.zeros(n, dtype=bool)
+    exposure_change[1:] = market_exposure[1:] != market_exposure[:-1]
+    successes = (
+        ((delta_exp > 0) & (rets > 0)) | ((delta_exp < 0) & (rets < 0))
+    ) & exposure_change
+
+    n_changes = window_sum(exposure_change.astype(np.float64), starts + 2, ends)
+    n_successes = window_sum(successes.astype(np.float64), starts + 2, ends)
+    change_returns = window_sum(np.where(exposure_change, rets, 0.0), starts + 2, ends)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        exposure_timing_accuracy = np.where(n_changes > 0, n_successes / n_changes, np.nan)
+        expected_value_per_trade = np.where(n_changes > 0, change_returns / n_changes, np.nan)
+
+    return pd.DataFrame(
+        {
+            "start": pnl.index[starts],
+            "end": pnl.index[lasts],
+            "cumulative_return": cumulative_return,
+            "annualized_return": annualized_return,
+            "annualized_volatility": annualized_volatility,
+            "sharpe_ratio": sharpe_ratio,
+            "max_drawdown": max_drawdown,
+            "var_5": var_daily * math.sqrt(trading_days),
+            "cvar_5": cvar_daily * math.sqrt(trading_days),
+            "time_in_market": time_in_market,
+            "avg_exposition_market": avg_exposition_market,
+            "exposure_timing_accuracy": exposure_timing_accuracy,
+            "expected_value_per_trade": expected_value_per_trade,
+        },
+        index=pd.RangeIndex(len(starts), name="window"),
+    )
+
+
+def _window_max_drawdown(values: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    # Max drawdown of values[start:start + length] for every window.
+    # Level k of the doubling table holds the max, min and max drawdown of
+    # every block of 2**k values; two adjacent blocks A, B merge into
+    # min(mdd(A), mdd(B), min(B) / max(A) - 1). Each window is covered by
+    # the blocks of the binary decomposition of its length, merged left to
+    # right in increasing size, so only one level is kept at a time.
+    block_max, block_min = values, values
+    block_mdd = np.zeros(len(values))
+
+    position = starts.copy()
+    acc_max = np.full(len(starts), -np.inf)
+    acc_mdd = np.zeros(len(starts))
+    for k in range(int(lengths.max()).bit_length()):
+        if k > 0:
+            half = 1 << (k - 1)
+            left, right = slice(0, len(block_max) - half), slice(half, None)
+            block_mdd = np.minimum(
+                np.minimum(block_mdd[left], block_mdd[right]),
+                block_min[right] / block_max[left] - 1.0,
+            )
+            block_max = np.maximum(block_max[left], block_max[right])
+            block_min = np.minimum(block_min[left], block_min[right])
+
+        has_block = ((lengths >> k) & 1).astype(bool)
+        index = position[has_block]
+        merged_mdd = np.minimum(
+            np.minimum(acc_mdd[has_block], block_mdd[index]),
+            block_min[index] / acc_max[has_block] - 1.0,
+        )
+        acc_mdd[has_block] = np.where(np.isinf(acc_max[has_block]), block_mdd[index], merged_mdd)
+        acc_max[has_block] = np.maximum(acc_max[has_block], block_max[index])
+        position[has_block] += 1 << k
+
+    return acc_mdd
+
+
 def backtest(
     prices: pd.DataFrame,
     positions: pd.DataFrame,
     initial_capital: float = 1.0,
     transaction_fees: float = 0.0005,
+    engine: str = "auto",
+    timings: dict | None = None,
 ):
     """
     Run a simple backtest with periodic rebalancing.
@@ -172,6 +721,20 @@ def backtest(
         Starting capital.
     transaction_fees : float
         Proportional transaction cost applied to traded notional.
+    engine : str
+        "numpy" runs the rebalancing recurrence on float64 arrays,
+        "pandas" runs the reference row-by-row loop, kept verbatim as the
+        oracle of regression checks: the capital paths are the same, and
+        the stats differ by float64 rounding at most (the reference works
+        on object-dtype Series).
+        "numba" runs the recurrence in a JIT-compiled loop (numba must be
+        installed), with the same operations and summation order. "auto"
+        (the default) uses "numba" when numba is installed and the series
+        is long enough to pay for compiling the kernel, else "numpy".
+    timings : dict, optional
+        If given, the time spent in the backtest itself and in
+        `compute_stats` is added to its "backtest" and "compute_stats"
+        keys (in seconds).
 
     Returns
     -------
@@ -197,6 +760,311 @@ def backtest(
             f"Prices and positions not the same length: got {len(prices)=} and {len(positions)=}"
         )
 
+    start = time.perf_counter()
+    if engine in ("auto", "numpy", "numba"):
+        capital_evolution = _capital_evolution_numpy(
+            prices=prices,
+            positions=positions,
+            initial_capital=initial_capital,
+            transaction_fees=transaction_fees,
+            engine=engine,
+        )
+    elif engine == "pandas":
+        capital_evolution = _capital_evolution_pandas(
+            prices=prices,
+            positions=positions,
+            initial_capital=initial_capital,
+            transaction_fees=transaction_fees,
+        )
+    else:
+        raise ValueError(f"Unknown backtest engine: {engine!r}")
+    capital_evolution.iloc[0] = initial_capital
+
+    # Returns and cumulative PnL
+    returns = capital_evolution.pct_change().fillna(0)
+    pnl = (1 + returns).cumprod()
+
+    if timings is None:
+        return {"pnl": pnl, "stats": compute_stats(pnl=pnl, positions=positions)}
+    stats_start = time.perf_counter()
+    stats = compute_stats(pnl=pnl, positions=positions)
+    _add_time(timings, "backtest", stats_start - start)
+    _add_time(timings, "compute_stats", time.perf_counter() - stats_start)
+    return {"pnl": pnl, "stats": stats}
+
+
+def _add_time(timings: dict, key: str, seconds: float):
+    timings[key] = timings.get(key, 0.0) + seconds
+
+
+def backtest_many(
+    prices: pd.DataFrame,
+    positions_stack: np.ndarray,
+    initial_capital: float = 1_000,
+    transaction_fees: float = 0.0005,
+    trading_days: int = 252,
+    var_alpha: float = 0.05,
+    engine: str = "auto",
+) -> pd.DataFrame:
+    """
+    Backtest many strategies on the same prices in one vectorized pass.
+
+    Parameters
+    ----------
+    prices : DataFrame
+        Asset prices indexed over time.
+    positions_stack : np.ndarray
+        Target weights, shape (strategies x epochs x assets). The last axis
+        follows the column order of `prices`.
+    initial_capital : float
+        Starting capital.
+    transaction_fees : float
+        Proportional transaction cost applied to traded notional.
+    trading_days : int
+        Number of trading days per year (for annualization).
+    var_alpha : float
+        Tail probability for VaR / CVaR (e.g. 0.05 for 5%).
+    engine : str
+        "numpy", "numba" or "auto", as in `backtest`.
+
+    Returns
+    -------
+    DataFrame
+        One row per strategy, with the keys of `compute_stats` and
+        `get_base_score` as columns.
+    """
+    weights = np.asarray(positions_stack, dtype=np.float64)
+    if weights.ndim != 3:
+        raise ValueError(
+            f"positions_stack must be (strategies x epochs x assets), got {weights.shape}"
+        )
+    if weights.shape[1:] != prices.shape:
+        raise ValueError(
+            f"positions_stack epochs x assets must match prices: got {weights.shape[1:]} and {prices.shape}"
+        )
+
+    return _backtest_stack(
+        prices=np.ascontiguousarray(prices.to_numpy(dtype=np.float64)),
+        weights=np.ascontiguousarray(weights),
+        columns=prices.columns,
+        initial_capital=initial_capital,
+        transaction_fees=transaction_fees,
+        trading_days=trading_days,
+        var_alpha=var_alpha,
+        engine=engine,
+    )
+
+
+def backtest_paths(
+    price_paths: np.ndarray,
+    positions_stack: np.ndarray,
+    columns: list[str],
+    initial_capital: float = 1_000,
+    transaction_fees: float = 0.0005,
+    trading_days: int = 252,
+    var_alpha: float = 0.05,
+    engine: str = "auto",
+) -> pd.DataFrame:
+    """
+    Backtest one strategy per price path in one vectorized pass, e.g. a bot
+    run on each resampled path of `resampling.block_bootstrap_paths`.
+
+    Parameters
+    ----------
+    price_paths : np.ndarray
+        Asset prices, shape (paths x epochs x assets).
+    positions_stack : np.ndarray
+        Target weights on each path, same shape as `price_paths`.
+    columns : list of str
+        Asset names of the last axis (used to tell "Cash" from the market).
+    initial_capital, transaction_fees, trading_days, var_alpha, engine
+        As in `backtest_many`.
+
+    Returns
+    -------
+    DataFrame
+        One row per path, with the keys of `compute_stats` and
+        `get_base_score` as columns.
+    """
+    prices = np.asarray(price_paths, dtype=np.float64)
+    weights = np.asarray(positions_stack, dtype=np.float64)
+    if prices.ndim != 3 or weights.shape != prices.shape:
+        raise ValueError(
+            f"price_paths and positions_stack must both be (paths x epochs x assets), got {prices.shape} and {weights.shape}"
+        )
+    if prices.shape[2] != len(columns):
+        raise ValueError(f"Expected {prices.shape[2]} columns, got {len(columns)}")
+
+    return _backtest_stack(
+        prices=np.ascontiguousarray(prices),
+        weights=np.ascontiguousarray(weights),
+        columns=columns,
+        initial_capital=initial_capital,
+        transaction_fees=transaction_fees,
+        trading_days=trading_days,
+        var_alpha=var_alpha,
+        engine=engine,
+    )
+
+
+def _backtest_stack(
+    prices: np.ndarray,
+    weights: np.ndarray,
+    columns,
+    initial_capital: float,
+    transaction_fees: float,
+    trading_days: int,
+    var_alpha: float,
+    engine: str,
+) -> pd.DataFrame:
+    # Shared by `backtest_many` (one price array for every strategy) and
+    # `backtest_paths` (one price path per strategy)
+    capital = _rebalance_capital(
+        prices=prices,
+        weights=weights,
+        initial_capital=initial_capital,
+        transaction_fees=transaction_fees,
+        engine=engine,
+    )
+    capital[:, 0] = initial_capital
+    returns = np.zeros_like(capital)
+    returns[:, 1:] = capital[:, 1:] / capital[:, :-1] - 1
+    pnl = np.cumprod(1 + returns, axis=1)
+
+    is_market = np.array([str(c).upper() != "CASH" for c in columns])
+    stats = _compute_stats_many(
+        pnl=pnl,
+        weights=weights,
+        is_market=is_market,
+        trading_days=trading_days,
+        var_alpha=var_alpha,
+    )
+
+    return stats.join(_get_base_scores(stats, initial_capital=initial_capital))
+
+
+def _get_base_scores(stats: pd.DataFrame, initial_capital: float = 1_000) -> pd.DataFrame:
+    """
+    `get_base_score` of each row of `stats`, indexed as `stats`.
+
+    The metrics are passed as numpy floats, as `get_local_score` does: a
+    zero drawdown scores an infinite `mdd_score` instead of raising
+    ZeroDivisionError.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = [
+            get_base_score(sharpe=sharpe, cum_ret=cum_ret, mdd=mdd, initial_capital=initial_capital)
+            for sharpe, cum_ret, mdd in zip(
+                stats["sharpe_ratio"].to_numpy(dtype=np.float64),
+                stats["cumulative_return"].to_numpy(dtype=np.float64),
+                stats["max_drawdown"].to_numpy(dtype=np.float64),
+            )
+        ]
+    return pd.DataFrame(scores, index=stats.index)
+
+
+def _compute_stats_many(
+    pnl: np.ndarray,
+    weights: np.ndarray,
+    is_market: np.ndarray,
+    trading_days: int = 252,
+    var_alpha: float = 0.05,
+) -> pd.DataFrame:
+    """
+    `compute_stats` for a (strategies x epochs) array of equity curves.
+
+    `weights` is (strategies x epochs x assets) and `is_market` flags the
+    non-cash assets.
+    """
+    n_strategies = pnl.shape[0]
+    if pnl.shape[1] < 2:
+        raise ValueError("Need at least 2 observations in pnl")
+
+    # ---------- returns ----------
+    rets = pnl[:, 1:] / pnl[:, :-1] - 1.0
+    n = rets.shape[1]
+
+    cumulative_return = pnl[:, -1] / pnl[:, 0] - 1.0
+
+    geom_daily = np.prod(1.0 + rets, axis=1) ** (1.0 / n) - 1.0
+    annualized_return = (1.0 + geom_daily) ** trading_days - 1.0
+
+    daily_std = rets.std(axis=1, ddof=1) if n > 1 else np.full(n_strategies, np.nan)
+    annualized_volatility = daily_std * math.sqrt(trading_days)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe_ratio = np.where(
+            annualized_volatility > 0,
+            annualized_return / annualized_volatility,
+            np.nan,
+        )
+
+    # ---------- drawdowns ----------
+    running_max = np.maximum.accumulate(pnl, axis=1)
+    max_drawdown = (pnl / running_max - 1.0).min(axis=1)
+
+    # ---------- VaR / CVaR ----------
+    var_daily = np.quantile(rets, var_alpha, axis=1)
+    in_tail = rets <= var_daily[:, None]
+    cvar_daily = np.where(in_tail, rets, 0.0).sum(axis=1) / in_tail.sum(axis=1)
+
+    var_5 = var_daily * math.sqrt(trading_days)
+    cvar_5 = cvar_daily * math.sqrt(trading_days)
+
+    # ---------- trading metrics ----------
+    total_exposure = np.abs(weights).sum(axis=2)
+    time_in_market = (total_exposure > 0).mean(axis=1)
+
+    market_exposure = np.abs(weights[:, :, is_market]).sum(axis=2)
+    avg_exposition_market = market_exposure.mean(axis=1)
+
+    # Exposure changes are measured on the returns index, so the first
+    # return has no previous exposure to compare against
+    exp_current = market_exposure[:, 1:]
+    delta_exp = exp_current[:, 1:] - exp_current[:, :-1]
+    exposure_change = exp_current[:, 1:] != exp_current[:, :-1]
+    later_rets = rets[:, 1:]
+    n_changes = exposure_change.sum(axis=1)
+
+    successes = (
+        ((delta_exp > 0) & (later_rets > 0)) | ((delta_exp < 0) & (later_rets < 0))
+    ) & exposure_change
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exposure_timing_accuracy = np.where(
+            n_changes > 0, successes.sum(axis=1) / n_changes, np.nan
+        )
+        expected_value_per_trade = np.where(
+            n_changes > 0,
+            np.where(exposure_change, later_rets, 0.0).sum(axis=1) / n_changes,
+            np.nan,
+        )
+
+    return pd.DataFrame(
+        {
+            "cumulative_return": cumulative_return,
+            "annualized_return": annualized_return,
+            "annualized_volatility": annualized_volatility,
+            "sharpe_ratio": sharpe_ratio,
+            "max_drawdown": max_drawdown,
+            "var_5": var_5,
+            "cvar_5": cvar_5,
+            "time_in_market": time_in_market,
+            "avg_exposition_market": avg_exposition_market,
+            "exposure_timing_accuracy": exposure_timing_accuracy,
+            "expected_value_per_trade": expected_value_per_trade,
+        },
+        index=pd.RangeIndex(n_strategies, name="strategy"),
+    )
+
+
+def _capital_evolution_pandas(
+    prices: pd.DataFrame,
+    positions: pd.DataFrame,
+    initial_capital: float,
+    transaction_fees: float,
+) -> pd.Series:
+    # Reference implementation, one `.loc` lookup per epoch
     # Number of units per asset
     nb_units = pd.DataFrame(None, columns=prices.columns, index=prices.index)
 
@@ -234,14 +1102,433 @@ def backtest(
             nb_units.loc[i] = actual_nb_units
 
     # Capital path
-    capital_evolution = (nb_units * prices).sum(axis=1)
-    capital_evolution.iloc[0] = initial_capital
+    return (nb_units * prices).sum(axis=1)
 
-    # Returns and cumulative PnL
-    returns = capital_evolution.pct_change().fillna(0)
-    pnl = (1 + returns).cumprod()
 
-    return {"pnl": pnl, "stats": compute_stats(pnl=pnl, positions=positions)}
+def _capital_evolution_numpy(
+    prices: pd.DataFrame,
+    positions: pd.DataFrame,
+    initial_capital: float,
+    transaction_fees: float,
+    engine: str = "auto",
+) -> pd.Series:
+    # Positions are aligned on the prices labels, as the `.loc` lookups do
+    if positions.index.equals(prices.index) and positions.columns.equals(prices.columns):
+        aligned_positions = positions
+    else:
+        aligned_positions = positions.loc[prices.index, prices.columns]
+    capital = _rebalance_capital(
+        prices=np.ascontiguousarray(prices.to_numpy(dtype=np.float64)),
+        weights=np.ascontiguousarray(aligned_positions.to_numpy(dtype=np.float64)),
+        initial_capital=initial_capital,
+        transaction_fees=transaction_fees,
+        engine=engine,
+    )
+    return pd.Series(capital, index=prices.index)
+
+
+def _sequential_sum(values: np.ndarray) -> np.ndarray:
+    # Left-to-right sum over the last axis. np.sum switches to pairwise
+    # summation from 8 columns on, which would no longer match the
+    # object-dtype sums of the pandas loop bit for bit.
+    return np.add.accumulate(values, axis=-1)[..., -1]
+
+
+def _rebalance_capital(
+    prices: np.ndarray,
+    weights: np.ndarray,
+    initial_capital: float,
+    transaction_fees: float,
+    engine: str = "auto",
+) -> np.ndarray:
+    """
+    Portfolio value at each epoch for the rebalancing recurrence of `backtest`.
+
+    `prices` is an (epochs x assets) float64 array. `weights` is either
+    (epochs x assets) or (strategies x epochs x assets), in which case all
+    strategies are stepped together and an (strategies x epochs) array is
+    returned. `prices` may also be (strategies x epochs x assets), one
+    price path per strategy.
+    """
+    nb_units = _rebalance_units(
+        prices=prices,
+        weights=weights,
+        initial_capital=initial_capital,
+        transaction_fees=transaction_fees,
+        engine=engine,
+    )
+    return _sequential_sum(nb_units * prices)
+
+
+def _rebalance_units(
+    prices: np.ndarray,
+    weights: np.ndarray,
+    initial_capital: float,
+    transaction_fees: float,
+    prev_nb_units: np.ndarray | None = None,
+    engine: str = "auto",
+) -> np.ndarray:
+    """
+    Holdings after rebalancing at each epoch (same shape as `weights`).
+
+    With `prev_nb_units`, the holdings after the epoch preceding `prices`,
+    the first epoch is rebalanced from these holdings instead of being the
+    initial allocation, so that a series can be stepped chunk by chunk.
+
+    `engine` is "numpy" (one vectorized step per epoch), "numba" (the
+    compiled `_rebalance_units_loops`) or "auto".
+    """
+    if engine == "auto":
+        nb_steps = weights.size // max(weights.shape[-1], 1)
+        use_numba = nb_steps >= NUMBA_MIN_STEPS and _numba_kernel() is not None
+        engine = "numba" if use_numba else "numpy"
+    if engine == "numba":
+        return _rebalance_units_numba(
+            prices=prices,
+            weights=weights,
+            initial_capital=initial_capital,
+            transaction_fees=transaction_fees,
+            prev_nb_units=prev_nb_units,
+        )
+    if engine != "numpy":
+        raise ValueError(f"Unknown backtest engine: {engine!r}")
+
+    nb_units = np.empty_like(weights)
+
+    if prev_nb_units is None:
+        # Initial allocation
+        nb_units[..., 0, :] = (
+            (weights[..., 0, :] * initial_capital) / prices[..., 0, :] * (1 - transaction_fees)
+        )
+        first = 1
+    else:
+        first = 0
+
+    for i in range(first, weights.shape[-2]):
+        current_prices = prices[..., i, :]
+        target_weights = weights[..., i, :]
+        prev_nb_units = nb_units[..., i - 1, :] if i > 0 else prev_nb_units
+
+        # Portfolio value before rebalancing
+        capital_before_rebalance = _sequential_sum(prev_nb_units * current_prices)[
+            ..., None
+        ]
+
+        # Ideal holdings before transaction costs
+        ideal_nb_units = (target_weights * capital_before_rebalance) / current_prices
+
+        # TC applied to traded notional
+        transaction_costs = (
+            _sequential_sum(np.abs((ideal_nb_units - prev_nb_units) * current_prices))[
+                ..., None
+            ]
+            * transaction_fees
+        )
+        capital_after_tc = capital_before_rebalance - transaction_costs
+
+        # Actual holdings after transaction costs
+        nb_units[..., i, :] = (target_weights * capital_after_tc) / current_prices
+
+    return nb_units
+
+
+# ---------- compiled kernel (optional, requires numba) ----------
+
+# Importing numba and compiling the kernel takes about a second: below this
+# many (strategies x epochs) steps, the numpy loop is faster
+NUMBA_MIN_STEPS = 50_000
+
+_compiled_kernel = None
+
+
+def _numba_kernel():
+    """
+    `_rebalance_units_loops` compiled with numba, or None when numba is not
+    installed. numba is imported and the kernel compiled on first use only.
+    """
+    global _compiled_kernel
+    if _compiled_kernel is None:
+        try:
+            import numba
+        except ImportError:
+            _compiled_kernel = False
+        else:
+            # No on-disk cache: the kits do not write __pycache__ directories
+            _compiled_kernel = numba.njit(nogil=True)(_rebalance_units_loops)
+    return _compiled_kernel or None
+
+
+def _rebalance_units_numba(
+    prices: np.ndarray,
+    weights: np.ndarray,
+    initial_capital: float,
+    transaction_fees: float,
+    prev_nb_units: np.ndarray | None = None,
+) -> np.ndarray:
+    kernel = _numba_kernel()
+    if kernel is None:
+        raise ImportError("The numba backtest engine requires numba (pip install numba)")
+
+    stack = weights if weights.ndim == 3 else weights[None]
+    nb_strategies, _, nb_assets = stack.shape
+    if prev_nb_units is None:
+        initialize = True
+        prev_nb_units = np.zeros((nb_strategies, nb_assets))
+    else:
+        initialize = False
+        prev_nb_units = np.ascontiguousarray(
+            np.broadcast_to(prev_nb_units, (nb_strategies, nb_assets)), dtype=np.float64
+        )
+
+    nb_units = np.empty_like(stack)
+    kernel(
+        np.ascontiguousarray(prices if prices.ndim == 3 else prices[None], dtype=np.float64),
+        np.ascontiguousarray(stack, dtype=np.float64),
+        float(initial_capital),
+        float(transaction_fees),
+        prev_nb_units,
+        initialize,
+        nb_units,
+    )
+    return nb_units if weights.ndim == 3 else nb_units[0]
+
+
+def _rebalance_units_loops(
+    prices: np.ndarray,
+    weights: np.ndarray,
+    initial_capital: float,
+    transaction_fees: float,
+    prev_nb_units: np.ndarray,
+    initialize: bool,
+    nb_units: np.ndarray,
+):
+    # Scalar loops over (strategies x epochs x assets) `weights`, filling
+    # `nb_units`. `prices` is (1 x epochs x assets), shared by all the
+    # strategies, or has one path per strategy. Same operations and
+    # left-to-right sums as the vectorized recurrence of `_rebalance_units`;
+    # meant to be compiled by numba.
+    nb_strategies, nb_epochs, nb_assets = weights.shape
+    for s in range(nb_strategies):
+        path = prices[s] if prices.shape[0] > 1 else prices[0]
+        first = 0
+        if initialize:
+            # Initial allocation
+            for a in range(nb_assets):
+                nb_units[s, 0, a] = (
+                    (weights[s, 0, a] * initial_capital) / path[0, a] * (1 - transaction_fees)
+                )
+            first = 1
+
+        for i in range(first, nb_epochs):
+            if i == 0:
+                prev = prev_nb_units[s]
+            else:
+                prev = nb_units[s, i - 1]
+
+            # Portfolio value before rebalancing
+            capital_before_rebalance = 0.0
+            for a in range(nb_assets):
+                capital_before_rebalance += prev[a] * path[i, a]
+
+            # TC applied to traded notional
+            traded = 0.0
+            for a in range(nb_assets):
+                ideal_nb_units = (weights[s, i, a] * capital_before_rebalance) / path[i, a]
+                traded += abs((ideal_nb_units - prev[a]) * path[i, a])
+            capital_after_tc = capital_before_rebalance - traded * transaction_fees
+
+            # Actual holdings after transaction costs
+            for a in range(nb_assets):
+                nb_units[s, i, a] = (weights[s, i, a] * capital_after_tc) / path[i, a]
+
+
+class StreamingBacktester:
+    """
+    Incremental counterpart of `backtest` followed by `compute_stats`.
+
+    Epochs are fed one at a time with `update`, or by chunks of consecutive
+    epochs with `update_many`; both apply the same rebalancing and
+    transaction-cost recurrence as `backtest`. Holdings and
+    capital are kept as running state and the metrics by an `OnlineStats`
+    accumulator, so `stats()` can be called at any point without
+    materializing the pnl or positions. With quantile="sketch", memory stays
+    constant whatever the number of epochs.
+
+    Parameters
+    ----------
+    columns : list[str]
+        Asset names, in the order used by `update` when prices and weights
+        are given as sequences. Columns named "Cash" are excluded from the
+        market exposure metrics, as in `compute_stats`.
+    initial_capital : float
+        Starting capital.
+    transaction_fees : float
+        Proportional transaction cost applied to traded notional.
+    trading_days : int
+        Number of trading days per year (for annualization).
+    var_alpha : float
+        Tail probability for VaR / CVaR (e.g. 0.05 for 5%).
+    quantile : str
+        VaR / CVaR mode of `OnlineStats`, "exact" or "sketch".
+    relative_accuracy : float
+        Relative accuracy of the sketch (only used with quantile="sketch").
+
+    Example
+    -------
+    >>> backtester = StreamingBacktester(columns=["Asset A", "Cash"])
+    >>> for epoch, price in feed:
+    ...     backtester.update(epoch, [price, 1.0], make_decision(epoch, price))
+    ...     print(backtester.stats()["sharpe_ratio"])
+    """
+
+    def __init__(
+        self,
+        columns: list[str],
+        initial_capital: float = 1.0,
+        transaction_fees: float = 0.0005,
+        trading_days: int = 252,
+        var_alpha: float = 0.05,
+        quantile: str = "exact",
+        relative_accuracy: float = 0.01,
+    ):
+        self.columns = list(columns)
+        self.initial_capital = initial_capital
+        self.transaction_fees = transaction_fees
+        self._is_market = np.array([str(c).upper() != "CASH" for c in self.columns])
+        self._stats = OnlineStats(
+            trading_days=trading_days,
+            var_alpha=var_alpha,
+            quantile=quantile,
+            relative_accuracy=relative_accuracy,
+        )
+
+        self.epoch = None
+        self.nb_epochs = 0
+        self.nb_units = None
+        self.capital = initial_capital
+        self.pnl = 1.0
+
+    def _as_array(self, values) -> np.ndarray:
+        if isinstance(values, dict):
+            values = [values[c] for c in self.columns]
+        return np.asarray(values, dtype=np.float64)
+
+    def _as_matrix(self, values) -> np.ndarray:
+        if isinstance(values, pd.DataFrame):
+            values = values.loc[:, self.columns].to_numpy(dtype=np.float64)
+        return np.ascontiguousarray(values, dtype=np.float64)
+
+    def update(self, epoch, prices, weights) -> float:
+        """
+        Rebalance to `weights` at `prices` for `epoch` and return the pnl.
+
+        `prices` and `weights` are either dicts keyed by asset name or
+        sequences in `columns` order.
+        """
+        current_prices = self._as_array(prices)
+        target_weights = self._as_array(weights)
+
+        if self.nb_units is None:
+            # Initial allocation
+            self.nb_units = (
+                (target_weights * self.initial_capital)
+                / current_prices
+                * (1 - self.transaction_fees)
+            )
+            capital = self.initial_capital
+        else:
+            capital_before_rebalance = _sequential_sum(self.nb_units * current_prices)
+            ideal_nb_units = (target_weights * capital_before_rebalance) / current_prices
+            transaction_costs = (
+                _sequential_sum(np.abs((ideal_nb_units - self.nb_units) * current_prices))
+                * self.transaction_fees
+            )
+            capital_after_tc = capital_before_rebalance - transaction_costs
+            self.nb_units = (target_weights * capital_after_tc) / current_prices
+            capital = float(_sequential_sum(self.nb_units * current_prices))
+            self.pnl *= 1 + (capital / self.capital - 1)
+
+        abs_weights = np.abs(target_weights)
+        self._stats.update(
+            pnl=self.pnl,
+            market_exposure=float(abs_weights[self._is_market].sum()),
+            total_exposure=float(abs_weights.sum()),
+        )
+
+        self.capital = capital
+        self.epoch = epoch
+        self.nb_epochs += 1
+        return self.pnl
+
+    def update_many(self, epochs, prices, weights) -> np.ndarray:
+        """
+        Rebalance over a chunk of consecutive epochs and return their pnl.
+
+        `prices` and `weights` are (epochs x assets) DataFrames or arrays in
+        `columns` order. Feeding a series chunk by chunk gives the same pnl
+        as `backtest` on the whole series.
+        """
+        current_prices = self._as_matrix(prices)
+        target_weights = self._as_matrix(weights)
+        if not len(current_prices):
+            return np.empty(0)
+
+        nb_units = _rebalance_units(
+            prices=current_prices,
+            weights=target_weights,
+            initial_capital=self.initial_capital,
+            transaction_fees=self.transaction_fees,
+            prev_nb_units=self.nb_units,
+        )
+        capital = _sequential_sum(nb_units * current_prices)
+
+        if self.nb_units is None:
+            capital[0] = self.initial_capital
+            growth = np.empty(len(capital))
+            growth[0] = 1.0
+            growth[1:] = 1 + (capital[1:] / capital[:-1] - 1)
+            pnl = np.cumprod(growth)
+        else:
+            growth = np.empty(len(capital) + 1)
+            growth[0] = self.pnl
+            growth[1] = 1 + (capital[0] / self.capital - 1)
+            growth[2:] = 1 + (capital[1:] / capital[:-1] - 1)
+            pnl = np.cumprod(growth)[1:]
+
+        abs_weights = np.abs(target_weights)
+        self._stats.update_many(
+            pnl=pnl,
+            market_exposure=abs_weights[:, self._is_market].sum(axis=1),
+            total_exposure=abs_weights.sum(axis=1),
+        )
+
+        self.nb_units = nb_units[-1]
+        self.capital = capital[-1]
+        self.pnl = pnl[-1]
+        self.epoch = epochs[-1]
+        self.nb_epochs += len(capital)
+        return pnl
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Same metrics as `compute_stats`, for the epochs seen so far.
+        """
+        return self._stats.stats()
+
+    def scores(self) -> dict[str, float]:
+        """
+        `get_base_score` for the epochs seen so far, computed as
+        `_get_base_scores` does.
+        """
+        stats = self.stats()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return get_base_score(
+                sharpe=np.float64(stats["sharpe_ratio"]),
+                cum_ret=np.float64(stats["cumulative_return"]),
+                mdd=np.float64(stats["max_drawdown"]),
+                initial_capital=self.initial_capital,
+            )
+
 
 def get_base_score(
     sharpe: float,
@@ -275,13 +1562,25 @@ def get_base_score(
 
 
 def get_local_score(
-    prices: pd.DataFrame, positions: pd.DataFrame, initial_capital: float = 1_000
+    prices: pd.DataFrame,
+    positions: pd.DataFrame,
+    initial_capital: float = 1_000,
+    engine: str = "auto",
+    window: int | None = None,
+    step: int | None = None,
+    expanding: bool = False,
+    timings: dict | None = None,
 ) -> dict[str, dict]:
     # Backtest
     backtest_results = backtest(
-        prices=prices, positions=positions, initial_capital=initial_capital
+        prices=prices,
+        positions=positions,
+        initial_capital=initial_capital,
+        engine=engine,
+        timings=timings,
     )
 
+    start = time.perf_counter()
     pnl = backtest_results["pnl"]
     stats = backtest_results["stats"]
     scores = get_base_score(
@@ -291,17 +1590,133 @@ def get_local_score(
         initial_capital=initial_capital,
     )
 
-    return {
+    local_score = {
         "pnl": pnl.to_dict(),
         "stats": stats,
         "scores": scores,
     }
+    if timings is not None:
+        _add_time(timings, "scores", time.perf_counter() - start)
+
+    if window is not None:
+        start = time.perf_counter()
+        # Walk-forward: the same backtest, scored over rolling or expanding windows
+        windows = get_window_scores(
+            pnl=pnl,
+            positions=positions,
+            window=window,
+            step=step,
+            expanding=expanding,
+            initial_capital=initial_capital,
+        )
+        local_score["windows"] = windows
+        local_score["windows_summary"] = summarize_windows(windows)
+        if timings is not None:
+            _add_time(timings, "windows", time.perf_counter() - start)
+
+    return local_score
+
+
+def get_window_scores(
+    pnl: pd.Series,
+    positions: pd.DataFrame,
+    window: int,
+    step: int | None = None,
+    expanding: bool = False,
+    initial_capital: float = 1_000,
+) -> pd.DataFrame:
+    """
+    `compute_stats_windows` with the `get_base_score` scores of each window.
+    """
+    windows = compute_stats_windows(
+        pnl=pnl, positions=positions, window=window, step=step, expanding=expanding
+    )
+    return windows.join(_get_base_scores(windows, initial_capital=initial_capital))
+
+
+def summarize_windows(windows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Dispersion of the scores and main metrics across windows: one row per
+    metric, with its mean, standard deviation, min, quartiles and max.
+
+    Each metric is summarized over the windows where it is finite, and the
+    number of the others is given as "non_finite": e.g. a window with no
+    drawdown has an infinite `mdd_score` in phase 1, and a constant window
+    a NaN Sharpe ratio, which would make the whole mean infinite or NaN.
+    """
+    metrics = [
+        "base_score",
+        "sharpe_score",
+        "pnl_score",
+        "mdd_score",
+        "sharpe_ratio",
+        "cumulative_return",
+        "max_drawdown",
+    ]
+    values = windows[metrics].replace([np.inf, -np.inf], np.nan)
+    summary = values.describe().T
+    summary["non_finite"] = len(windows) - summary.pop("count").astype(int)
+    return summary.rename(columns={"50%": "median"})
+
+
+def summarize_bootstrap(samples: pd.DataFrame, confidence: float = 0.95) -> pd.DataFrame:
+    """
+    Distribution of the scores and main metrics across resampled paths: one
+    row per metric, with its mean, standard deviation, median and the
+    bounds of the `confidence` percentile interval.
+    """
+    metrics = [
+        "base_score",
+        "sharpe_score",
+        "pnl_score",
+        "mdd_score",
+        "sharpe_ratio",
+        "cumulative_return",
+        "max_drawdown",
+    ]
+    tail = (1 - confidence) / 2
+    values = samples[metrics]
+    return pd.DataFrame(
+        {
+            "mean": values.mean(),
+            "std": values.std(),
+            "low": values.quantile(tail),
+            "median": values.median(),
+            "high": values.quantile(1 - tail),
+        }
+    )
 
 
 # ============================================================================
 # affichage
 # ============================================================================
 
+def show_windows(local_score: dict):
+    windows = local_score["windows"]
+    print(f"\n📈 STABILITÉ ({len(windows)} fenêtres):")
+    print("-" * 70)
+    print(f"  {'':<20} {'moyenne':>9} {'écart-type':>10} {'min':>9} {'médiane':>9} {'max':>9}")
+    for metric, row in local_score["windows_summary"].iterrows():
+        print(
+            f"  {metric:<20} {row['mean']:>9.4f} {row['std']:>10.4f} {row['min']:>9.4f}"
+            f" {row['median']:>9.4f} {row['max']:>9.4f}"
+        )
+    non_finite = local_score["windows_summary"]["non_finite"]
+    if non_finite.any():
+        excluded = ", ".join(f"{metric} {count}" for metric, count in non_finite[non_finite > 0].items())
+        print(f"  Fenêtres exclues (valeur infinie ou indéfinie, p. ex. sans drawdown): {excluded}")
+
+def show_bootstrap(local_score: dict):
+    samples = local_score["bootstrap"]
+    print(f"\n🎲 ROBUSTESSE ({len(samples)} chemins rééchantillonnés, intervalle à 95%):")
+    print("-" * 70)
+    print(f"  {'':<20} {'moyenne':>9} {'écart-type':>10} {'bas':>9} {'médiane':>9} {'haut':>9}")
+    for metric, row in local_score["bootstrap_summary"].iterrows():
+        print(
+            f"  {metric:<20} {row['mean']:>9.4f} {row['std']:>10.4f} {row['low']:>9.4f}"
+            f" {row['median']:>9.4f} {row['high']:>9.4f}"
+        )
+
 def show_result(local_score: dict, is_show_graph: bool = False):
     # Affichage formaté de tous les scores
     print("\n" + "=" * 70)
@@ -322,24 +1737,14 @@ def show_result(local_score: dict, is_show_graph: bool = False):
     print("🎯 Performance:")
     print(f"  Brut PnL:        { local_score["stats"]["cumulative_return"]*100:.2f}%")
 
+    if "windows" in local_score:
+        show_windows(local_score)
+    if "bootstrap" in local_score:
+        show_bootstrap(local_score)
+
 
     if is_show_graph:
         print("\033[94mune page graphique va s'ouvrir pour vous montrer les résultats du pnl\033[0m")
-        # Graphique du PnL avec matplotlib
-        pnl_dict = local_score["pnl"]
-        pnl_series = pd.Series(pnl_dict).sort_index()
-
-        plt.figure(figsize=(12, 6))
-        plt.plot(pnl_series.index, pnl_series.values, linewidth=2, color='#2E86AB')
-        plt.axhline(y=1.0, color='gray', linestyle='--', linewidth=1, alpha=0.5, label='Capital initial')
-        plt.fill_between(pnl_series.index, pnl_series.values, 1.0, 
-                        where=(pnl_series.values >= 1.0), alpha=0.3, color='green', label='Profit')
-        plt.fill_between(pnl_series.index, pnl_series.values, 1.0, 
-                        where=(pnl_series.values < 1.0), alpha=0.3, color='red', label='Perte')
-        plt.xlabel('Epoch', fontsize=12, fontweight='bold')
-        plt.ylabel('PnL (Multiplicateur)', fontsize=12, fontweight='bold')
-        plt.title('Évolution du PnL au fil du temps', fontsize=14, fontweight='bold', pad=20)
-        plt.grid(True, alpha=0.3, linestyle='--')
-        plt.legend(loc='best')
-        plt.tight_layout()
-        plt.show()
\ No newline at end of file
+        # Imported here so that headless runs never load matplotlib
+        from .reporting import plot_pnl
+        plot_pnl(local_score["pnl"])
\ No newline at end of file
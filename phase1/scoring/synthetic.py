@@ -0,0 +1,209 @@
+# ============================================================================
+# ⚠️  ATTENTION: Ce fichier n’a pas de lien avec le développement de votre bot.
+# ⚠️  Vous pouvez l’ignorer.
+# ============================================================================
+
+"""
+Synthetic price paths, for load-testing bots and the scorer.
+
+`synthetic_prices` draws price series of any length and number of assets,
+laid out as `find_csv_file` returns them (epochs 0 to n - 1, one column per
+asset, "Asset A", "Asset B", ... unless named otherwise, and a "Cash"
+column), from one of:
+
+- "gbm": geometric Brownian motion;
+- "jump": geometric Brownian motion with Poisson jumps (Merton);
+- "regime": geometric Brownian motion whose drift and volatility switch
+  between regimes following a Markov chain shared by all the assets.
+
+The shocks of the assets can be correlated in every model. Every draw is
+vectorized over epochs and assets, and the same seed gives the same prices.
+"""
+
+import string
+
+import numpy as np
+import pandas as pd
+
+MODELS = ("gbm", "jump", "regime")
+
+
+def synthetic_prices(
+    nb_epochs: int,
+    nb_assets: int = 1,
+    names: list[str] | None = None,
+    model: str = "gbm",
+    seed: int | None = 0,
+    start_price: float | np.ndarray = 1.0,
+    drift: float = 0.0,
+    volatility: float = 0.01,
+    correlation: float | np.ndarray = 0.0,
+    jump_intensity: float = 0.01,
+    jump_mean: float = -0.02,
+    jump_std: float = 0.04,
+    regimes: tuple[tuple[float, float], ...] = ((0.0005, 0.008), (-0.001, 0.02)),
+    switch_probability: float = 0.01,
+) -> pd.DataFrame:
+    """
+    Draw a synthetic price series.
+
+    Parameters
+    ----------
+    nb_epochs : int
+        Number of epochs (rows).
+    nb_assets : int
+        Number of assets.
+    names : list[str] or None
+        Names of the `nb_assets` assets, "Asset A", "Asset B", ... by
+        default (`asset_names`).
+    model : str
+        "gbm", "jump" or "regime" (see the module docstring).
+    seed : int or None
+        Seed of the draws.
+    start_price : float or np.ndarray
+        Price of every asset (or of each asset) at epoch 0.
+    drift : float
+        Expected return per epoch ("gbm" and "jump").
+    volatility : float
+        Standard deviation of the log return per epoch, jumps excluded
+        ("gbm" and "jump").
+    correlation : float or np.ndarray
+        Correlation of the shocks of any two assets, or their full
+        (assets x assets) correlation matrix.
+    jump_intensity : float
+        Expected number of jumps per epoch and asset ("jump").
+    jump_mean, jump_std : float
+        Mean and standard deviation of the log size of a jump ("jump"). The
+        drift is compensated so that `drift` stays the expected return.
+    regimes : tuple of (drift, volatility)
+        Drift and volatility of each regime ("regime").
+    switch_probability : float
+        Probability per epoch of leaving the current regime for one of the
+        others, drawn uniformly ("regime").
+
+    Returns
+    -------
+    DataFrame
+        Prices indexed by epoch, with a "Cash" column of ones.
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown model {model!r}, expected one of {MODELS}")
+    if nb_epochs < 1 or nb_assets < 1:
+        raise ValueError(f"Need at least one epoch and one asset, got {nb_epochs} and {nb_assets}")
+    if names is None:
+        names = asset_names(nb_assets)
+    elif len(names) != nb_assets:
+        raise ValueError(f"Expected {nb_assets} asset names, got {names}")
+
+    rng = np.random.default_rng(seed)
+    nb_returns = nb_epochs - 1
+    shocks = correlated_normals(rng, nb_returns, nb_assets, correlation)
+
+    if model == "regime":
+        regime_drifts, regime_volatilities = np.array(regimes, dtype=np.float64).T
+        states = regime_path(rng, nb_returns, len(regimes), switch_probability)
+        drifts = regime_drifts[states][:, None]
+        volatilities = regime_volatilities[states][:, None]
+    else:
+        drifts = drift
+        volatilities = volatility
+
+    # Log returns, written in place into the log prices of epochs 1 to n - 1
+    log_prices = np.empty((nb_epochs, nb_assets))
+    log_prices[0] = 0.0
+    log_returns = log_prices[1:]
+    np.multiply(shocks, volatilities, out=log_returns)
+    del shocks
+    log_returns += np.log1p(drifts) - np.square(volatilities) / 2
+
+    if model == "jump":
+        counts = rng.poisson(jump_intensity, size=log_returns.shape)
+        jumps = counts * jump_mean + np.sqrt(counts) * jump_std * rng.standard_normal(log_returns.shape)
+        log_returns += jumps
+        log_returns -= jump_intensity * np.expm1(jump_mean + jump_std**2 / 2)
+
+    np.cumsum(log_prices, axis=0, out=log_prices)
+    prices = np.exp(log_prices, out=log_prices)
+    prices *= start_price
+
+    prices = pd.DataFrame(prices, index=pd.RangeIndex(nb_epochs), columns=list(names), copy=False)
+    prices["Cash"] = 1
+    return prices
+
+
+def asset_names(nb_assets: int) -> list[str]:
+    """
+    "Asset A" to "Asset Z", then "Asset AA", "Asset AB", ...
+    """
+    names = []
+    for i in range(nb_assets):
+        letters = ""
+        i += 1
+        while i:
+            i, remainder = divmod(i - 1, 26)
+            letters = string.ascii_uppercase[remainder] + letters
+        names.append(f"Asset {letters}")
+    return names
+
+
+def correlated_normals(
+    rng: np.random.Generator,
+    nb_epochs: int,
+    nb_assets: int,
+    correlation: float | np.ndarray,
+) -> np.ndarray:
+    """
+    Standard normal draws, shape (epochs x assets), whose columns have the
+    given correlation (a scalar for every pair, or a full matrix).
+    """
+    normals = rng.standard_normal((nb_epochs, nb_assets))
+    if np.ndim(correlation) == 0:
+        if correlation == 0 or nb_assets == 1:
+            return normals
+        matrix = np.full((nb_assets, nb_assets), float(correlation))
+        np.fill_diagonal(matrix, 1.0)
+    else:
+        matrix = np.asarray(correlation, dtype=np.float64)
+        if matrix.shape != (nb_assets, nb_assets):
+            raise ValueError(f"The correlation matrix must be {nb_assets} x {nb_assets}, got {matrix.shape}")
+
+    try:
+        cholesky = np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        raise ValueError("The correlation matrix must be positive definite") from None
+    return normals @ cholesky.T
+
+
+def regime_path(
+    rng: np.random.Generator,
+    nb_epochs: int,
+    nb_regimes: int,
+    switch_probability: float,
+) -> np.ndarray:
+    """
+    Regime of each epoch for a Markov chain that leaves its regime with
+    probability `switch_probability` per epoch, for another one drawn
+    uniformly. The first regime is drawn uniformly.
+
+    Drawn by regime spells rather than by epoch: the spell lengths are
+    geometric, and each next regime is the previous one shifted by 1 to
+    `nb_regimes - 1` (modulo `nb_regimes`).
+    """
+    state = rng.integers(nb_regimes)
+    if nb_regimes == 1 or switch_probability <= 0:
+        return np.full(nb_epochs, state)
+    if switch_probability > 1:
+        raise ValueError(f"switch_probability must be at most 1, got {switch_probability}")
+
+    states, lengths = [], []
+    covered = 0
+    while covered < nb_epochs:
+        nb_spells = int((nb_epochs - covered) * switch_probability * 1.2) + 16
+        spell_lengths = rng.geometric(switch_probability, size=nb_spells)
+        shifts = rng.integers(1, nb_regimes, size=nb_spells)
+        spell_states = (state + np.cumsum(shifts) - shifts) % nb_regimes
+        state = (spell_states[-1] + shifts[-1]) % nb_regimes
+        states.append(spell_states)
+        lengths.append(spell_lengths)
+        covered += spell_lengths.sum()
+    return np.repeat(np.concatenate(states), np.concatenate(lengths))[:nb_epochs]
@@ -0,0 +1,81 @@
+import glob
+import importlib
+import importlib.machinery
+import importlib.util
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# main.py, bot_trade.py and scoring/ are imported from the kit directory,
+# as main.py does when it is run from there
+KIT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, KIT_DIR)
+
+# Every kit of the repository (a directory with its own main.py)
+REPO_DIR = os.path.dirname(KIT_DIR)
+KITS = sorted(
+    os.path.dirname(os.path.realpath(path))
+    for path in glob.glob(os.path.join(REPO_DIR, "**", "main.py"), recursive=True)
+)
+
+
+def kit_id(kit: str) -> str:
+    return os.path.relpath(kit, REPO_DIR)
+
+
+def load_kit_scoring(kit: str, name: str = "scoring"):
+    """
+    Module `name` of the `scoring/` package of `kit`, imported under a
+    package name of its own so that the variants of every kit (fees, base
+    score) can be loaded side by side.
+    """
+    package = "scoring_" + re.sub(r"\W", "_", kit_id(kit))
+    if package not in sys.modules:
+        spec = importlib.machinery.ModuleSpec(package, None, is_package=True)
+        module = importlib.util.module_from_spec(spec)
+        module.__path__ = [os.path.join(kit, "scoring")]
+        sys.modules[package] = module
+    return importlib.import_module(f"{package}.{name}")
+
+# Price files bundled with every kit of the repository
+DATASETS = sorted(
+    {
+        os.path.realpath(path)
+        for path in glob.glob(os.path.join(os.path.dirname(KIT_DIR), "**", "data", "*.csv"), recursive=True)
+    }
+    | {os.path.realpath(path) for path in glob.glob(os.path.join(KIT_DIR, "data", "*.csv"))}
+)
+
+
+def read_prices(path_csv: str) -> pd.DataFrame:
+    # As `find_csv_file` returns them, without the cache
+    prices = pd.read_csv(path_csv, index_col=0)
+    prices["Cash"] = 1
+    return prices
+
+
+def random_positions(prices: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    # Weights summing to 1, changing every epoch (a lot of rebalancing)
+    weights = np.random.default_rng(seed).random(prices.shape)
+    weights /= weights.sum(axis=1, keepdims=True)
+    return pd.DataFrame(weights, index=prices.index, columns=prices.columns)
+
+
+@pytest.fixture(params=DATASETS, ids=os.path.basename)
+def dataset(request) -> pd.DataFrame:
+    return read_prices(request.param)
+
+
+@pytest.fixture(params=KITS, ids=kit_id)
+def kit(request) -> str:
+    return request.param
+
+
+@pytest.fixture
+def kit_scoring(kit):
+    # `scoring/scoring.py` of each kit
+    return load_kit_scoring(kit)
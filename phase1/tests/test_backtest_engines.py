@@ -0,0 +1,43 @@
+"""
+The numpy and numba backtest engines against the reference loop
+(engine="pandas"), on every bundled price file, in every kit.
+"""
+
+import numpy as np
+import pytest
+
+from conftest import random_positions
+
+RTOL = 1e-12
+
+
+def assert_same_backtest(result: dict, reference: dict):
+    np.testing.assert_allclose(
+        result["pnl"].to_numpy(dtype=np.float64), reference["pnl"].to_numpy(dtype=np.float64), rtol=RTOL
+    )
+    assert result["stats"].keys() == reference["stats"].keys()
+    for key, value in reference["stats"].items():
+        assert result["stats"][key] == pytest.approx(value, rel=RTOL, abs=1e-15, nan_ok=True), key
+
+
+@pytest.mark.parametrize("engine", ["numpy", "numba"])
+def test_engine_matches_reference(kit_scoring, dataset, engine):
+    if engine == "numba":
+        pytest.importorskip("numba")
+    positions = random_positions(dataset)
+    reference = kit_scoring.backtest(prices=dataset, positions=positions, initial_capital=1_000, engine="pandas")
+    result = kit_scoring.backtest(prices=dataset, positions=positions, initial_capital=1_000, engine=engine)
+    assert_same_backtest(result, reference)
+
+
+def test_engines_match_reference_on_constant_positions(kit_scoring, dataset):
+    # No rebalancing cost after the first epoch
+    positions = random_positions(dataset.iloc[:1]).reindex(dataset.index, method="ffill")
+    reference = kit_scoring.backtest(prices=dataset, positions=positions, initial_capital=1_000, engine="pandas")
+    result = kit_scoring.backtest(prices=dataset, positions=positions, initial_capital=1_000, engine="numpy")
+    assert_same_backtest(result, reference)
+
+
+def test_unknown_engine(kit_scoring, dataset):
+    with pytest.raises(ValueError):
+        kit_scoring.backtest(prices=dataset, positions=random_positions(dataset), engine="fortran")
@@ -0,0 +1,51 @@
+"""
+Vectorized bots (`make_decisions`): the positions of a causal bot are kept
+as it returns them, and a bot that reads prices after the epoch it decides
+for is rejected by the replay of `run_batch`.
+"""
+
+import numpy as np
+import pytest
+
+from main import run_batch
+
+
+def trend_weights(signal: np.ndarray) -> np.ndarray:
+    # Equal weights in the assets with a positive signal, the rest in cash
+    invested = signal > 0
+    nb_invested = invested.sum(axis=1, keepdims=True)
+    weights = np.where(nb_invested > 0, invested / np.maximum(nb_invested, 1), 0.0)
+    return np.column_stack([weights, 1.0 - weights.sum(axis=1)])
+
+
+def past_momentum(asset_prices: np.ndarray) -> np.ndarray:
+    signal = np.zeros_like(asset_prices)
+    signal[5:] = asset_prices[5:] - asset_prices[:-5]
+    return trend_weights(signal)
+
+
+def next_return(asset_prices: np.ndarray) -> np.ndarray:
+    # Invested ahead of every rise: reads the price of the next epoch
+    signal = np.zeros_like(asset_prices)
+    signal[:-1] = asset_prices[1:] - asset_prices[:-1]
+    return trend_weights(signal)
+
+
+def above_overall_mean(asset_prices: np.ndarray) -> np.ndarray:
+    # Compares each price with the mean of the whole series, future included
+    return trend_weights(asset_prices - asset_prices.mean(axis=0))
+
+
+def test_causal_bot_is_accepted(dataset):
+    positions = run_batch(dataset, past_momentum)
+    asset_prices = dataset.drop(columns="Cash").to_numpy()
+    np.testing.assert_array_equal(positions.to_numpy(), past_momentum(asset_prices))
+    assert list(positions.columns) == list(dataset.columns)
+
+
+@pytest.mark.parametrize("make_decisions", [next_return, above_overall_mean])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_lookahead_bot_is_rejected(dataset, make_decisions, seed, capsys):
+    with pytest.raises(ValueError, match="que les prix jusqu'à cette époque"):
+        run_batch(dataset, make_decisions, seed=seed)
+    assert "make_decisions utilise des prix futurs" in capsys.readouterr().out
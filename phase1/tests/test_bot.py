@@ -0,0 +1,72 @@
+"""
+Bots reused in-process (sweeps, bootstrap paths): after `reset()` a bot
+must run exactly as a new one, in every kit.
+"""
+
+import glob
+import importlib.util
+import os
+import re
+
+import numpy as np
+import pytest
+
+from conftest import KIT_DIR, kit_id, read_prices
+from main import decision_function, load_bot, new_bot, reset_bot, run_epochs
+
+PATH_CSV = os.path.join(KIT_DIR, "data", "asset_a_test.csv")
+
+
+def load_kit_bot_trade(kit: str):
+    # `bot_trade.py` of `kit`, under a module name of its own
+    name = "bot_trade_" + re.sub(r"\W", "_", kit_id(kit))
+    spec = importlib.util.spec_from_file_location(name, os.path.join(kit, "bot_trade.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run(prices, bot) -> np.ndarray:
+    return run_epochs(prices, bot.on_epoch).to_numpy()
+
+
+def test_reset_repeats_run(kit):
+    bot_trade = load_kit_bot_trade(kit)
+    prices = read_prices(sorted(glob.glob(os.path.join(kit, "data", "*.csv")))[0])
+    bot = bot_trade.Bot()
+    first = run(prices, bot)
+
+    bot.reset()
+    np.testing.assert_array_equal(run(prices, bot), first)
+    np.testing.assert_array_equal(run(prices, bot_trade.Bot()), first)
+
+
+@pytest.mark.parametrize("params", [{}, {"WARMUP": 10, "MA_WINDOW": 15}])
+def test_reset_after_partial_run(params):
+    prices = read_prices(PATH_CSV)
+    bot = new_bot(params)
+    expected = run(prices, bot)
+
+    # Stopped half-way, then started over on other prices
+    run(prices.iloc[: len(prices) // 2], bot)
+    bot.reset()
+    assert bot.params == new_bot(params).params
+    np.testing.assert_array_equal(run(prices, bot), expected)
+
+
+def test_reset_keeps_params():
+    prices = read_prices(PATH_CSV)
+    bot = new_bot({"WARMUP": 10})
+    bot.reset()
+    assert not np.array_equal(run(prices, bot), run(prices, new_bot()))
+
+
+def test_reset_bot_replaces_module():
+    # A bot module has no `reset`: `reset_bot` gives a new bot instead
+    prices = read_prices(PATH_CSV)
+    module = load_bot({}, module_name="bot_trade_reset")
+    first = run_epochs(prices, decision_function(module)).to_numpy()
+
+    fresh = reset_bot(module, module_name="bot_trade_reset")
+    assert fresh is not module
+    np.testing.assert_array_equal(run_epochs(prices, decision_function(fresh)).to_numpy(), first)
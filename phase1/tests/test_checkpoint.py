@@ -0,0 +1,102 @@
+"""
+Chunked runs interrupted and resumed from their last `Checkpoint`: the
+pnl and the scores must be those of the same run without interruption.
+"""
+
+import os
+
+import pytest
+
+from conftest import KIT_DIR, read_prices
+from main import iter_frame, new_bot, run_chunked
+from scoring.checkpoint import Checkpoint
+
+PATH_CSV = os.path.join(KIT_DIR, "data", "asset_a_test.csv")
+
+
+class MomentumBot:
+    """
+    Invested in the assets that rose over its last `lookback` epochs, read
+    from the price history, and counting its epochs: a resumed run that
+    lost or replayed part of its state would not take the same positions.
+    """
+
+    def __init__(self, columns, lookback=5):
+        self.columns = columns
+        self.lookback = lookback
+        self.epochs = 0
+
+    def on_epoch(self, epoch, *current_prices, history):
+        self.epochs += 1
+        rising = history[-1] > history[max(len(history) - 1 - self.lookback, 0)]
+        # In cash while warming up, and one epoch in three
+        if self.epochs <= self.lookback or self.epochs % 3 == 0 or not rising.any():
+            return dict(zip(self.columns, [0.0] * len(rising) + [1.0]))
+        weights = rising / rising.sum()
+        return dict(zip(self.columns, weights.tolist() + [0.0]))
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupted(windows, nb_windows):
+    # As if the run were killed while reading the window after `nb_windows`
+    for i, window in enumerate(windows):
+        if i == nb_windows:
+            raise Interrupted
+        yield window
+
+
+def resumed_run(prices, bot, chunk_size, checkpoint, nb_windows) -> dict:
+    with pytest.raises(Interrupted):
+        run_chunked(
+            interrupted(iter_frame(prices, chunk_size), nb_windows),
+            bot.on_epoch,
+            checkpoint=checkpoint,
+            bot=bot,
+        )
+    # The snapshot is read back as a new process would
+    checkpoint = Checkpoint(checkpoint.path, every=checkpoint.every, source=checkpoint.source)
+    resume = checkpoint.load()
+    assert resume is not None
+    start = resume["backtester"].nb_epochs
+    assert 0 < start < nb_windows * chunk_size
+    bot = resume["bot"]
+    return run_chunked(
+        iter_frame(prices, chunk_size, start=start),
+        bot.on_epoch,
+        checkpoint=checkpoint,
+        bot=bot,
+        resume=resume,
+    )
+
+
+def assert_same_run(result: dict, expected: dict):
+    assert result["pnl"] == expected["pnl"]
+    assert result["stats"] == pytest.approx(expected["stats"], rel=1e-12, nan_ok=True)
+    assert result["scores"] == pytest.approx(expected["scores"], rel=1e-12, nan_ok=True)
+
+
+@pytest.mark.parametrize("chunk_size", [7, 100])
+def test_resumed_run_matches_uninterrupted_run(dataset, tmp_path, chunk_size):
+    prices = dataset.iloc[:1_000]
+    columns = list(prices.columns)
+    expected = run_chunked(iter_frame(prices, chunk_size), MomentumBot(columns).on_epoch)
+
+    # Snapshots every 3 windows, interrupted 2 windows after the last one:
+    # the run resumes before epochs it had already run
+    checkpoint = Checkpoint(str(tmp_path / "run.ckpt"), every=3 * chunk_size, source={"test": chunk_size})
+    result = resumed_run(prices, MomentumBot(columns), chunk_size, checkpoint, nb_windows=5)
+    assert_same_run(result, expected)
+
+
+def test_resumed_kit_bot_matches_uninterrupted_run(tmp_path):
+    prices = read_prices(PATH_CSV)
+    bot = new_bot()
+    expected = run_chunked(iter_frame(prices, 100), bot.on_epoch)
+
+    bot.reset()
+    checkpoint = Checkpoint(str(tmp_path / "run.ckpt"), every=300, source={"path_csv": PATH_CSV})
+    result = resumed_run(prices, bot, 100, checkpoint, nb_windows=8)
+    assert_same_run(result, expected)
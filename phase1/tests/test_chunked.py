@@ -0,0 +1,48 @@
+"""
+Chunked runs of `main.py`, on a copy of a bundled CSV so that the price
+cache they may create next to it is checked from a clean directory.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from conftest import KIT_DIR
+
+PATH_CSV = os.path.join(KIT_DIR, "data", "asset_a_test.csv")
+
+
+def base_score(*args: str) -> str:
+    output = subprocess.run(
+        [sys.executable, os.path.join(KIT_DIR, "main.py"), *args],
+        cwd=KIT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return re.search(r"Base Score:\s+(\S+)", output).group(1)
+
+
+@pytest.fixture
+def path_csv(tmp_path) -> str:
+    path = tmp_path / "data" / "prices.csv"
+    path.parent.mkdir()
+    shutil.copy(PATH_CSV, path)
+    return str(path)
+
+
+def test_chunked_no_cache_leaves_no_cache(path_csv):
+    score = base_score(path_csv, "--chunk-size", "100", "--no-cache")
+    assert os.listdir(os.path.dirname(path_csv)) == ["prices.csv"]
+    assert score == base_score(PATH_CSV)
+
+
+def test_chunked_uses_price_store(path_csv):
+    score = base_score(path_csv, "--chunk-size", "100")
+    cache = os.path.join(os.path.dirname(path_csv), ".prices_cache")
+    assert any(entry.endswith(".store") for entry in os.listdir(cache))
+    assert score == base_score(PATH_CSV)
@@ -0,0 +1,51 @@
+"""
+The price history given to bots that take a `history` argument: it must
+hold the prices up to the current epoch and nothing after, down to the
+buffer behind it.
+"""
+
+import numpy as np
+import pytest
+
+from conftest import random_positions
+from main import iter_frame, run_chunked, run_epochs
+
+
+class HistoryBot:
+    """
+    Checks the history it gets at every epoch against the prices, and holds
+    its weights from `random_positions`.
+    """
+
+    def __init__(self, prices):
+        self.asset_prices = prices.drop(columns="Cash").to_numpy()
+        self.positions = random_positions(prices)
+        self.columns = list(prices.columns)
+        self.t = 0
+
+    def on_epoch(self, epoch, *current_prices, history):
+        t = self.t
+        np.testing.assert_array_equal(history, self.asset_prices[: t + 1])
+        assert history[-1].tolist() == list(current_prices)
+        assert not history.flags.writeable
+        # Nothing past the current epoch in the buffer the view comes from
+        base = history.base
+        assert not base.flags.writeable
+        assert not base.reshape(-1)[history.size :].any()
+        self.t += 1
+        return dict(zip(self.columns, self.positions.iloc[t].tolist()))
+
+
+def test_history_holds_no_future_prices(dataset):
+    bot = HistoryBot(dataset)
+    positions = run_epochs(dataset, bot.on_epoch)
+    assert bot.t == len(dataset)
+    np.testing.assert_array_equal(positions.to_numpy(), bot.positions.to_numpy())
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100])
+def test_history_holds_no_future_prices_in_chunked_mode(dataset, chunk_size):
+    prices = dataset.iloc[:300]
+    bot = HistoryBot(prices)
+    run_chunked(iter_frame(prices, chunk_size), bot.on_epoch)
+    assert bot.t == len(prices)
@@ -0,0 +1,113 @@
+"""
+The streaming indicators of `indicators.py` against slice-based references
+on the whole series seen so far, through the window fill and evictions.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from indicators import EMA, DrawdownTracker, RingBuffer, RollingMax, RollingMean, RollingMin, RollingVariance
+
+WINDOWS = [1, 2, 3, 7, 30]
+
+
+def series(n: int = 200, seed: int = 0) -> list[float]:
+    # Prices around 100 with plateaus (equal values) and a crash
+    rng = np.random.default_rng(seed)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    values[50:60] = values[50]
+    values[120] *= 0.5
+    return values.tolist()
+
+
+def test_ring_buffer_keeps_last_values():
+    buffer = RingBuffer(3)
+    assert buffer.append(1.0) is None
+    assert buffer.append(2.0) is None
+    assert not buffer.is_full()
+    assert buffer.append(3.0) is None
+    assert buffer.is_full()
+    assert buffer.append(4.0) == 1.0
+    assert list(buffer) == [2.0, 3.0, 4.0]
+    assert buffer[0] == 2.0 and buffer[-1] == 4.0
+    with pytest.raises(IndexError):
+        buffer[3]
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+def test_rolling_mean(window):
+    values = series()
+    indicator = RollingMean(window)
+    for t, x in enumerate(values):
+        expected = math.fsum(values[max(0, t + 1 - window) : t + 1]) / min(t + 1, window)
+        assert indicator.update(x) == pytest.approx(expected, rel=1e-12)
+        assert indicator.value == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+@pytest.mark.parametrize("ddof", [0, 1])
+def test_rolling_variance(window, ddof):
+    values = series()
+    indicator = RollingVariance(window, ddof=ddof)
+    for t, x in enumerate(values):
+        last = values[max(0, t + 1 - window) : t + 1]
+        value = indicator.update(x)
+        if len(last) - ddof <= 0:
+            assert math.isnan(value)
+            continue
+        expected = np.var(last, ddof=ddof)
+        assert value == pytest.approx(expected, rel=1e-8, abs=1e-9)
+        assert indicator.std == pytest.approx(math.sqrt(expected), rel=1e-8, abs=1e-6)
+
+
+def test_rolling_variance_constant_window_is_zero():
+    indicator = RollingVariance(5)
+    for x in [1.1, 2.3, 0.7] + [3.3] * 10:
+        indicator.update(x)
+    assert indicator.value == 0.0
+
+
+@pytest.mark.parametrize("span", [1, 5, 20])
+def test_ema(span):
+    values = series()
+    indicator = EMA(span=span)
+    alpha = 2 / (span + 1)
+    expected = values[0]
+    for x in values:
+        expected = x if x is values[0] else expected + alpha * (x - expected)
+        assert indicator.update(x) == expected
+
+
+def test_ema_needs_span_or_alpha():
+    with pytest.raises(ValueError):
+        EMA()
+    with pytest.raises(ValueError):
+        EMA(span=3, alpha=0.5)
+    assert EMA(alpha=0.5).alpha == 0.5
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+@pytest.mark.parametrize("indicator_class, reference", [(RollingMax, max), (RollingMin, min)])
+def test_rolling_extremum(window, indicator_class, reference):
+    values = series()
+    indicator = indicator_class(window)
+    assert math.isnan(indicator.value)
+    for t, x in enumerate(values):
+        expected = reference(values[max(0, t + 1 - window) : t + 1])
+        assert indicator.update(x) == expected
+        assert indicator.value == expected
+
+
+def test_drawdown_tracker():
+    values = series()
+    indicator = DrawdownTracker()
+    for t, x in enumerate(values):
+        last = np.array(values[: t + 1])
+        drawdown = last / np.maximum.accumulate(last) - 1
+        assert indicator.update(x) == pytest.approx(drawdown[-1], abs=1e-15)
+        assert indicator.max_drawdown == pytest.approx(drawdown.min(), abs=1e-15)
+    assert indicator.update(max(values) * 2) == 0.0
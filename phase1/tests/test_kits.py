@@ -0,0 +1,36 @@
+"""
+The kits of the repository are self-contained: each is handed out and run
+from its own directory, so the driver and the modules it shares with the
+other kits are copied in each of them. The copies must stay identical;
+only the bot, the data and `scoring/scoring.py` (fees and drawdown score,
+see test_scoring.py) are specific to a kit.
+"""
+
+import filecmp
+import os
+
+import pytest
+
+from conftest import KIT_DIR, KITS, kit_id
+
+SHARED_FILES = [
+    "main.py",
+    "indicators.py",
+    "requirement.txt",
+    "setup_env.sh",
+    "scoring/checkpoint.py",
+    "scoring/live.py",
+    "scoring/prices.py",
+    "scoring/profiling.py",
+    "scoring/reporting.py",
+    "scoring/resampling.py",
+    "scoring/synthetic.py",
+]
+
+
+@pytest.mark.parametrize("kit", [kit for kit in KITS if kit != KIT_DIR], ids=kit_id)
+@pytest.mark.parametrize("name", SHARED_FILES)
+def test_shared_file_is_identical(kit, name):
+    assert filecmp.cmp(os.path.join(KIT_DIR, name), os.path.join(kit, name), shallow=False), (
+        f"{kit_id(kit)}/{name} differs from the copy of {kit_id(KIT_DIR)}"
+    )
@@ -0,0 +1,114 @@
+"""
+Live mode: a bundled CSV replayed through the stand-in feed of
+`scoring/live.py` must score as the same prices read from the file.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from conftest import DATASETS, random_positions, read_prices
+from main import iter_frame, run_chunked, run_live
+from scoring.live import read_socket, serve_replay
+
+
+class PositionsBot:
+    # Weights of `random_positions`, looked up by epoch
+    def __init__(self, prices):
+        positions = random_positions(prices)
+        self.decisions = {
+            epoch: dict(zip(positions.columns, weights))
+            for epoch, weights in zip(prices.index.tolist(), positions.to_numpy().tolist())
+        }
+
+    def __call__(self, epoch, *prices):
+        return self.decisions[epoch]
+
+
+async def replay(path_csv, path_socket, decision_generator, rate=0.0, cancel_after=None):
+    async with await serve_replay(path_csv, path_socket, rate=rate):
+        task = asyncio.create_task(run_live(read_socket(path_socket), decision_generator))
+        if cancel_after is not None:
+            await asyncio.sleep(cancel_after)
+            task.cancel()
+        return await task
+
+
+@pytest.mark.parametrize("path_csv", DATASETS, ids=os.path.basename)
+def test_replay_matches_file(path_csv, tmp_path):
+    prices = read_prices(path_csv)
+    bot = PositionsBot(prices)
+    result = asyncio.run(replay(path_csv, str(tmp_path / "feed.sock"), bot))
+    reference = run_chunked(iter_frame(prices, 1_000), bot)
+
+    assert result["pnl"] == pytest.approx(reference["pnl"], rel=1e-12)
+    assert result["stats"] == pytest.approx(reference["stats"], rel=1e-9, nan_ok=True)
+    assert result["scores"] == pytest.approx(reference["scores"], rel=1e-9)
+    assert result["latency"]["tick"].count == len(prices)
+
+
+def test_cancelled_replay(tmp_path):
+    # As with Ctrl-C: the ticks received so far are scored, and neither the
+    # client nor the server leaves an unhandled error behind
+    path_csv = DATASETS[0]
+    prices = read_prices(path_csv)
+    errors = []
+
+    async def main():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        return await replay(path_csv, str(tmp_path / "feed.sock"), PositionsBot(prices), rate=500, cancel_after=0.2)
+
+    result = asyncio.run(main())
+    assert 0 < result["latency"]["tick"].count < len(prices)
+    assert errors == []
+
+
+def test_feed_closed_on_error():
+    closed = []
+
+    async def ticks():
+        try:
+            yield "epoch,Asset A\n"
+            yield "0,1.0\n"
+            yield "1,1.0,2.0\n"
+            yield "2,1.0\n"
+        finally:
+            closed.append(True)
+
+    async def main():
+        with pytest.raises(ValueError, match="Tick invalide"):
+            await run_live(ticks(), lambda epoch, price: {"Asset A": 0.5, "Cash": 0.5})
+        # Before the end of the event loop, which would close it anyway
+        return list(closed)
+
+    assert asyncio.run(main()) == [True]
+
+
+def test_server_cancelled_during_replay(tmp_path):
+    # Ctrl-C on `main.py --serve` cancels the task sending to each client,
+    # which must end quietly
+    path_socket = str(tmp_path / "feed.sock")
+    errors = []
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda loop, context: errors.append(context))
+        async with await serve_replay(DATASETS[0], path_socket, rate=1):
+            reader, writer = await asyncio.open_unix_connection(path_socket)
+            try:
+                # The header and the first tick, after which the sending task
+                # waits for the next one
+                lines = [await reader.readline(), await reader.readline()]
+                for task in asyncio.all_tasks():
+                    if task is not asyncio.current_task():
+                        task.cancel()
+                # The connection is closed instead of sending the next tick
+                lines.append(await asyncio.wait_for(reader.read(), timeout=5))
+            finally:
+                writer.close()
+            return lines
+
+    lines = asyncio.run(main())
+    assert lines[-1] == b""
+    assert errors == []
@@ -0,0 +1,64 @@
+"""
+`OnlineStats`, fed epoch by epoch (`update`) or by chunks (`update_many`),
+against `compute_stats` on the whole series, in every kit.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import random_positions
+
+
+def exposures(positions: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    weights = positions.abs()
+    market = [c for c in positions.columns if str(c).upper() != "CASH"]
+    return weights[market].sum(axis=1).to_numpy(), weights.sum(axis=1).to_numpy()
+
+
+def online_stats(kit_scoring, pnl: pd.Series, positions: pd.DataFrame, chunk_size: int | None) -> dict:
+    market_exposure, total_exposure = exposures(positions)
+    values = pnl.to_numpy()
+    accumulator = kit_scoring.OnlineStats()
+    if chunk_size is None:
+        for value, market, total in zip(values, market_exposure, total_exposure):
+            accumulator.update(float(value), float(market), float(total))
+    else:
+        for start in range(0, len(values), chunk_size):
+            end = start + chunk_size
+            accumulator.update_many(values[start:end], market_exposure[start:end], total_exposure[start:end])
+    return accumulator.stats()
+
+
+def assert_same_stats(stats: dict, expected: dict):
+    assert stats.keys() == expected.keys()
+    for metric, value in expected.items():
+        if np.isnan(value):
+            assert np.isnan(stats[metric]), metric
+        else:
+            assert stats[metric] == pytest.approx(value, rel=1e-12, abs=1e-15), metric
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 7, 1_000], ids=["update", "chunk1", "chunk7", "chunk1000"])
+def test_online_stats_match_compute_stats(kit_scoring, dataset, chunk_size):
+    positions = random_positions(dataset)
+    returns = np.random.default_rng(0).normal(2e-4, 1e-2, len(dataset))
+    pnl = pd.Series(1_000 * np.cumprod(1 + returns), index=dataset.index)
+
+    expected = kit_scoring.compute_stats(pnl=pnl, positions=positions)
+    assert_same_stats(online_stats(kit_scoring, pnl, positions, chunk_size), expected)
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 7, 1_000], ids=["update", "chunk1", "chunk7", "chunk1000"])
+def test_online_stats_with_zero_drawdown(kit_scoring, dataset, chunk_size):
+    positions = random_positions(dataset)
+    # Equity rising every epoch: the drawdown is exactly zero
+    returns = np.random.default_rng(0).uniform(1e-4, 1e-3, len(dataset))
+    pnl = pd.Series(1_000 * np.cumprod(1 + returns), index=dataset.index)
+
+    expected = kit_scoring.compute_stats(pnl=pnl, positions=positions)
+    stats = online_stats(kit_scoring, pnl, positions, chunk_size)
+    assert expected["max_drawdown"] == 0.0
+    assert stats["max_drawdown"] == 0.0
+    assert type(stats["max_drawdown"]) is type(expected["max_drawdown"])
+    assert_same_stats(stats, expected)
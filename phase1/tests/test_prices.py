@@ -0,0 +1,94 @@
+"""
+The price cache next to the CSV: the cached prices are those of the CSV,
+and an edited CSV is parsed again, its old cache entries removed.
+"""
+
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import KIT_DIR
+from scoring.prices import CACHE_DIR, open_price_store, read_prices_csv
+
+PATH_CSV = os.path.join(KIT_DIR, "data", "asset_a_test.csv")
+
+
+@pytest.fixture
+def path_csv(tmp_path) -> str:
+    path = tmp_path / "prices.csv"
+    shutil.copy(PATH_CSV, path)
+    return str(path)
+
+
+def cache_entries(path_csv: str) -> set[str]:
+    return set(os.listdir(os.path.join(os.path.dirname(path_csv), CACHE_DIR)))
+
+
+def edit_prices(path_csv: str) -> pd.DataFrame:
+    # Same size and modification time: only the content tells the change
+    stat = os.stat(path_csv)
+    with open(path_csv) as f:
+        text = f.read()
+    # First price of the bundled CSV, doubled
+    assert "\n0,1.0\n" in text
+    with open(path_csv, "w") as f:
+        f.write(text.replace("\n0,1.0\n", "\n0,2.0\n", 1))
+    os.utime(path_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert os.path.getsize(path_csv) == stat.st_size
+    return pd.read_csv(path_csv, index_col=0)
+
+
+def test_cached_prices_match_csv(path_csv):
+    expected = pd.read_csv(path_csv, index_col=0)
+    first = read_prices_csv(path_csv)
+    entries = cache_entries(path_csv)
+    second = read_prices_csv(path_csv)
+
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(second, expected)
+    assert cache_entries(path_csv) == entries
+    # Memory-mapped from the cache, not parsed again
+    assert not second.to_numpy().flags.writeable
+
+
+def test_cache_invalidated_when_csv_changes(path_csv):
+    read_prices_csv(path_csv)
+    old_entries = cache_entries(path_csv)
+    expected = edit_prices(path_csv)
+
+    prices = read_prices_csv(path_csv)
+    pd.testing.assert_frame_equal(prices, expected)
+    assert prices.iloc[0, 0] == 2.0
+    # The entries of the previous content are replaced, not kept alongside
+    new_entries = cache_entries(path_csv)
+    assert len(new_entries) == len(old_entries)
+    assert not new_entries & old_entries
+
+
+def test_cache_keeps_entries_of_other_csvs(path_csv, tmp_path):
+    other_csv = str(tmp_path / "other.csv")
+    shutil.copy(PATH_CSV, other_csv)
+    read_prices_csv(other_csv)
+    read_prices_csv(path_csv)
+    other_entries = {entry for entry in cache_entries(path_csv) if entry.startswith("other.csv.")}
+
+    edit_prices(path_csv)
+    read_prices_csv(path_csv)
+    assert other_entries
+    assert other_entries <= cache_entries(path_csv)
+
+
+def test_price_store_rebuilt_when_csv_changes(path_csv):
+    read_prices_csv(path_csv)
+    assert open_price_store(path_csv).window(0, 1).iloc[0, 0] == 1.0
+    expected = edit_prices(path_csv)
+
+    store = open_price_store(path_csv)
+    assert store.window(0, 1).iloc[0, 0] == 2.0
+    np.testing.assert_array_equal(store.window(0, len(store)).drop(columns="Cash").to_numpy(), expected.to_numpy())
+    # Only the entries of the current content are left (frame and store)
+    digests = {entry.split(".")[2] for entry in cache_entries(path_csv)}
+    assert len(digests) == 1
@@ -0,0 +1,54 @@
+"""
+Block-bootstrap paths (`main.py --bootstrap`): drawn from the historical
+returns, and the same for the same seed whatever the number of workers.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+from conftest import KIT_DIR
+from scoring.resampling import block_bootstrap_paths
+
+PATH_CSV = os.path.join(KIT_DIR, "data", "asset_a_test.csv")
+
+
+def paths(prices, seed, nb_paths=20, block_size=5) -> np.ndarray:
+    return block_bootstrap_paths(prices, nb_paths=nb_paths, block_size=block_size, rng=np.random.default_rng(seed))
+
+
+def test_paths_depend_only_on_seed(dataset):
+    np.testing.assert_array_equal(paths(dataset, seed=0), paths(dataset, seed=0))
+    assert not np.array_equal(paths(dataset, seed=0), paths(dataset, seed=1))
+
+
+@pytest.mark.parametrize("block_size", [1, 5, 2_000])
+def test_paths_are_made_of_historical_returns(dataset, block_size):
+    values = dataset.to_numpy(dtype=np.float64)
+    gross_returns = values[1:] / values[:-1]
+    drawn = paths(dataset, seed=0, block_size=block_size)
+
+    assert drawn.shape == (20, *values.shape)
+    np.testing.assert_array_equal(drawn[:, 0], np.broadcast_to(values[0], drawn[:, 0].shape))
+    np.testing.assert_allclose(drawn[..., dataset.columns.get_loc("Cash")], 1.0)
+    # Every epoch of a path is one epoch of the history, all assets together
+    for path in drawn[:3]:
+        path_returns = path[1:] / path[:-1]
+        distances = np.abs(path_returns[:, None, :] - gross_returns[None, :, :]).max(axis=2)
+        assert (distances.min(axis=1) < 1e-9).all()
+
+
+def test_bootstrap_depends_only_on_seed(monkeypatch):
+    # Small batches, so that several workers share the paths
+    monkeypatch.setattr(main, "BOOTSTRAP_BATCH", 2)
+
+    def run(seed, workers):
+        return main.run_bootstrap(PATH_CSV, nb_paths=5, block_size=20, seed=seed, workers=workers)
+
+    samples = run(seed=0, workers=1)
+    assert list(samples.index) == list(range(5))
+    pd.testing.assert_frame_equal(run(seed=0, workers=2), samples)
+    assert not run(seed=1, workers=1)["base_score"].equals(samples["base_score"])
@@ -0,0 +1,122 @@
+"""
+Scores of windows, strategy stacks and streaming runs, which share
+`get_base_score` with the whole-run score, in every kit: each kit has its
+own transaction fees and drawdown score.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import kit_id, random_positions
+
+# Transaction fees and drawdown score (of a -10% drawdown) of each kit
+KIT_RULES = {
+    "phase1": (0.0005, -0.01 / -0.1),
+    "phase2": (0.0001, 1 - -0.1 / -1),
+    "phase3": (0.0001, 1 - -0.1 / -1),
+    "phase3/phase3": (0.0001, 1 - -0.1 / -1),
+}
+
+
+def zero_drawdown_score(kit_scoring, sharpe, cum_ret) -> dict:
+    # As the scores of a whole run with no drawdown: numpy floats, which
+    # give an infinite mdd_score where it is a ratio to the drawdown
+    with np.errstate(divide="ignore"):
+        return kit_scoring.get_base_score(sharpe=np.float64(sharpe), cum_ret=np.float64(cum_ret), mdd=np.float64(0.0))
+
+
+def test_kit_rules(kit, kit_scoring, dataset):
+    fees, mdd_score = KIT_RULES[kit_id(kit)]
+    assert kit_scoring.get_base_score(sharpe=1.0, cum_ret=0.1, mdd=-0.1)["mdd_score"] == pytest.approx(mdd_score)
+
+    positions = random_positions(dataset)
+    result = kit_scoring.backtest(prices=dataset, positions=positions, initial_capital=1_000)
+    with_fees = kit_scoring.backtest(prices=dataset, positions=positions, initial_capital=1_000, transaction_fees=fees)
+    assert result["pnl"].equals(with_fees["pnl"])
+
+    # The streaming backtest (chunked and live runs) charges the same fees
+    backtester = kit_scoring.StreamingBacktester(columns=list(dataset.columns), initial_capital=1_000)
+    pnl = backtester.update_many(dataset.index, dataset, positions)
+    np.testing.assert_allclose(pnl, result["pnl"].to_numpy(dtype=np.float64), rtol=1e-12)
+
+
+def test_window_scores_with_zero_drawdown(kit_scoring, dataset):
+    prices = dataset
+    positions = random_positions(prices)
+    # Equity rising every epoch: no window has a drawdown
+    returns = np.random.default_rng(0).uniform(1e-4, 1e-3, len(prices))
+    pnl = pd.Series(np.cumprod(1 + returns), index=prices.index)
+
+    windows = kit_scoring.get_window_scores(pnl=pnl, positions=positions, window=5)
+    assert (windows["max_drawdown"] == 0.0).all()
+    for _, row in windows.head(10).iterrows():
+        expected = zero_drawdown_score(kit_scoring, row["sharpe_ratio"], row["cumulative_return"])
+        assert row["mdd_score"] == expected["mdd_score"]
+        assert row["base_score"] == expected["base_score"]
+
+
+def test_window_summary_skips_non_finite_windows(kit_scoring, dataset):
+    positions = random_positions(dataset)
+    # Rising in the first half (windows without drawdown), random after
+    rng = np.random.default_rng(0)
+    half = len(dataset) // 2
+    returns = np.r_[rng.uniform(1e-4, 1e-3, half), rng.normal(0, 1e-2, len(dataset) - half)]
+    pnl = pd.Series(np.cumprod(1 + returns), index=dataset.index)
+
+    windows = kit_scoring.get_window_scores(pnl=pnl, positions=positions, window=5)
+    summary = kit_scoring.summarize_windows(windows)
+    for metric, row in summary.iterrows():
+        values = windows[metric].to_numpy()
+        finite = values[np.isfinite(values)]
+        assert row["non_finite"] == len(values) - len(finite)
+        assert row["mean"] == pytest.approx(finite.mean(), rel=1e-12)
+        assert row["std"] == pytest.approx(finite.std(ddof=1), rel=1e-12)
+        assert (row["min"], row["max"]) == (finite.min(), finite.max())
+    # Phase 1 scores a window without drawdown as infinite
+    assert (summary.loc["mdd_score", "non_finite"] > 0) == np.isinf(windows["mdd_score"]).any()
+
+
+def test_stack_scores_with_zero_drawdown(kit_scoring, dataset):
+    prices = dataset
+    all_cash = np.zeros((1, len(prices), prices.shape[1]))
+    all_cash[..., prices.columns.get_loc("Cash")] = 1.0
+    positions_stack = np.concatenate([all_cash, random_positions(prices).to_numpy()[None]])
+
+    results = kit_scoring.backtest_many(prices, positions_stack, transaction_fees=0.0)
+    assert results["max_drawdown"].iloc[0] == 0.0
+    expected = zero_drawdown_score(kit_scoring, results["sharpe_ratio"].iloc[0], results["cumulative_return"].iloc[0])
+    assert results["mdd_score"].iloc[0] == expected["mdd_score"]
+    assert np.isfinite(results["base_score"].iloc[1])
+    assert results["base_score"].iloc[1] == pytest.approx(
+        kit_scoring.get_base_score(
+            sharpe=results["sharpe_ratio"].iloc[1],
+            cum_ret=results["cumulative_return"].iloc[1],
+            mdd=results["max_drawdown"].iloc[1],
+        )["base_score"]
+    )
+
+
+def test_streaming_scores_with_zero_drawdown(kit_scoring, dataset):
+    # Fully invested in an asset rising every epoch, without fees: no
+    # drawdown, however the epochs are fed
+    growth = 1 + np.random.default_rng(0).uniform(1e-4, 1e-3, len(dataset))
+    prices = pd.DataFrame({"Asset A": 100 * np.cumprod(growth), "Cash": 1.0}, index=dataset.index)
+    positions = pd.DataFrame({"Asset A": 1.0, "Cash": 0.0}, index=prices.index)
+
+    def new_backtester():
+        return kit_scoring.StreamingBacktester(columns=list(prices.columns), initial_capital=1_000, transaction_fees=0.0)
+
+    backtester = new_backtester()
+    pnl = [
+        backtester.update(epoch, current_prices, weights)
+        for epoch, current_prices, weights in zip(prices.index, prices.to_numpy(), positions.to_numpy())
+    ]
+    chunked = new_backtester()
+    chunked.update_many(prices.index, prices, positions)
+
+    stats = kit_scoring.compute_stats(pnl=pd.Series(pnl, index=prices.index), positions=positions)
+    assert stats["max_drawdown"] == 0.0
+    expected = zero_drawdown_score(kit_scoring, stats["sharpe_ratio"], stats["cumulative_return"])
+    for scores in (backtester.scores(), chunked.scores()):
+        assert scores == pytest.approx(expected, rel=1e-12)
@@ -0,0 +1,54 @@
+"""
+Resumed sweeps (`main.py --sweep`): the results file must stay consistent
+when the grid changes between runs.
+"""
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import KIT_DIR
+from main import run_sweep
+
+PATH_CSV = os.path.join(KIT_DIR, "data", "asset_a_test.csv")
+
+
+def write_grid(path, grid: dict) -> str:
+    path.write_text(json.dumps(grid))
+    return str(path)
+
+
+def test_resume_with_reordered_grid(tmp_path):
+    path_output = str(tmp_path / "sweep.csv")
+    run_sweep(PATH_CSV, write_grid(tmp_path / "grid.json", {"WARMUP": [10], "MA_WINDOW": [20, 30]}), path_output, workers=1)
+    with open(path_output) as f:
+        header = f.readline()
+
+    # Same parameters, in another order and with more values
+    grid = {"MA_WINDOW": [20, 30], "WARMUP": [10, 40]}
+    run_sweep(PATH_CSV, write_grid(tmp_path / "grid.json", grid), path_output, workers=1)
+    with open(path_output) as f:
+        assert f.readline() == header
+
+    results = pd.read_csv(path_output)
+    assert len(results) == 4
+    assert results["config_id"].is_unique
+    for row in results.itertuples():
+        params = json.loads(row.config_id)
+        assert (row.WARMUP, row.MA_WINDOW) == (params["WARMUP"], params["MA_WINDOW"])
+    assert results["base_score"].notna().all()
+
+
+def test_resume_with_other_parameters(tmp_path):
+    path_output = str(tmp_path / "sweep.csv")
+    run_sweep(PATH_CSV, write_grid(tmp_path / "grid.json", {"WARMUP": [10]}), path_output, workers=1)
+    with open(path_output) as f:
+        content = f.read()
+
+    grid = {"WARMUP": [10], "MA_WINDOW": [20]}
+    with pytest.raises(ValueError, match="--sweep-output"):
+        run_sweep(PATH_CSV, write_grid(tmp_path / "grid.json", grid), path_output, workers=1)
+    with open(path_output) as f:
+        assert f.read() == content
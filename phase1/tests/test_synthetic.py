@@ -0,0 +1,39 @@
+"""
+Synthetic prices (`main.py --synthetic`), in every kit of the repository.
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from conftest import KITS, KIT_DIR
+from scoring.synthetic import MODELS, synthetic_prices
+
+
+@pytest.mark.parametrize("kit", KITS, ids=lambda kit: os.path.relpath(kit, os.path.dirname(KIT_DIR)))
+def test_kit_bot_runs_on_synthetic_prices(kit):
+    # The synthetic assets are those of the kit's data, which its bot trades
+    output = subprocess.run(
+        [sys.executable, os.path.join(kit, "main.py"), "--synthetic", "gbm", "--epochs", "2000"],
+        cwd=kit,
+        capture_output=True,
+        text=True,
+    )
+    assert output.returncode == 0, output.stderr
+    assert re.search(r"Base Score:\s+\S+", output.stdout)
+
+
+@pytest.mark.parametrize("model", MODELS)
+def test_synthetic_prices_depend_only_on_seed(model):
+    def draw(seed):
+        return synthetic_prices(500, nb_assets=2, model=model, seed=seed, correlation=0.5)
+
+    prices = draw(seed=0)
+    assert list(prices.columns) == ["Asset A", "Asset B", "Cash"]
+    assert len(prices) == 500 and (prices.to_numpy() > 0).all()
+    pd.testing.assert_frame_equal(draw(seed=0), prices)
+    assert not draw(seed=1).equals(prices)
@@ -0,0 +1,61 @@
+"""
+Decisions accepted by `run_epochs`: the default checks (types and keys per
+epoch, values at the end) must accept exactly what `validate_decision`
+accepts with --strict-validation.
+"""
+
+import numpy as np
+import pytest
+
+from conftest import DATASETS, read_prices
+from main import run_epochs, validate_decision
+
+DECISIONS = {
+    "floats": {"Asset A": 0.25, "Cash": 0.75},
+    "ints": {"Asset A": 1, "Cash": 0},
+    "bools": {"Asset A": True, "Cash": False},
+    "numpy float64": {"Asset A": np.float64(0.5), "Cash": 0.5},
+    "numpy float32": {"Asset A": np.float32(0.5), "Cash": 0.5},
+    "numpy int64": {"Asset A": np.int64(1), "Cash": 0.0},
+    "string": {"Asset A": "0.5", "Cash": 0.5},
+    "none": {"Asset A": None, "Cash": 1.0},
+    "nan": {"Asset A": float("nan"), "Cash": 1.0},
+    "negative": {"Asset A": -0.5, "Cash": 1.5},
+    "bad total": {"Asset A": 0.5, "Cash": 0.6},
+    "missing key": {"Cash": 1.0},
+    "extra key": {"Asset A": 0.5, "Cash": 0.5, "Asset B": 0.0},
+}
+
+
+@pytest.fixture(scope="module")
+def prices():
+    path_csv = next(path for path in DATASETS if path.endswith("asset_a_test.csv"))
+    return read_prices(path_csv).iloc[:50]
+
+
+def run(prices, decision, strict):
+    try:
+        return run_epochs(prices, lambda epoch, price: dict(decision), strict=strict)
+    except ValueError:
+        return None
+
+
+@pytest.mark.parametrize("decision", DECISIONS.values(), ids=DECISIONS.keys())
+def test_same_decisions_with_and_without_strict_validation(prices, decision):
+    positions = run(prices, decision, strict=False)
+    strict_positions = run(prices, decision, strict=True)
+    accepted = validate_decision(decision, set(prices.columns))
+    assert (positions is not None) == accepted
+    assert (strict_positions is not None) == accepted
+    if accepted:
+        assert positions.equals(strict_positions)
+        assert (positions.to_numpy() == [float(decision["Asset A"]), float(decision["Cash"])]).all()
+
+
+def test_invalid_decision_after_valid_ones(prices):
+    def decision_generator(epoch, price):
+        return {"Asset A": np.float32(0.5) if epoch == prices.index[-1] else 0.5, "Cash": 0.5}
+
+    for strict in (False, True):
+        with pytest.raises(ValueError):
+            run_epochs(prices, decision_generator, strict=strict)
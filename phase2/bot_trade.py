@@ -2,16 +2,42 @@
 
 import random
 
-history = []
+import numpy as np
 
-def get_delta(history: list[dict[str, int]]) -> float:
-    return history[-1]["price"] - history[-2]["price"]
+from indicators import PriceHistory
+
+def get_delta(history: np.ndarray) -> float:
+    return history[-1, 0] - history[-2, 0]
+
+class Bot:
+    """
+    The strategy. It keeps no state of its own: `on_epoch` reads the past
+    prices from `history`, the read-only array of the prices up to and
+    including the current epoch.
+    """
+
+    def __init__(self, params: dict | None = None):
+        # This strategy has no parameter to override
+        for name in params or {}:
+            raise AttributeError(f"bot_trade ne définit pas le paramètre '{name}'")
+        self.reset()
+
+    def reset(self):
+        pass
+
+    def on_epoch(self, epoch: int, price: float, history: np.ndarray):
+        if (len(history) < 2):
+            return {'Asset B':0.5, 'Cash': 0.5}
+        if get_delta(history) > 0:
+            return {'Asset B':0.7, 'Cash': 0.3}
+        else:
+            return {'Asset B':0.3, 'Cash': 0.7}
+
+# Bot behind `make_decision`, the entry point called by the platform, and
+# the price history that `main.py` would otherwise pass to `on_epoch`
+bot = Bot()
+price_history = PriceHistory(nb_assets=1)
 
 def make_decision(epoch: int, price: float):
-    history.append({"epoch": epoch, "price": price})
-    if (len(history) < 2):
-        return {'Asset B':0.5, 'Cash': 0.5}
-    if get_delta(history) > 0:
-        return {'Asset B':0.7, 'Cash': 0.3}
-    else:
-        return {'Asset B':0.3, 'Cash': 0.7}
\ No newline at end of file
+    price_history.append(price)
+    return bot.on_epoch(epoch, price, history=price_history.view())
@@ -0,0 +1,296 @@
+"""
+Streaming indicators for `make_decision`.
+
+Each indicator is fed one value per epoch with `update(value)` and returns
+its new value. Updates cost O(1) and at most `window` values are kept in
+memory, so a bot no longer needs to keep (and re-scan) its whole price
+history.
+
+`PriceHistory` is the exception: it keeps every price, in one growable
+array, for bots that compute their windows directly on the price history
+(`main.py` passes such a history to `Bot.on_epoch`, see `setup.md`).
+
+Example
+-------
+>>> from indicators import RollingMean
+>>> ma30 = RollingMean(30)
+>>> def make_decision(epoch: int, price: float):
+...     mean = ma30.update(price)
+...     ...
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-size buffer holding the last `size` values, oldest first.
+    """
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError(f"size must be at least 1, got {size}")
+        self.size = size
+        self._values = [0.0] * size
+        self._start = 0
+        self._count = 0
+
+    def append(self, value: float) -> float | None:
+        """
+        Add `value` and return the value it evicted, or None while the buffer
+        is not full yet.
+        """
+        if self._count < self.size:
+            self._values[(self._start + self._count) % self.size] = value
+            self._count += 1
+            return None
+        evicted = self._values[self._start]
+        self._values[self._start] = value
+        self._start = (self._start + 1) % self.size
+        return evicted
+
+    def is_full(self) -> bool:
+        return self._count == self.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> float:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("RingBuffer index out of range")
+        return self._values[(self._start + i) % self.size]
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._values[(self._start + i) % self.size]
+
+
+class RollingMean:
+    """
+    Mean of the last `window` values (of all values seen while fewer than
+    `window` have been seen), as `sum(values[-window:]) / len(values[-window:])`.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._buffer = RingBuffer(window)
+        self._updates = 0
+        self.value = math.nan
+
+    def update(self, x: float) -> float:
+        evicted = self._buffer.append(x)
+        n = len(self._buffer)
+        self._updates += 1
+        if n == 1:
+            self.value = x
+        elif self._updates % self.window == 0:
+            # Re-sum once per window so rounding errors do not accumulate
+            self.value = math.fsum(self._buffer) / n
+        elif evicted is None:
+            self.value += (x - self.value) / n
+        else:
+            self.value += (x - evicted) / n
+        return self.value
+
+
+class RollingVariance:
+    """
+    Variance of the last `window` values, updated with Welford's algorithm
+    extended to a sliding window.
+
+    `ddof` follows the numpy / pandas convention (1 for the sample variance).
+    """
+
+    def __init__(self, window: int, ddof: int = 1):
+        self.window = window
+        self.ddof = ddof
+        self._buffer = RingBuffer(window)
+        self._updates = 0
+        self.mean = math.nan
+        self._m2 = 0.0
+
+    def update(self, x: float) -> float:
+        evicted = self._buffer.append(x)
+        n = len(self._buffer)
+        self._updates += 1
+        if n == 1:
+            self.mean = x
+            self._m2 = 0.0
+        elif self._updates % self.window == 0:
+            # Recompute once per window so rounding errors do not accumulate
+            self.mean = math.fsum(self._buffer) / n
+            self._m2 = math.fsum((v - self.mean) ** 2 for v in self._buffer)
+        elif evicted is None:
+            delta = x - self.mean
+            self.mean += delta / n
+            self._m2 += delta * (x - self.mean)
+        else:
+            old_mean = self.mean
+            self.mean += (x - evicted) / n
+            self._m2 += (x - evicted) * (x - self.mean + evicted - old_mean)
+        # Rounding can leave a tiny negative M2 on a constant window
+        self._m2 = max(self._m2, 0.0)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        n = len(self._buffer)
+        if n - self.ddof <= 0:
+            return math.nan
+        return self._m2 / (n - self.ddof)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.value)
+
+
+class EMA:
+    """
+    Recursive exponential moving average, seeded with the first value.
+
+    Either `span` (alpha = 2 / (span + 1)) or `alpha` must be given.
+    """
+
+    def __init__(self, span: int | None = None, alpha: float | None = None):
+        if (span is None) == (alpha is None):
+            raise ValueError("Exactly one of span or alpha must be given")
+        self.alpha = alpha if alpha is not None else 2 / (span + 1)
+        self.value = math.nan
+        self._seeded = False
+
+    def update(self, x: float) -> float:
+        if not self._seeded:
+            self.value = x
+            self._seeded = True
+        else:
+            self.value = self.value + self.alpha * (x - self.value)
+        return self.value
+
+
+class RollingMax:
+    """
+    Maximum of the last `window` values, using a monotonic deque.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._count = 0
+        # (position, value) pairs with decreasing values
+        self._deque = deque()
+
+    def _keep(self, new: float, old: float) -> bool:
+        return old > new
+
+    def update(self, x: float) -> float:
+        while self._deque and not self._keep(x, self._deque[-1][1]):
+            self._deque.pop()
+        self._deque.append((self._count, x))
+        self._count += 1
+        if self._deque[0][0] <= self._count - 1 - self.window:
+            self._deque.popleft()
+        return self._deque[0][1]
+
+    @property
+    def value(self) -> float:
+        return self._deque[0][1] if self._deque else math.nan
+
+
+class RollingMin(RollingMax):
+    """
+    Minimum of the last `window` values, using a monotonic deque.
+    """
+
+    def _keep(self, new: float, old: float) -> bool:
+        return old < new
+
+
+class DrawdownTracker:
+    """
+    Drawdown from the running peak, with the same sign convention as
+    `compute_stats` (0 at a new peak, negative below it).
+    """
+
+    def __init__(self):
+        self.peak = math.nan
+        self.value = 0.0
+        self.max_drawdown = 0.0
+
+    def update(self, x: float) -> float:
+        if not x <= self.peak:
+            self.peak = x
+        self.value = x / self.peak - 1.0
+        self.max_drawdown = min(self.max_drawdown, self.value)
+        return self.value
+
+
+class PriceHistory:
+    """
+    Every price appended so far, as an (epochs x assets) float64 array.
+
+    `view()` returns the prices up to the last appended epoch as a read-only
+    array sharing memory with the buffer: no copy is made, and a view never
+    sees the epochs appended after it. The buffer behind the views (their
+    `base`) is read-only as well, and zero past the last appended epoch, so
+    it holds no price that was not appended yet. The capacity doubles when
+    the buffer is full, so an append costs O(1) amortized.
+    """
+
+    def __init__(self, nb_assets: int = 1, capacity: int = 1024):
+        if nb_assets < 1:
+            raise ValueError(f"nb_assets must be at least 1, got {nb_assets}")
+        self._count = 0
+        self._allocate(max(capacity, 1), nb_assets)
+
+    def _allocate(self, capacity: int, nb_assets: int):
+        values = np.zeros((capacity, nb_assets))
+        if self._count:
+            values[: self._count] = self._values[: self._count]
+        self._values = values
+        # Built on a read-only buffer rather than as a view of `values`, whose
+        # views would all have `values` itself, writable, as their `base`
+        self._readonly = np.frombuffer(memoryview(values).toreadonly()).reshape(values.shape)
+
+    def append(self, *prices: float):
+        """
+        Add the prices of one epoch, one per asset.
+        """
+        if self._count == len(self._values):
+            self._allocate(2 * self._count, self._values.shape[1])
+        self._values[self._count] = prices
+        self._count += 1
+
+    def extend(self, prices: np.ndarray):
+        """
+        Add the prices of several epochs, an (epochs x assets) array.
+        """
+        end = self._count + len(prices)
+        if end > len(self._values):
+            self._allocate(max(end, 2 * len(self._values)), self._values.shape[1])
+        self._values[self._count : end] = prices
+        self._count = end
+
+    def view(self, end: int | None = None) -> np.ndarray:
+        """
+        Read-only view of the prices of the first `end` epochs (all of them
+        by default).
+        """
+        return self._readonly[: self._count if end is None else min(end, self._count)]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getstate__(self) -> dict:
+        # Only the prices appended so far, and not the read-only view, which
+        # pickle would store as a second copy
+        return {"values": self._values[: self._count].copy()}
+
+    def __setstate__(self, state: dict):
+        values = state["values"]
+        self._count = 0
+        self._allocate(max(len(values), 1), values.shape[1])
+        self.extend(values)
@@ -0,0 +1,111 @@
+# ============================================================================
+# ⚠️  ATTENTION: Ce fichier n’a pas de lien avec le développement de votre bot.
+# ⚠️  Vous pouvez l’ignorer.
+# ============================================================================
+
+"""
+Checkpoints of long chunked runs (`main.py --checkpoint`).
+
+`run_chunked` scores the prices window by window, and its whole state fits
+in a few objects: the bot, the `StreamingBacktester` (holdings, capital and
+metric accumulators), the sampled pnl and, for bots that take a `history`
+argument, the `PriceHistory`. A `Checkpoint` pickles them every `every`
+epochs, so that an interrupted run resumes from its last snapshot, with
+the same final results as an uninterrupted one, instead of from epoch 0.
+"""
+
+import os
+import pickle
+
+# Bumped whenever the content of a snapshot changes
+VERSION = 1
+
+
+class Checkpoint:
+    """
+    Snapshots of a run, written to `path` at most every `every` epochs.
+
+    A snapshot is written under a temporary name and renamed once complete,
+    so that `path` always holds the last complete snapshot, even if the run
+    is killed while writing. It records `source`, a description of the
+    prices (file, size and modification time, or synthetic parameters):
+    `load` refuses a snapshot taken on other prices.
+
+    Parameters
+    ----------
+    path : str
+        File of the snapshots.
+    every : int
+        Minimum number of epochs between two snapshots. `run_chunked` only
+        saves between windows, so snapshots are at least a window apart.
+    source : dict
+        Description of the prices, compared on `load`.
+    """
+
+    def __init__(self, path: str, every: int, source: dict):
+        if every < 1:
+            raise ValueError(f"every must be positive, got {every}")
+        self.path = path
+        self.every = every
+        self.source = source
+        self.last_epochs = 0
+
+    def load(self) -> dict | None:
+        """
+        The state saved by the last `save`, or None if there is no snapshot.
+        """
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as f:
+            snapshot = pickle.load(f)
+        if snapshot.get("version") != VERSION:
+            raise ValueError(f"Le point de reprise {self.path} a été créé par une autre version de main.py")
+        if snapshot["source"] != self.source:
+            raise ValueError(
+                f"Le point de reprise {self.path} a été créé sur d'autres prix: {snapshot['source']}"
+            )
+        self.last_epochs = snapshot["nb_epochs"]
+        return snapshot["state"]
+
+    def is_due(self, nb_epochs: int) -> bool:
+        """
+        Whether `every` epochs have been run since the last snapshot.
+        """
+        return nb_epochs - self.last_epochs >= self.every
+
+    def save(self, nb_epochs: int, **state):
+        """
+        Save `state` (picklable objects) as the state after `nb_epochs`
+        epochs.
+        """
+        snapshot = {
+            "version": VERSION,
+            "source": self.source,
+            "nb_epochs": nb_epochs,
+            "state": state,
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.last_epochs = nb_epochs
+
+
+def price_source(path_csv: str | None, synthetic: dict | None = None) -> dict:
+    """
+    Description of the prices of a run, for `Checkpoint`: the synthetic
+    parameters, or the CSV path with its size and modification time.
+    """
+    if synthetic is not None:
+        return {"synthetic": dict(synthetic)}
+    stat = os.stat(path_csv)
+    return {"path_csv": os.path.abspath(path_csv), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
@@ -0,0 +1,197 @@
+# ============================================================================
+# ⚠️  ATTENTION: Ce fichier n’a pas de lien avec le développement de votre bot.
+# ⚠️  Vous pouvez l’ignorer.
+# ============================================================================
+
+"""
+Profiling helpers for `main.py --profile`.
+
+The driver and the scorer add the time of each stage to a `timings` dict
+(see `run_epochs`, `run_chunked` and `get_local_score`). This module holds
+what is specific to profiling: the distribution of the bot latencies,
+per-stage memory accounting, and the export of a cProfile run for deeper
+digging, as a pstats file or as a speedscope profile.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+
+import numpy as np
+
+from .scoring import QuantileSketch
+
+
+class LatencyStats:
+    """
+    Distribution of the latency of a call, fed chunk by chunk.
+
+    Keeps the count, total and max (with the epoch it occurred at), the
+    quantiles within 1% (`QuantileSketch`) and a histogram with one bucket
+    per decade, so that memory does not depend on the number of calls.
+    """
+
+    # Upper bounds of the histogram buckets, in seconds (the last bucket
+    # holds everything above 100 ms)
+    EDGES = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1)
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.max_epoch = None
+        self.sketch = QuantileSketch()
+        self.histogram = np.zeros(len(self.EDGES) + 1, dtype=np.int64)
+
+    def add_many(self, latencies: np.ndarray, epochs=None):
+        """
+        Add latencies in seconds, and the epochs they were measured at.
+        """
+        latencies = np.asarray(latencies, dtype=np.float64)
+        if not len(latencies):
+            return
+        self.count += len(latencies)
+        self.total += float(latencies.sum())
+        i = int(np.argmax(latencies))
+        if latencies[i] > self.max:
+            self.max = float(latencies[i])
+            self.max_epoch = None if epochs is None else epochs[i]
+        self.sketch.add_many(latencies)
+        buckets = np.searchsorted(self.EDGES, latencies, side="left")
+        self.histogram += np.bincount(buckets, minlength=len(self.histogram))
+
+    def quantile(self, q: float) -> float:
+        return self.sketch.quantile(q)
+
+
+def add_times(timings: dict, **seconds):
+    """
+    Add each value to the key of the same name of `timings`.
+    """
+    for key, value in seconds.items():
+        timings[key] = timings.get(key, 0) + value
+
+
+@contextmanager
+def stage(timings: dict | None, name: str):
+    """
+    Add the wall time of the block to `timings[name]`, and the number of
+    memory blocks it left allocated to `timings["blocks"][name]`. Does
+    nothing if `timings` is None.
+
+    The block count (`sys.getallocatedblocks`) is net: objects created and
+    freed within the block are not counted, objects kept alive (e.g. a bot
+    history) are.
+    """
+    if timings is None:
+        yield
+        return
+    blocks = sys.getallocatedblocks()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+        allocated = timings.setdefault("blocks", {})
+        allocated[name] = allocated.get(name, 0) + sys.getallocatedblocks() - blocks
+
+
+def timed_iter(iterable: Iterable, timings: dict | None, name: str) -> Iterator:
+    """
+    The items of `iterable`, with the time taken to produce them added to
+    `timings[name]` (e.g. reading windows of prices).
+    """
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            if timings is not None:
+                add_times(timings, **{name: time.perf_counter() - start})
+        yield item
+
+
+def write_profile(profiler: cProfile.Profile, path: str):
+    """
+    Save a cProfile run: as a speedscope profile if `path` ends with
+    ".json", else as a pstats file (`python -m pstats`, snakeviz, ...).
+    """
+    if path.endswith(".json"):
+        write_speedscope(profiler, path, name=os.path.basename(path))
+    else:
+        profiler.dump_stats(path)
+
+
+def write_speedscope(profiler: cProfile.Profile, path: str, name: str = "main.py", min_fraction: float = 1e-4):
+    """
+    Save a cProfile run as a speedscope (https://www.speedscope.app)
+    sampled profile, to be browsed as a flame graph.
+
+    cProfile records the total time of each caller -> callee pair, not full
+    stacks, so the stacks are rebuilt as cProfile flame graph converters do:
+    the time of a function is split between the stacks it is reached from
+    in proportion to the time spent in each caller. Recursive calls are
+    folded into the outermost one, and stacks worth less than
+    `min_fraction` of the total time are dropped.
+    """
+    # {function: (primitive calls, calls, own time, cumulative time, callers)}
+    stats = pstats.Stats(profiler).stats
+    callees = defaultdict(dict)
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, edge_time) in callers.items():
+            callees[caller][function] = edge_time
+
+    frames, frame_ids = [], {}
+
+    def frame_id(function) -> int:
+        if function not in frame_ids:
+            filename, line, function_name = function
+            frame_ids[function] = len(frames)
+            frames.append({"name": function_name, "file": filename, "line": line})
+        return frame_ids[function]
+
+    roots = [function for function, values in stats.items() if not values[4]]
+    min_time = sum(stats[function][3] for function in roots) * min_fraction
+    samples, weights = [], []
+    # (function, its cumulative time within this stack, the stack above it)
+    todo = [(function, stats[function][3], ()) for function in roots]
+    while todo:
+        function, time_in_stack, stack = todo.pop()
+        _, _, own_time, cumulative_time, _ = stats[function]
+        share = time_in_stack / cumulative_time if cumulative_time > 0 else 0.0
+        stack = stack + (frame_id(function),)
+        if own_time * share > 0:
+            samples.append(list(stack))
+            weights.append(own_time * share)
+        for callee, edge_time in callees[function].items():
+            if edge_time * share >= min_time and frame_ids.get(callee) not in stack:
+                todo.append((callee, edge_time * share, stack))
+
+    profile = {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+        ],
+        "name": name,
+        "exporter": "main.py --profile-output",
+    }
+    with open(path, "w") as f:
+        json.dump(profile, f)